@@ -0,0 +1,249 @@
+import hashlib
+import logging
+import re
+import zlib
+from functools import lru_cache
+from django.db import transaction
+from django.db.models import Count, Q
+from .models import CandidateProfile, ResumeSignatureBucket
+from resume_analyzer import settings
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+# MinHash over word 3-shingles: 128 permutations stored as uint32 (512 bytes per resume).
+# LSH splits the signature into 16 bands of 8 rows; two resumes with Jaccard
+# similarity s share at least one band bucket with probability 1 - (1 - s^8)^16,
+# i.e. ~0.99 at s = 0.85 and ~0.04 at s = 0.5.
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+_PRIME = 4294967291  # Largest prime below 2**32, so (a * h + b) fits in uint64
+_SEED = 20240501  # Fixed seed: signatures must be stable across processes
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=None)
+def _minhash_params():
+    """
+    numpy and the permutation coefficients, loaded on first use: importing numpy
+    would otherwise add to the startup of every process that imports the views.
+    """
+    import numpy as np
+
+    rng = np.random.RandomState(_SEED)
+    a = rng.randint(1, _PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64)
+    b = rng.randint(0, _PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64)
+    return np, a, b, np.uint64(_PRIME)
+
+
+def shingle_hashes(text):
+    """32-bit hashes of the distinct word shingles in a resume's text."""
+    np = _minhash_params()[0]
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        shingles = {' '.join(words)} if words else set()
+    else:
+        shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def compute_signature(text):
+    """MinHash signature (uint32 array) of the text, or None when it has no words."""
+    np, a, b, prime = _minhash_params()
+    hashes = shingle_hashes(text)
+    if not hashes.size:
+        return None
+    # One row per permutation, one column per shingle; the minimum per row is the signature
+    permuted = (np.outer(a, hashes) + b[:, None]) % prime
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def signature_from_bytes(data):
+    np = _minhash_params()[0]
+    return np.frombuffer(bytes(data), dtype=np.uint32)
+
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity: share of matching signature positions."""
+    return float((signature == other).mean())
+
+
+def band_buckets(signature):
+    """(band, bucket) pairs for the LSH index; buckets are signed 64-bit hashes of each band."""
+    buckets = []
+    for band in range(LSH_BANDS):
+        digest = hashlib.blake2b(signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes(), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, 'big', signed=True)))
+    return buckets
+
+
+def find_near_duplicates(signature, exclude_id=None, threshold=None):
+    """
+    Return [(candidate_id, similarity)] of indexed resumes whose signature is at least
+    `threshold` similar (RESUME_DEDUP_THRESHOLD by default), most similar first.
+    Only resumes sharing an LSH bucket are compared, so the cost does not grow with the table.
+    """
+    threshold = settings.RESUME_DEDUP_THRESHOLD if threshold is None else threshold
+    condition = Q()
+    for band, bucket in band_buckets(signature):
+        condition |= Q(band=band, bucket=bucket)
+    candidate_ids = ResumeSignatureBucket.objects.filter(condition).values_list('candidate_profile_id', flat=True).distinct()
+    if exclude_id is not None:
+        candidate_ids = candidate_ids.exclude(candidate_profile_id=exclude_id)
+
+    matches = []
+    for candidate_id, data in CandidateProfile.objects.filter(id__in=list(candidate_ids)).values_list('id', 'minhash'):
+        if data is None:
+            continue
+        score = similarity(signature, signature_from_bytes(data))
+        if score >= threshold:
+            matches.append((candidate_id, score))
+    return sorted(matches, key=lambda item: item[1], reverse=True)
+
+
+def _bucket_rows(candidate_id, signature):
+    return [
+        ResumeSignatureBucket(candidate_profile_id=candidate_id, band=band, bucket=bucket)
+        for band, bucket in band_buckets(signature)
+    ]
+
+
+def index_resume(candidate):
+    """
+    Compute and store a new resume's signature, add it to the LSH index and link it
+    to the canonical resume of its closest near-duplicate, if any. Called at ingest.
+    """
+    signature = compute_signature(candidate.extracted_text)
+    if signature is None:
+        return None
+
+    duplicates = find_near_duplicates(signature, exclude_id=candidate.id)
+    if duplicates:
+        closest = CandidateProfile.objects.only('id', 'duplicate_of_id').get(id=duplicates[0][0])
+        candidate.duplicate_of_id = closest.duplicate_of_id or closest.id
+        logger.info(f"Resume {candidate.id} is a near-duplicate of {candidate.duplicate_of_id} (similarity {duplicates[0][1]:.2f})")
+
+    candidate.minhash = signature.tobytes()
+    with transaction.atomic():
+        candidate.save(update_fields=['minhash', 'duplicate_of', 'updated_at'])
+        ResumeSignatureBucket.objects.filter(candidate_profile_id=candidate.id).delete()
+        ResumeSignatureBucket.objects.bulk_create(_bucket_rows(candidate.id, signature))
+    return candidate.duplicate_of_id
+
+
+def backfill_signatures(batch_size=500):
+    """Compute signatures and LSH buckets for resumes stored before deduplication existed."""
+    indexed = 0
+    last_pk = None
+    queryset = CandidateProfile.objects.filter(minhash__isnull=True).order_by('pk').only('pk', 'extracted_text')
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(page[:batch_size])
+        if not rows:
+            break
+        last_pk = rows[-1].pk
+
+        updated = []
+        buckets = []
+        for candidate in rows:
+            signature = compute_signature(candidate.extracted_text)
+            if signature is None:
+                continue
+            candidate.minhash = signature.tobytes()
+            updated.append(candidate)
+            buckets.extend(_bucket_rows(candidate.pk, signature))
+        with transaction.atomic():
+            CandidateProfile.objects.bulk_update(updated, ['minhash'])
+            ResumeSignatureBucket.objects.filter(candidate_profile_id__in=[c.pk for c in updated]).delete()
+            ResumeSignatureBucket.objects.bulk_create(buckets)
+        indexed += len(updated)
+    return indexed
+
+
+def cluster_duplicates(threshold=None, batch_size=500):
+    """
+    Recluster all indexed resumes: every pair sharing an LSH bucket and at least
+    `threshold` similar is joined (union-find), and each cluster's members point
+    `duplicate_of` at its oldest resume. Returns a summary dict.
+    """
+    threshold = settings.RESUME_DEDUP_THRESHOLD if threshold is None else threshold
+    parent = {}
+
+    def find(node):
+        root = node
+        while parent.get(root, root) != root:
+            root = parent[root]
+        if node != root:
+            parent[node] = root
+        return root
+
+    signatures = {}
+
+    def signature_of(candidate_id):
+        if candidate_id not in signatures:
+            data = CandidateProfile.objects.filter(id=candidate_id).values_list('minhash', flat=True).first()
+            signatures[candidate_id] = signature_from_bytes(data)
+        return signatures[candidate_id]
+
+    shared = (
+        ResumeSignatureBucket.objects.values('band', 'bucket')
+        .annotate(members=Count('id')).filter(members__gt=1).order_by()
+    )
+    for group in shared.iterator():
+        members = list(
+            ResumeSignatureBucket.objects.filter(band=group['band'], bucket=group['bucket'])
+            .values_list('candidate_profile_id', flat=True)
+        )
+        for index, first in enumerate(members):
+            for second in members[index + 1:]:
+                first_root, second_root = find(first), find(second)
+                if first_root != second_root and similarity(signature_of(first), signature_of(second)) >= threshold:
+                    parent[second_root] = first_root
+                    parent.setdefault(first_root, first_root)
+
+    clusters = {}
+    for node in list(parent):
+        clusters.setdefault(find(node), []).append(node)
+
+    created = dict(CandidateProfile.objects.filter(id__in=list(parent)).values_list('id', 'created_at'))
+    canonical = {}
+    for members in clusters.values():
+        oldest = min(members, key=lambda member: (created[member], str(member)))
+        for member in members:
+            if member != oldest:
+                canonical[member] = oldest
+
+    changed = 0
+    last_pk = None
+    queryset = CandidateProfile.objects.order_by('pk').only('pk', 'duplicate_of_id')
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(page[:batch_size])
+        if not rows:
+            break
+        last_pk = rows[-1].pk
+        updated = []
+        for candidate in rows:
+            target = canonical.get(candidate.pk)
+            if candidate.duplicate_of_id != target:
+                candidate.duplicate_of_id = target
+                updated.append(candidate)
+        if updated:
+            with transaction.atomic():
+                CandidateProfile.objects.bulk_update(updated, ['duplicate_of'])
+        changed += len(updated)
+
+    duplicates = sum(len(members) - 1 for members in clusters.values())
+    total = CandidateProfile.objects.count()
+    logger.info(f"Clustered resumes: {len(clusters)} clusters, {duplicates} duplicates of {total}")
+    return {
+        "clusters": len(clusters),
+        "duplicates": duplicates,
+        "resumes": total,
+        "duplicate_rate": round(duplicates / total, 4) if total else 0.0,
+        "changed": changed,
+    }
@@ -0,0 +1,209 @@
+import re
+from datetime import date
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+# Typed features derived from a profile's structured_data / extracted_text and stored as
+# indexed CandidateProfile columns, so candidate filters run in SQL instead of decoding
+# every profile's JSON. Recomputed whenever structured_data changes.
+FEATURE_FIELDS = ['skill_count', 'years_experience', 'education_level', 'last_updated_bucket']
+
+EDUCATION_NONE = 0
+EDUCATION_HIGH_SCHOOL = 1
+EDUCATION_ASSOCIATE = 2
+EDUCATION_BACHELOR = 3
+EDUCATION_MASTER = 4
+EDUCATION_DOCTORATE = 5
+EDUCATION_LEVELS = {
+    'none': EDUCATION_NONE,
+    'high_school': EDUCATION_HIGH_SCHOOL,
+    'associate': EDUCATION_ASSOCIATE,
+    'bachelor': EDUCATION_BACHELOR,
+    'master': EDUCATION_MASTER,
+    'doctorate': EDUCATION_DOCTORATE,
+}
+EDUCATION_LEVEL_CHOICES = [(level, name.replace('_', ' ').capitalize()) for name, level in EDUCATION_LEVELS.items()]
+
+# Bare two-letter abbreviations ("MS", "BA") also read as state codes and products
+# ("Cambridge, MA", "MS Office"), so they only count in a degree context: followed
+# by "in"/"of", a field of study or a parenthesis. Dotted forms ("M.S.") and
+# unambiguous ones ("MSc", "MBA") count anywhere.
+_FIELDS = (
+    r"Computer|Science|Sciences|Engineering|Data|Information|Software|Mathematics|Math|Applied|"
+    r"Physics|Chemistry|Biology|Statistics|Economics|Finance|Business|Management|Marketing|"
+    r"Accounting|Psychology|Education|Electrical|Mechanical|Civil|Chemical|Artificial|Machine|"
+    r"Public|Health|Nursing|Arts|Liberal|English|History|Political|Communications?"
+)
+_DEGREE_CONTEXT = r"(?=,?\s+(?:[Ii]n|[Oo]f|" + _FIELDS + r")\b|\s*\()"
+
+
+def _abbreviations(dotted, bare, contextual):
+    return re.compile(
+        r"\b(?:" + "|".join(dotted) + r")(?!\w)"
+        r"|\b(?:" + "|".join(bare) + r")\b"
+        r"|\b(?:" + "|".join(contextual) + r")\b" + _DEGREE_CONTEXT
+    )
+
+
+# Highest level first. Word forms are matched case-insensitively; abbreviations only
+# in their usual capitalisation so ordinary words do not match. "Master" alone is a
+# job title ("Scrum Master"), so only "master's"/"masters"/"master of" count.
+_EDUCATION_PATTERNS = [
+    (EDUCATION_DOCTORATE, re.compile(r"\b(doctorate|doctoral|doctor of)\b", re.IGNORECASE),
+     re.compile(r"\b(Ph\.?\s?D|PHD|D\.Phil|DPhil|Ed\.?D)\b")),
+    (EDUCATION_MASTER, re.compile(r"\b(master['’]?s\b|master of\b|master degree\b|postgraduate|post-graduate)", re.IGNORECASE),
+     _abbreviations(
+         dotted=[r"M\.\s?S\.?", r"M\.\s?Sc\.?", r"M\.\s?A\.?", r"M\.\s?Eng\.?", r"M\.\s?Tech\.?", r"M\.\s?Phil\.?", r"M\.B\.A\.?"],
+         bare=["MSc", "MEng", "MTech", "MPhil", "MBA", "MCA"],
+         contextual=["MS", "MA"],
+     )),
+    (EDUCATION_BACHELOR, re.compile(r"\b(bachelor['’]?s?|undergraduate)\b", re.IGNORECASE),
+     _abbreviations(
+         dotted=[r"B\.\s?S\.?", r"B\.\s?Sc\.?", r"B\.\s?A\.?", r"B\.\s?E\.?", r"B\.\s?Eng\.?", r"B\.\s?Tech\.?"],
+         bare=["BSc", "BEng", "BTech", "BBA", "BCA"],
+         contextual=["BS", "BA", "BE"],
+     )),
+    (EDUCATION_ASSOCIATE, re.compile(r"\bassociate['’]?s?\s+(degree|of|in)\b", re.IGNORECASE),
+     re.compile(r"\b(A\.?\s?A\.?\s?S|A\.A)\b")),
+    (EDUCATION_HIGH_SCHOOL, re.compile(r"\b(high school|secondary school|diploma|GED)\b", re.IGNORECASE), None),
+]
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+_POINT = r"(?:(?:(?P<{p}month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s*|(?P<{p}num>0?[1-9]|1[0-2])[/.-])?(?P<{p}year>(?:19|20)\d{{2}}))"
+_DATE_RANGE_PATTERN = re.compile(
+    _POINT.format(p='s') + r"\s*(?:-|–|—|to|until|till)\s*"
+    r"(?:" + _POINT.format(p='e') + r"|(?P<present>present|current|now|today|date|ongoing))",
+    re.IGNORECASE,
+)
+_YEARS_PHRASE_PATTERN = re.compile(r"\b(\d{1,2}(?:\.\d)?)\+?\s*(?:years?|yrs?)\b(?:\s+of)?\s+(?:\w+\s+){0,3}?experience", re.IGNORECASE)
+
+# Longest career span believed; longer ranges are parsing noise
+MAX_YEARS_EXPERIENCE = 50
+
+
+def _as_list(value):
+    if isinstance(value, list):
+        return [str(item) for item in value if item]
+    return [str(value)] if value else []
+
+
+def skill_count(structured_data):
+    return len(_as_list(structured_data.get('skills')))
+
+
+def education_level(structured_data, extracted_text=''):
+    """Highest degree found in the parsed education entries (or the text when there are none)."""
+    text = "\n".join(_as_list(structured_data.get('education'))) or extracted_text
+    for level, words, abbreviations in _EDUCATION_PATTERNS:
+        if words.search(text) or (abbreviations is not None and abbreviations.search(text)):
+            return level
+    return EDUCATION_NONE
+
+
+def _point(match, prefix):
+    year = int(match.group(f'{prefix}year'))
+    month = match.group(f'{prefix}month')
+    number = match.group(f'{prefix}num')
+    if month:
+        month = _MONTHS[month[:3].lower()]
+    elif number:
+        month = int(number)
+    else:
+        # Bare years count from mid-year, so "2019 - 2021" is two years
+        month = 7
+    return year + (month - 1) / 12
+
+
+def years_of_experience(structured_data, extracted_text='', today=None):
+    """
+    Estimated total years of work experience: the union of date ranges found in the
+    work_experience entries (overlapping roles counted once), else an explicit
+    "N years of experience" statement in the text. None when neither is present.
+    """
+    today = today or timezone.now().date()
+    now = today.year + (today.month - 1) / 12
+    intervals = []
+    for entry in _as_list(structured_data.get('work_experience')):
+        for match in _DATE_RANGE_PATTERN.finditer(entry):
+            start = _point(match, 's')
+            end = now if match.group('present') else _point(match, 'e')
+            end = min(end, now)
+            if start < end and end - start <= MAX_YEARS_EXPERIENCE:
+                intervals.append((start, end))
+
+    if intervals:
+        total = 0.0
+        current_start, current_end = None, None
+        for start, end in sorted(intervals):
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        total += current_end - current_start
+        return round(min(total, MAX_YEARS_EXPERIENCE), 1)
+
+    stated = [float(value) for value in _YEARS_PHRASE_PATTERN.findall(extracted_text or '')]
+    stated = [value for value in stated if value <= MAX_YEARS_EXPERIENCE]
+    return max(stated) if stated else None
+
+
+def updated_bucket(moment=None):
+    """Month bucket (first day of the month) of a profile's last content update."""
+    moment = moment or timezone.now()
+    return date(moment.year, moment.month, 1)
+
+
+def apply_features(candidate, moment=None):
+    """
+    Set the derived feature columns on a CandidateProfile from its current
+    structured_data and extracted_text. Does not save; callers add FEATURE_FIELDS
+    to their update_fields.
+    """
+    structured_data = candidate.structured_data if isinstance(candidate.structured_data, dict) else {}
+    text = candidate.extracted_text or ''
+    candidate.skill_count = skill_count(structured_data)
+    candidate.years_experience = years_of_experience(structured_data, text)
+    candidate.education_level = education_level(structured_data, text)
+    candidate.last_updated_bucket = updated_bucket(moment)
+    return candidate
+
+
+def parse_feature_filters(query_params):
+    """
+    Translate candidate feature query parameters into ORM filters on the indexed columns:
+    min_skills/max_skills, min_years/max_years, education (minimum level name) and
+    updated_since (YYYY-MM or YYYY-MM-DD; compared by month). Raises ValidationError.
+    """
+    filters = {}
+    for key, lookup, cast, label in (
+        ('min_skills', 'skill_count__gte', int, 'an integer'),
+        ('max_skills', 'skill_count__lte', int, 'an integer'),
+        ('min_years', 'years_experience__gte', float, 'a number'),
+        ('max_years', 'years_experience__lte', float, 'a number'),
+    ):
+        if query_params.get(key):
+            try:
+                filters[lookup] = cast(query_params[key])
+            except ValueError:
+                raise ValidationError(f"{key} must be {label}")
+
+    education = query_params.get('education')
+    if education:
+        level = EDUCATION_LEVELS.get(education.lower())
+        if level is None:
+            raise ValidationError(f"Unknown education level '{education}'. Use one of: {', '.join(EDUCATION_LEVELS)}")
+        filters['education_level__gte'] = level
+
+    updated_since = query_params.get('updated_since')
+    if updated_since:
+        try:
+            year, month = (int(part) for part in updated_since.split('-')[:2])
+            filters['last_updated_bucket__gte'] = date(year, month, 1)
+        except ValueError:
+            raise ValidationError("updated_since must be a date (YYYY-MM or YYYY-MM-DD)")
+    return filters
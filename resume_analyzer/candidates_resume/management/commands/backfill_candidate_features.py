@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from candidates_resume.features import apply_features, FEATURE_FIELDS
+from candidates_resume.models import CandidateProfile
+
+
+class Command(BaseCommand):
+    help = "Derive the indexed feature columns (skill count, experience, education, update bucket) for stored resumes, in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Resumes read and updated per transaction")
+        parser.add_argument('--missing-only', action='store_true', help="Only resumes that were never backfilled")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = CandidateProfile.objects.order_by('pk').only('pk', 'structured_data', 'extracted_text', 'updated_at')
+        if options['missing_only']:
+            queryset = queryset.filter(last_updated_bucket__isnull=True)
+
+        # Keyset pagination, so progress is unaffected by concurrent uploads
+        updated = 0
+        last_pk = None
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(page[:batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1].pk
+            for candidate in rows:
+                # Existing profiles are bucketed by their own last update, not by today
+                apply_features(candidate, moment=candidate.updated_at)
+            with transaction.atomic():
+                CandidateProfile.objects.bulk_update(rows, FEATURE_FIELDS, batch_size=batch_size)
+            updated += len(rows)
+            self.stdout.write(f"  {updated} resumes updated")
+
+        self.stdout.write(self.style.SUCCESS(f"Derived features for {updated} resumes"))
@@ -0,0 +1,96 @@
+import io
+import random
+import time
+from django.core.management.base import BaseCommand
+from candidates_resume.utils import extract_pdf_text, PDF_BACKENDS, PDF_BACKEND_AUTO
+
+WORDS = (
+    "python django postgresql aws docker kubernetes backend developer engineer designed implemented "
+    "scalable services team led migration improved latency percent customers pipeline data analysis "
+    "university bachelor master computer science project platform api rest testing deployment cloud"
+).split()
+
+HEADINGS = ["SUMMARY", "SKILLS", "EXPERIENCE", "PROJECTS", "EDUCATION", "CERTIFICATIONS"]
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_resume_pdf(rng, pages, lines_per_page=55):
+    """Build a text-layer PDF (Helvetica, one content stream per page) resembling a resume."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for _ in range(pages):
+        lines = []
+        for index in range(lines_per_page):
+            if index % 11 == 0:
+                lines.append(rng.choice(HEADINGS))
+            else:
+                lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize() + ".")
+        stream = "BT /F1 10 Tf 12 TL 50 760 Td " + " T* ".join(f"({_pdf_escape(line)}) Tj" for line in lines) + " ET"
+        stream = stream.encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % ref for ref in page_refs), len(page_refs)
+    )
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return output.getvalue()
+
+
+class Command(BaseCommand):
+    help = "Benchmark PDF text extraction backends on a generated resume corpus"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=50, help="Number of generated PDFs")
+        parser.add_argument('--pages', type=int, default=2, help="Pages per PDF")
+        parser.add_argument('--repeat', type=int, default=3, help="Timed passes per backend (best is reported)")
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        corpus = [build_resume_pdf(rng, options['pages']) for _ in range(options['documents'])]
+        self.stdout.write(
+            f"Corpus: {len(corpus)} PDFs x {options['pages']} pages ({sum(map(len, corpus)) / 1024:.0f} KiB)"
+        )
+
+        results = {}
+        for backend in list(PDF_BACKENDS) + [PDF_BACKEND_AUTO]:
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.process_time()
+                used = set()
+                for data in corpus:
+                    used.add(extract_pdf_text(io.BytesIO(data), backend)[1])
+                timings.append(time.process_time() - start)
+            results[backend] = min(timings)
+            self.stdout.write(
+                f"{backend:>10}: {results[backend]:.3f}s CPU total, "
+                f"{results[backend] / len(corpus) * 1000:.2f} ms/doc (used: {', '.join(sorted(used))})"
+            )
+
+        baseline = results['pdfplumber']
+        for backend, seconds in results.items():
+            if backend != 'pdfplumber' and seconds:
+                self.stdout.write(self.style.SUCCESS(f"{backend} is {baseline / seconds:.1f}x faster than pdfplumber"))
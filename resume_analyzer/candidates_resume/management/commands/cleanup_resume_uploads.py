@@ -0,0 +1,14 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from candidates_resume.uploads import cleanup_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete chunked resume uploads (and spool files) abandoned for too long"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-hours', type=float, default=24, help="Age of the last received chunk")
+
+    def handle(self, *args, **options):
+        removed = cleanup_stale_uploads(timedelta(hours=options['older_than_hours']))
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} stale uploads"))
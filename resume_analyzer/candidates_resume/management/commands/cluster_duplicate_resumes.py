@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from candidates_resume.dedup import backfill_signatures, cluster_duplicates
+
+
+class Command(BaseCommand):
+    help = "Index resumes missing a MinHash signature and recluster near-duplicate resumes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, help="Minimum estimated similarity (default RESUME_DEDUP_THRESHOLD)")
+        parser.add_argument('--batch-size', type=int, default=500, help="Resumes processed per transaction")
+
+    def handle(self, *args, **options):
+        indexed = backfill_signatures(options['batch_size'])
+        self.stdout.write(f"Indexed {indexed} resumes without a signature")
+        summary = cluster_duplicates(options['threshold'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['clusters']} clusters, {summary['duplicates']} duplicates of {summary['resumes']} resumes "
+            f"({summary['duplicate_rate']:.1%}); {summary['changed']} resumes relinked"
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates_resume', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='parse_status',
+            field=models.CharField(choices=[('parsed', 'Parsed'), ('pending', 'Pending')], db_index=True, default='parsed', max_length=10),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates_resume', '0002_candidateprofile_parse_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidateprofile',
+            name='parse_status',
+            field=models.CharField(choices=[('parsed', 'Parsed'), ('pending', 'Pending'), ('local', 'Local')], db_index=True, default='parsed', max_length=10),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates_resume', '0003_alter_candidateprofile_parse_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='extraction_backend',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:19
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates_resume', '0004_candidateprofile_extraction_backend'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file_name', models.CharField(max_length=255)),
+                ('file_type', models.CharField(max_length=10)),
+                ('total_size', models.BigIntegerField()),
+                ('received_size', models.BigIntegerField(default=0)),
+                ('checksum', models.CharField(blank=True, default='', max_length=64)),
+                ('chunks', models.JSONField(default=list)),
+                ('parser_mode', models.CharField(blank=True, default='', max_length=20)),
+                ('status', models.CharField(choices=[('in_progress', 'In progress'), ('completed', 'Completed')], default='in_progress', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('candidate_profile', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploads', to='candidates_resume.candidateprofile')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='candidates__status_031c6e_idx')],
+            },
+        ),
+    ]
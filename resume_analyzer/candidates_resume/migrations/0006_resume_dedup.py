@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates_resume', '0005_resumeupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='candidates_resume.candidateprofile'),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='minhash',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ResumeSignatureBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('candidate_profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signature_buckets', to='candidates_resume.candidateprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='candidates__band_55ca3f_idx')],
+                'unique_together': {('candidate_profile', 'band')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates_resume', '0006_resume_dedup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='education_level',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'None'), (1, 'High school'), (2, 'Associate'), (3, 'Bachelor'), (4, 'Master'), (5, 'Doctorate')], db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='last_updated_bucket',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='skill_count',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='years_experience',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+    ]
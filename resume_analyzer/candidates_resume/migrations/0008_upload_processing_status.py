@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates_resume', '0007_candidate_features'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='resumeupload',
+            name='status',
+            field=models.CharField(choices=[('in_progress', 'In progress'), ('processing', 'Processing'), ('completed', 'Completed')], default='in_progress', max_length=20),
+        ),
+    ]
@@ -1,11 +1,30 @@
 from django.db import models
 import uuid
+from .features import EDUCATION_LEVEL_CHOICES, EDUCATION_NONE
 
 class CandidateProfile(models.Model):
+    PARSE_STATUS_PARSED = 'parsed'
+    PARSE_STATUS_PENDING = 'pending'
+    PARSE_STATUS_LOCAL = 'local'
+    PARSE_STATUS_CHOICES = [
+        (PARSE_STATUS_PARSED, 'Parsed'),
+        (PARSE_STATUS_PENDING, 'Pending'),
+        (PARSE_STATUS_LOCAL, 'Local'),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     extracted_text = models.TextField() 
     structured_data = models.JSONField()
     file_type = models.CharField(max_length=10)
+    extraction_backend = models.CharField(max_length=20, blank=True, default='')  # Text extractor used, e.g. pdfium
+    parse_status = models.CharField(max_length=10, choices=PARSE_STATUS_CHOICES, default=PARSE_STATUS_PARSED, db_index=True)
+    minhash = models.BinaryField(null=True, blank=True, editable=False)  # MinHash signature of extracted_text (uint32 array)
+    duplicate_of = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='duplicates')  # Canonical near-duplicate resume
+    # Features derived from structured_data/extracted_text at ingest (see candidates_resume/features.py)
+    skill_count = models.PositiveSmallIntegerField(default=0, db_index=True)
+    years_experience = models.FloatField(null=True, blank=True, db_index=True)  # Estimated; null when unknown
+    education_level = models.PositiveSmallIntegerField(choices=EDUCATION_LEVEL_CHOICES, default=EDUCATION_NONE, db_index=True)
+    last_updated_bucket = models.DateField(null=True, blank=True, db_index=True)  # First day of the month of the last parse
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -16,4 +35,58 @@ class CandidateProfile(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"Candidate {self.id}"
\ No newline at end of file
+        return f"Candidate {self.id}"
+
+class ResumeSignatureBucket(models.Model):
+    """
+    LSH band bucket of a resume's MinHash signature. Resumes sharing any
+    (band, bucket) pair are near-duplicate candidates (see candidates_resume/dedup.py).
+    """
+    candidate_profile = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name='signature_buckets')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        unique_together = ('candidate_profile', 'band')
+        indexes = [
+            models.Index(fields=['band', 'bucket']),
+        ]
+
+    def __str__(self):
+        return f"Bucket {self.band}:{self.bucket} - {self.candidate_profile_id}"
+
+class ResumeUpload(models.Model):
+    """
+    A chunked, resumable resume upload. Chunks are appended to a spool file on disk
+    (RESUME_UPLOAD_SPOOL_DIR); completion hands the assembled file to text extraction.
+    """
+    STATUS_IN_PROGRESS = 'in_progress'
+    STATUS_PROCESSING = 'processing'  # Claimed by one complete call, so a second cannot parse it again
+    STATUS_COMPLETED = 'completed'
+    STATUS_CHOICES = [
+        (STATUS_IN_PROGRESS, 'In progress'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_COMPLETED, 'Completed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    file_name = models.CharField(max_length=255)
+    file_type = models.CharField(max_length=10)
+    total_size = models.BigIntegerField()
+    received_size = models.BigIntegerField(default=0)
+    checksum = models.CharField(max_length=64, blank=True, default='')  # Optional SHA-256 of the whole file
+    chunks = models.JSONField(default=list)  # [{"offset", "size", "sha256"}] per accepted chunk
+    parser_mode = models.CharField(max_length=20, blank=True, default='')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_IN_PROGRESS)
+    candidate_profile = models.ForeignKey(CandidateProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name='uploads')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.received_size}/{self.total_size})"
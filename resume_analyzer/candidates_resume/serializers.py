@@ -1,12 +1,36 @@
 from rest_framework import serializers
-from .models import CandidateProfile
+from .models import CandidateProfile, ResumeUpload
+from resume_analyzer.common.serializers import FastRepresentationMixin
 
 class CandidateProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = CandidateProfile
-        fields = ['id', 'extracted_text', 'structured_data', 'file_type', 'created_at', 'updated_at']
+        fields = ['id', 'extracted_text', 'structured_data', 'file_type', 'extraction_backend', 'parse_status', 'duplicate_of', 'skill_count', 'years_experience', 'education_level', 'last_updated_bucket', 'created_at', 'updated_at']
 
-class CandidateProfileLiteSerializer(serializers.ModelSerializer):
+class CandidateProfileLiteSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = CandidateProfile
-        fields = ['id', 'structured_data', 'file_type', 'created_at', 'updated_at']
\ No newline at end of file
+        fields = ['id', 'structured_data', 'file_type', 'extraction_backend', 'parse_status', 'duplicate_of', 'skill_count', 'years_experience', 'education_level', 'last_updated_bucket', 'created_at', 'updated_at']
+
+    def to_representation(self, instance):
+        # Read-only fast path for list endpoints: same output as the generic field-by-field
+        # rendering, built directly from the instance. Keep in sync with Meta.fields.
+        return {
+            'id': str(instance.id),
+            'structured_data': instance.structured_data,
+            'file_type': instance.file_type,
+            'extraction_backend': instance.extraction_backend,
+            'parse_status': instance.parse_status,
+            'duplicate_of': instance.duplicate_of_id,
+            'skill_count': instance.skill_count,
+            'years_experience': instance.years_experience,
+            'education_level': instance.education_level,
+            'last_updated_bucket': self.format_date(instance.last_updated_bucket),
+            'created_at': self.format_datetime(instance.created_at),
+            'updated_at': self.format_datetime(instance.updated_at),
+        }
+
+class ResumeUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ResumeUpload
+        fields = ['id', 'file_name', 'file_type', 'total_size', 'received_size', 'status', 'candidate_profile', 'created_at', 'updated_at']
\ No newline at end of file
@@ -1,3 +1,385 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+import numpy as np
+from django.conf import settings as django_settings
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from .models import CandidateProfile, ResumeSignatureBucket, ResumeUpload
+from .dedup import (
+    compute_signature, similarity, band_buckets, index_resume, cluster_duplicates,
+    NUM_PERMUTATIONS, LSH_BANDS, LSH_ROWS,
+)
+from .features import (
+    education_level, years_of_experience, skill_count, parse_feature_filters, apply_features,
+    EDUCATION_NONE, EDUCATION_HIGH_SCHOOL, EDUCATION_ASSOCIATE, EDUCATION_BACHELOR, EDUCATION_MASTER, EDUCATION_DOCTORATE,
+)
+from .uploads import spool_path, write_chunk, ChunkError, fcntl
+from .utils import LocalResumeParser, extract_pdf_text
+from resume_analyzer import settings
 
-# Create your tests here.
+RESUME_TEXT = (
+    "Jane Doe\nSenior software engineer with experience building Django services, "
+    "data pipelines in Python and PostgreSQL, and React front ends for internal tools.\n"
+    "Skills: Python, Django, PostgreSQL, React\nEducation: BS Computer Science"
+)
+
+
+def _profile(text=RESUME_TEXT, **fields):
+    return CandidateProfile.objects.create(extracted_text=text, structured_data=fields.pop('structured_data', {}), file_type='txt', **fields)
+
+
+class MinHashTests(TestCase):
+    def test_signature_is_stable_across_processes(self):
+        # A different hash seed in the child would change anything built on hash()
+        script = (
+            "import django, sys\n"
+            "django.setup()\n"
+            "from candidates_resume.dedup import compute_signature\n"
+            "sys.stdout.write(compute_signature(sys.stdin.read()).tobytes().hex())\n"
+        )
+        env = dict(os.environ, PYTHONHASHSEED='12345', DJANGO_SETTINGS_MODULE='resume_analyzer.settings')
+        result = subprocess.run(
+            [sys.executable, '-c', script], input=RESUME_TEXT, capture_output=True, text=True,
+            cwd=django_settings.BASE_DIR, env=env, check=True,
+        )
+        self.assertEqual(result.stdout, compute_signature(RESUME_TEXT).tobytes().hex())
+
+    def test_signature_shape(self):
+        signature = compute_signature(RESUME_TEXT)
+        self.assertEqual(signature.dtype, np.uint32)
+        self.assertEqual(len(signature), NUM_PERMUTATIONS)
+        self.assertIsNone(compute_signature("  \n "))
+
+    def test_similarity_tracks_text_overlap(self):
+        signature = compute_signature(RESUME_TEXT)
+        self.assertEqual(similarity(signature, compute_signature(RESUME_TEXT.upper())), 1.0)
+        edited = similarity(signature, compute_signature(RESUME_TEXT.replace("React", "Vue")))
+        unrelated = similarity(signature, compute_signature("Chef with ten years in French kitchens and pastry work"))
+        self.assertGreater(edited, 0.5)
+        self.assertLess(edited, 1.0)
+        self.assertLess(unrelated, 0.1)
+
+    def test_band_buckets(self):
+        self.assertEqual(LSH_BANDS * LSH_ROWS, NUM_PERMUTATIONS)
+        signature = np.arange(NUM_PERMUTATIONS, dtype=np.uint32)
+        buckets = band_buckets(signature)
+        self.assertEqual([band for band, _ in buckets], list(range(LSH_BANDS)))
+        self.assertEqual(buckets, band_buckets(signature.copy()))
+        for _, bucket in buckets:
+            self.assertTrue(-2 ** 63 <= bucket < 2 ** 63)
+
+        # Changing one row only moves the bucket of the band containing it
+        changed = signature.copy()
+        changed[LSH_ROWS * 3 + 2] += 1
+        differing = [band for (band, first), (_, second) in zip(buckets, band_buckets(changed)) if first != second]
+        self.assertEqual(differing, [3])
+
+
+class DuplicateClusteringTests(TestCase):
+    def _indexed(self, signature, created_at):
+        candidate = _profile(minhash=signature.tobytes())
+        CandidateProfile.objects.filter(id=candidate.id).update(created_at=created_at)
+        ResumeSignatureBucket.objects.bulk_create([
+            ResumeSignatureBucket(candidate_profile=candidate, band=band, bucket=bucket)
+            for band, bucket in band_buckets(signature)
+        ])
+        return candidate
+
+    def test_cluster_duplicates_joins_chains_under_the_oldest_resume(self):
+        now = timezone.now()
+        first = np.arange(NUM_PERMUTATIONS, dtype=np.uint32)
+        second = first.copy()
+        second[:LSH_ROWS * 2] += 1000  # 0.875 similar to first
+        third = second.copy()
+        third[LSH_ROWS * 2:LSH_ROWS * 4] += 1000  # 0.875 similar to second, 0.75 to first
+        unrelated = first + 5000
+
+        oldest = self._indexed(first, now - timedelta(days=3))
+        middle = self._indexed(second, now - timedelta(days=2))
+        newest = self._indexed(third, now - timedelta(days=1))
+        other = self._indexed(unrelated, now - timedelta(days=4))
+        # A stale link the reclustering must clear
+        CandidateProfile.objects.filter(id=other.id).update(duplicate_of=oldest)
+
+        summary = cluster_duplicates(threshold=0.85)
+
+        self.assertEqual(summary["clusters"], 1)
+        self.assertEqual(summary["duplicates"], 2)
+        self.assertEqual(summary["resumes"], 4)
+        links = dict(CandidateProfile.objects.values_list('id', 'duplicate_of_id'))
+        self.assertEqual(links[middle.id], oldest.id)
+        self.assertEqual(links[newest.id], oldest.id)
+        self.assertIsNone(links[oldest.id])
+        self.assertIsNone(links[other.id])
+
+        # A second run has nothing left to change
+        self.assertEqual(cluster_duplicates(threshold=0.85)["changed"], 0)
+
+    def test_index_resume_links_to_the_canonical_resume(self):
+        original = _profile()
+        index_resume(original)
+        copy = _profile(RESUME_TEXT + "\nReferences available on request")
+        self.assertEqual(index_resume(copy), original.id)
+        again = _profile(RESUME_TEXT + "\nReferences available on request.")
+        self.assertEqual(index_resume(again), original.id)
+        self.assertEqual(ResumeSignatureBucket.objects.filter(candidate_profile=again).count(), LSH_BANDS)
+
+        unrelated = _profile("Chef with ten years in French kitchens and pastry work")
+        self.assertIsNone(index_resume(unrelated))
+
+
+class FeatureTests(TestCase):
+    def test_education_level(self):
+        cases = [
+            ({"education": ["PhD in Physics"]}, EDUCATION_DOCTORATE),
+            ({"education": ["MS in Computer Science, Stanford"]}, EDUCATION_MASTER),
+            ({"education": ["M.Sc. Data Science"]}, EDUCATION_MASTER),
+            ({"education": ["MA (English)"]}, EDUCATION_MASTER),
+            ({"education": ["BS Computer Science, MIT, Cambridge, MA"]}, EDUCATION_BACHELOR),
+            ({"education": ["Bachelor's degree, Economics"]}, EDUCATION_BACHELOR),
+            ({"education": ["Associate of Applied Science"]}, EDUCATION_ASSOCIATE),
+            ({"education": ["High school diploma"]}, EDUCATION_HIGH_SCHOOL),
+            ({"education": ["Certified Scrum Master"]}, EDUCATION_NONE),
+            ({"education": ["Worked in MS Office, Boston, MA"]}, EDUCATION_NONE),
+        ]
+        for structured_data, expected in cases:
+            with self.subTest(structured_data=structured_data):
+                self.assertEqual(education_level(structured_data), expected)
+
+    def test_education_level_falls_back_to_text(self):
+        self.assertEqual(education_level({}, "Master of Business Administration, 2015"), EDUCATION_MASTER)
+        self.assertEqual(education_level({"education": []}, ""), EDUCATION_NONE)
+
+    def test_years_of_experience_merges_overlapping_roles(self):
+        structured_data = {"work_experience": [
+            "Engineer, Acme, Jan 2015 - Dec 2018",
+            "Consultant, Self-employed, 2017 - 2019",
+            "Lead, Initech, 03/2020 - present",
+        ]}
+        # 2015.0-2019.5 (merged) plus 2020.17-2024.0
+        self.assertEqual(years_of_experience(structured_data, today=date(2024, 1, 15)), 8.3)
+
+    def test_years_of_experience_uses_stated_years_without_dates(self):
+        self.assertEqual(years_of_experience({}, "Over 7+ years of professional experience"), 7.0)
+        self.assertIsNone(years_of_experience({"work_experience": ["Engineer at Acme"]}, "Python developer"))
+
+    def test_skill_count_and_apply_features(self):
+        self.assertEqual(skill_count({"skills": ["Python", "", "SQL"]}), 2)
+        self.assertEqual(skill_count({"skills": "Python"}), 1)
+        candidate = CandidateProfile(structured_data={"skills": ["Python", "SQL"], "education": ["MSc Statistics"]}, extracted_text="")
+        apply_features(candidate, moment=timezone.now().replace(year=2023, month=5, day=20))
+        self.assertEqual(candidate.skill_count, 2)
+        self.assertEqual(candidate.education_level, EDUCATION_MASTER)
+        self.assertEqual(candidate.last_updated_bucket, date(2023, 5, 1))
+
+    def test_parse_feature_filters(self):
+        filters = parse_feature_filters({"min_skills": "3", "max_years": "5.5", "education": "Bachelor", "updated_since": "2024-02-10"})
+        self.assertEqual(filters, {
+            "skill_count__gte": 3,
+            "years_experience__lte": 5.5,
+            "education_level__gte": EDUCATION_BACHELOR,
+            "last_updated_bucket__gte": date(2024, 2, 1),
+        })
+        for params in ({"min_skills": "many"}, {"education": "wizard"}, {"updated_since": "recently"}):
+            with self.subTest(params=params), self.assertRaises(ValidationError):
+                parse_feature_filters(params)
+
+
+# The sample resume bundled with the repository
+SAMPLE_RESUME_PDF = django_settings.BASE_DIR / 'media' / 'resumes' / 'Vishesh_148Z.pdf'
+
+
+@mock.patch('candidates_resume.utils._get_nlp', return_value=None)
+class LocalResumeParserTests(SimpleTestCase):
+    def _parse(self, text):
+        return LocalResumeParser().parse(text)
+
+    def test_sections_and_inline_headers(self, _):
+        data = self._parse(
+            "JOHN SMITH\nBackend developer\n"
+            "Summary\nBuilt systems in Go and R.\n"
+            "Technical Skills\n- Languages: Go, R\n- Frameworks: Django | FastAPI\n"
+            "Interests Chess, Kafka novels\n"
+            "Work Experience\nSoftware Engineer, Acme\n- Built APIs\n- Ran Kubernetes\nIntern, Initech\n"
+            "Education: B.Tech in Computer Science, XYZ University"
+        )
+        self.assertEqual(data["name"], "John Smith")
+        self.assertEqual(data["work_experience"], ["Software Engineer, Acme", "Intern, Initech"])
+        self.assertEqual(data["education"], ["B.Tech in Computer Science, XYZ University"])
+        # Short names only count inside the skills section; gazetteer hits anywhere else
+        self.assertEqual(data["skills"], ["Golang", "R", "Django", "FastAPI", "Apache Kafka", "Kubernetes"])
+
+    def test_dated_entries_drop_description_lines(self, _):
+        data = self._parse(
+            "Jane Doe\nEXPERIENCE\nData Engineer, Hooli\nMar 2021 - Present\nAustin, TX\n"
+            "Moved the nightly batch jobs to Airflow, cutting runtime by half.\n"
+            "Analyst, Initech Jan 2018 \u2013 Feb 2021\nBuilt dashboards.\n"
+        )
+        self.assertEqual(data["work_experience"], ["Data Engineer, Hooli Mar 2021 - Present", "Analyst, Initech Jan 2018 \u2013 Feb 2021"])
+
+    def test_education_skips_dates_and_places(self, _):
+        text = "Jane Doe\nEDUCATION\nSep 2014 - Jun 2018\nPune, India\nStudied at Fergusson\n"
+        self.assertEqual(self._parse(text)["education"], ["Studied at Fergusson"])
+        # Degree lines elsewhere in the text beat the section's leftovers
+        self.assertEqual(self._parse(text + "CERTIFICATIONS\nBachelor of Science, Pune University")["education"],
+                         ["Bachelor of Science, Pune University"])
+
+    def test_projects_stand_in_for_missing_experience(self, _):
+        data = self._parse("Jane Doe\nPROJECTS\nChat App Jan '23 \u2014 Mar '23\nRemote\nA chat app.\n")
+        self.assertEqual(data["work_experience"], ["Chat App Jan '23 \u2014 Mar '23"])
+
+    @unittest.skipUnless(SAMPLE_RESUME_PDF.exists(), "sample resume not present")
+    def test_sample_resume(self, _):
+        with open(SAMPLE_RESUME_PDF, 'rb') as file:
+            text, _backend = extract_pdf_text(file)
+        data = self._parse(text)
+        self.assertEqual(data["name"], "Vishesh Agarwal")
+        self.assertEqual(data["education"], [
+            "Master in Computer Science in Computer Science , GNIOT (CGPA: 7.44)",
+            "Bachelor of Computer Applications in Computer Science , LPCPS (CGPA: 7.34)",
+            "Higher Secondary in Science, City Convent School (CGPA: 5.68)",
+            "Senior Secondary in Science, Bhupati Singh Memorial Inter College (CGPA: 6.2)",
+        ])
+        self.assertEqual(data["work_experience"], [
+            "Interview Portal Link Jan '24 \u2014 Apr '24", "Event Management System Link Nov '22 \u2014 Mar '23",
+        ])
+        for skill in ("Python", "PostgreSQL", "Django", "Amazon Web Services", "Git", "Pandas"):
+            self.assertIn(skill, data["skills"])
+
+
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir, ignore_errors=True)
+        patcher = mock.patch.object(settings, 'RESUME_UPLOAD_SPOOL_DIR', spool_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.data = RESUME_TEXT.encode('utf-8')
+
+    def _start(self, checksum=None):
+        payload = {"file_name": "resume.txt", "total_size": len(self.data), "parser": "fast"}
+        if checksum:
+            payload["checksum"] = checksum
+        response = self.client.post('/api/resume/upload/chunked/', payload, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        return response.json()["id"]
+
+    def _put(self, upload_id, chunk, offset, **headers):
+        return self.client.put(
+            f'/api/resume/upload/chunked/{upload_id}/', chunk,
+            content_type='application/octet-stream', HTTP_UPLOAD_OFFSET=str(offset), **headers,
+        )
+
+    def _complete(self, upload_id):
+        return self.client.post(f'/api/resume/upload/chunked/{upload_id}/complete/')
+
+    def test_chunks_resume_from_reported_offset(self):
+        upload_id = self._start(checksum=hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(self._put(upload_id, self.data[:100], 0).status_code, 200)
+
+        # A client that lost track asks for the offset and continues from there
+        received = self.client.get(f'/api/resume/upload/chunked/{upload_id}/').json()["received_size"]
+        self.assertEqual(received, 100)
+        response = self._put(upload_id, self.data[received:], received)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ResumeUpload.objects.get(id=upload_id).chunks[1]["offset"], 100)
+
+        response = self._complete(upload_id)
+        self.assertEqual(response.status_code, 201)
+        profile = CandidateProfile.objects.get(id=response.json()["id"])
+        self.assertEqual(profile.extracted_text.strip(), RESUME_TEXT)
+        self.assertFalse(spool_path(ResumeUpload.objects.get(id=upload_id)).exists())
+
+    def test_offset_mismatch_is_a_conflict(self):
+        upload_id = self._start()
+        self._put(upload_id, self.data[:100], 0)
+        for offset in (0, 150):
+            response = self._put(upload_id, self.data[offset:offset + 10], offset)
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.json()["received_size"], 100)
+
+    def test_stale_duplicate_chunk_does_not_touch_the_spool(self):
+        upload_id = self._start()
+        stale = ResumeUpload.objects.get(id=upload_id)
+        self.assertEqual(self._put(upload_id, self.data[:100], 0).status_code, 200)
+
+        # A second request for offset 0 that read the upload before the first one finished
+        with self.assertRaises(ChunkError) as raised:
+            write_chunk(stale, 0, io.BytesIO(b"x" * 50), 50)
+        self.assertTrue(raised.exception.conflict)
+        self.assertEqual(stale.received_size, 100)
+        self.assertEqual(spool_path(stale).read_bytes(), self.data[:100])
+
+    @unittest.skipIf(fcntl is None, "spool files are not locked on this platform")
+    def test_chunk_in_flight_blocks_the_same_offset(self):
+        upload_id = self._start()
+        self._put(upload_id, self.data[:100], 0)
+        upload = ResumeUpload.objects.get(id=upload_id)
+        with open(spool_path(upload), 'ab') as spool:
+            fcntl.flock(spool.fileno(), fcntl.LOCK_EX)
+            response = self._put(upload_id, self.data[100:], 100)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["received_size"], 100)
+        self.assertEqual(spool_path(upload).stat().st_size, 100)
+        self.assertEqual(self._put(upload_id, self.data[100:], 100).status_code, 200)
+
+    def test_chunk_checksum_mismatch_rejects_only_that_chunk(self):
+        upload_id = self._start()
+        self._put(upload_id, self.data[:100], 0)
+        response = self._put(upload_id, self.data[100:], 100, HTTP_X_CHUNK_SHA256=hashlib.sha256(b"other").hexdigest())
+        self.assertEqual(response.status_code, 400)
+        upload = ResumeUpload.objects.get(id=upload_id)
+        self.assertEqual(upload.received_size, 100)
+        self.assertEqual(spool_path(upload).stat().st_size, 100)
+
+        chunk = self.data[100:]
+        response = self._put(upload_id, chunk, 100, HTTP_X_CHUNK_SHA256=hashlib.sha256(chunk).hexdigest())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["received_size"], len(self.data))
+
+    def test_file_checksum_mismatch_resets_the_upload(self):
+        upload_id = self._start(checksum=hashlib.sha256(self.data).hexdigest())
+        self._put(upload_id, self.data.replace(b"Jane", b"John"), 0)
+        response = self._complete(upload_id)
+        self.assertEqual(response.status_code, 400)
+        upload = ResumeUpload.objects.get(id=upload_id)
+        self.assertEqual((upload.status, upload.received_size, upload.chunks), (ResumeUpload.STATUS_IN_PROGRESS, 0, []))
+        self.assertFalse(spool_path(upload).exists())
+        self.assertFalse(CandidateProfile.objects.exists())
+
+        self.assertEqual(self._put(upload_id, self.data, 0).status_code, 200)
+        self.assertEqual(self._complete(upload_id).status_code, 201)
+
+    def test_complete_creates_one_profile(self):
+        upload_id = self._start()
+        self.assertEqual(self._complete(upload_id).status_code, 400)  # Nothing received yet
+        self._put(upload_id, self.data, 0)
+
+        # Another request is already completing the upload
+        ResumeUpload.objects.filter(id=upload_id).update(status=ResumeUpload.STATUS_PROCESSING)
+        self.assertEqual(self._complete(upload_id).status_code, 409)
+        ResumeUpload.objects.filter(id=upload_id).update(status=ResumeUpload.STATUS_IN_PROGRESS)
+
+        self.assertEqual(self._complete(upload_id).status_code, 201)
+        response = self._complete(upload_id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], ResumeUpload.STATUS_COMPLETED)
+        self.assertEqual(CandidateProfile.objects.count(), 1)
+        self.assertEqual(self._put(upload_id, self.data, 0).status_code, 400)
+
+    def test_failed_parse_releases_the_claim(self):
+        upload_id = self._start()
+        self._put(upload_id, self.data, 0)
+        with mock.patch('candidates_resume.views.parse_resume', side_effect=ValueError("parser crashed")):
+            self.assertEqual(self._complete(upload_id).status_code, 500)
+        self.assertEqual(ResumeUpload.objects.get(id=upload_id).status, ResumeUpload.STATUS_IN_PROGRESS)
+        self.assertEqual(self._complete(upload_id).status_code, 201)
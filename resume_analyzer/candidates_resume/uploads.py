@@ -0,0 +1,140 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from django.utils import timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the received_size compare-and-set guards concurrent chunks
+    fcntl = None
+from .models import ResumeUpload
+from resume_analyzer import settings
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+# Bytes read from the request stream / spool file per iteration
+COPY_BLOCK_SIZE = 64 * 1024
+
+
+class ChunkError(Exception):
+    """A chunk was rejected; `conflict` marks offset mismatches the client can recover from."""
+
+    def __init__(self, message, conflict=False):
+        super().__init__(message)
+        self.conflict = conflict
+
+
+def spool_path(upload):
+    """Location of the spool file holding the bytes received so far."""
+    return Path(settings.RESUME_UPLOAD_SPOOL_DIR) / f"{upload.id}.part"
+
+
+def _lock_spool(spool):
+    """Take an exclusive, non-blocking lock on an open spool file; False if another request holds it."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(spool.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def write_chunk(upload, offset, stream, length, expected_sha256=None):
+    """
+    Append `length` bytes read from `stream` to the upload's spool file at `offset` and
+    record the chunk on the upload. The chunk is hashed while it is copied. On a checksum
+    or length mismatch the spool file is truncated back to `offset`.
+    The spool file is locked and received_size re-read before anything is written, so a
+    concurrent request for the same offset gets a conflict instead of rewriting the bytes;
+    the lock is held until received_size has advanced. Returns the chunk's SHA-256 hex digest.
+    """
+    if offset != upload.received_size:
+        raise ChunkError(f"Expected offset {upload.received_size}, got {offset}", conflict=True)
+    if length <= 0:
+        raise ChunkError("Chunk is empty")
+    if length > settings.RESUME_UPLOAD_MAX_CHUNK_SIZE:
+        raise ChunkError(f"Chunk exceeds the maximum size of {settings.RESUME_UPLOAD_MAX_CHUNK_SIZE} bytes")
+    if offset + length > upload.total_size:
+        raise ChunkError("Chunk extends past the declared file size")
+
+    path = spool_path(upload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    written = 0
+    with open(path, 'ab') as spool:
+        if not _lock_spool(spool):
+            raise ChunkError("Another chunk is being written", conflict=True)
+        upload.received_size, upload.chunks = (
+            ResumeUpload.objects.filter(id=upload.id).values_list('received_size', 'chunks').get()
+        )
+        if offset != upload.received_size:
+            raise ChunkError(f"Expected offset {upload.received_size}, got {offset}", conflict=True)
+
+        spool.truncate(offset)
+        spool.seek(offset)
+        while written < length:
+            block = stream.read(min(COPY_BLOCK_SIZE, length - written))
+            if not block:
+                break
+            digest.update(block)
+            spool.write(block)
+            written += len(block)
+
+        if written != length:
+            spool.truncate(offset)
+            raise ChunkError(f"Received {written} of {length} bytes")
+        if expected_sha256 and digest.hexdigest() != expected_sha256.lower():
+            spool.truncate(offset)
+            raise ChunkError("Chunk checksum mismatch")
+        spool.flush()
+        os.fsync(spool.fileno())
+
+        # Compare-and-set as well, for platforms without file locks
+        chunks = upload.chunks + [{"offset": offset, "size": length, "sha256": digest.hexdigest()}]
+        updated = ResumeUpload.objects.filter(id=upload.id, received_size=offset).update(
+            received_size=offset + length, chunks=chunks, updated_at=timezone.now(),
+        )
+        if not updated:
+            upload.refresh_from_db(fields=['received_size', 'chunks'])
+            raise ChunkError("Concurrent chunk upload", conflict=True)
+        upload.received_size, upload.chunks = offset + length, chunks
+    return digest.hexdigest()
+
+
+def file_sha256(path):
+    """SHA-256 of a file on disk, read block by block."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(COPY_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def discard_spool(upload):
+    """Delete the spool file, if any."""
+    try:
+        spool_path(upload).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def cleanup_stale_uploads(max_age):
+    """
+    Delete unfinished uploads (and their spool files) untouched for longer than
+    `max_age` (a timedelta), including ones whose completion never finished.
+    Returns the number of removed uploads.
+    """
+    stale = ResumeUpload.objects.filter(
+        status__in=[ResumeUpload.STATUS_IN_PROGRESS, ResumeUpload.STATUS_PROCESSING],
+        updated_at__lt=timezone.now() - max_age,
+    )
+    removed = 0
+    for upload in stale.iterator():
+        discard_spool(upload)
+        upload.delete()
+        removed += 1
+    logger.info(f"Removed {removed} stale resume uploads")
+    return removed
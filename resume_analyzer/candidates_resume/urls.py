@@ -3,6 +3,11 @@ from . import views
 
 urlpatterns = [
     path('resume/upload/', views.upload_resume, name='upload_resume'),
+    path('resume/upload/chunked/', views.init_chunked_upload, name='init_chunked_upload'),
+    path('resume/upload/chunked/<uuid:upload_id>/', views.chunked_upload, name='chunked_upload'),
+    path('resume/upload/chunked/<uuid:upload_id>/complete/', views.complete_chunked_upload, name='complete_chunked_upload'),
     path('resume/all/', views.get_all_resumes, name='get_all_resumes'),
+    path('resume/duplicates/', views.get_duplicate_resumes, name='get_duplicate_resumes'),
     path('resume/<uuid:candidate_id>/sort/', views.sort_candidate_data, name='sort_candidate_data'),
+    path('export/candidates/', views.export_candidates, name='export_candidates'),
 ]
\ No newline at end of file
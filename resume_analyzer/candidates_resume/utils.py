@@ -1,41 +1,125 @@
-import pdfplumber
-import docx2txt
 import logging
+import queue
+import threading
 import requests
 import json
 import re
+from django.db import close_old_connections
+from .models import CandidateProfile
+from .features import apply_features, FEATURE_FIELDS
 from resume_analyzer import settings
+from resume_analyzer.common.gemini import generate_content, discard_cached_content, PRIORITY_BULK
+from resume_analyzer.common.llm_cache import OPERATION_PARSE_RESUME
+from resume_analyzer.common.skills import canonicalize_skills, canonicalize_structured_data
+from resume_analyzer.common.log import truncate_for_log
 
 # Initialize logger for job posting operations
 logger = logging.getLogger('job_posting')
 
-# Gemini API endpoint
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+# PDF text extraction backends. 'auto' tries pdfium first and falls back to
+# pdfplumber only when the pdfium output looks wrong.
+PDF_BACKEND_PDFIUM = 'pdfium'
+PDF_BACKEND_PDFPLUMBER = 'pdfplumber'
+PDF_BACKEND_AUTO = 'auto'
 
-def extract_text_from_file(file, file_type):
+# Auto mode falls back when pdfium yields fewer characters per page than this,
+# or when too little of the output is readable text
+MIN_CHARS_PER_PAGE = 40
+MIN_PRINTABLE_RATIO = 0.9
+
+
+def _extract_pdf_pdfium(file):
+    """Fast path: PDFium's text layer, without building per-character layout objects."""
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(file)
+    try:
+        pages = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            pages.append(textpage.get_text_bounded().replace('\r\n', '\n'))
+            textpage.close()
+            page.close()
+        return "\n".join(pages), len(pages)
+    finally:
+        pdf.close()
+
+
+def _extract_pdf_pdfplumber(file):
+    """Accurate but slow: pdfplumber/pdfminer layout analysis."""
+    import pdfplumber
+
+    with pdfplumber.open(file) as pdf:
+        text = "\n".join(page.extract_text() or "" for page in pdf.pages)
+        return text, len(pdf.pages)
+
+
+PDF_BACKENDS = {
+    PDF_BACKEND_PDFIUM: _extract_pdf_pdfium,
+    PDF_BACKEND_PDFPLUMBER: _extract_pdf_pdfplumber,
+}
+
+
+def pdf_text_looks_wrong(text, page_count):
+    """
+    Heuristic check for a broken text layer: (almost) no text per page, or output
+    dominated by replacement/control characters from bad font encodings.
+    """
+    stripped = text.strip()
+    if len(stripped) < MIN_CHARS_PER_PAGE * max(page_count, 1):
+        return True
+    printable = sum(1 for char in stripped if char.isprintable() or char in '\n\t')
+    readable = printable - stripped.count('\ufffd')
+    return readable / len(stripped) < MIN_PRINTABLE_RATIO
+
+
+def extract_pdf_text(file, backend=None):
+    """
+    Extract text from a PDF with the given backend (defaults to PDF_EXTRACTION_BACKEND).
+    Returns a (text, backend_used) tuple.
+    """
+    backend = backend or settings.PDF_EXTRACTION_BACKEND
+    if backend != PDF_BACKEND_AUTO:
+        if backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF extraction backend '{backend}'")
+        return PDF_BACKENDS[backend](file)[0], backend
+
+    try:
+        text, page_count = _extract_pdf_pdfium(file)
+        if not pdf_text_looks_wrong(text, page_count):
+            return text, PDF_BACKEND_PDFIUM
+        logger.info("PDFium output looks wrong, falling back to pdfplumber")
+    except Exception as e:
+        logger.warning(f"PDFium extraction failed, falling back to pdfplumber: {str(e)}")
+    file.seek(0)
+    return _extract_pdf_pdfplumber(file)[0], PDF_BACKEND_PDFPLUMBER
+
+
+def extract_text(file, file_type, pdf_backend=None):
     """
     Extract text from a given file based on its type.
-    Supports PDF, DOCX, and TXT formats.
+    Supports PDF, DOCX, and TXT formats. Returns a (text, backend) tuple where
+    backend names the extractor that produced the text.
     """
     try:
         if file_type == 'pdf':
-            with pdfplumber.open(file) as pdf:
-                text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-            return text
+            return extract_pdf_text(file, pdf_backend)
         elif file_type == 'docx':
-            return docx2txt.process(file)
+            import docx2txt
+            return docx2txt.process(file), 'docx2txt'
         elif file_type == 'txt':
-            return file.read().decode('utf-8')
+            return file.read().decode('utf-8'), 'text'
         else:
             raise ValueError("Unsupported file type")
     except Exception as e:
         logger.error(f"Error extracting text from file: {str(e)}", exc_info=True)
         raise
 
-def parse_resume_with_gemini(text):
+def parse_resume_with_gemini(text, priority=PRIORITY_BULK):
     """
     Use the Gemini API to parse resume text into structured JSON.
     Extracts key fields like name, skills, education, and work experience.
+    Resume ingestion runs in the bulk lane of the Gemini scheduler by default.
     """
     try:
         prompt = (
@@ -44,38 +128,386 @@ def parse_resume_with_gemini(text):
             "work_experience (list of strings). Return only the JSON object without any additional text. "
             "Here is the text:\n\n" + text
         )
-        
-        headers = {
-            'Content-Type': 'application/json',
-        }
-        payload = {
-            "contents": [{
-                "parts": [{"text": prompt}]
-            }]
-        }
 
         # Send request to Gemini API for parsing
-        response = requests.post(
-            f"{GEMINI_API_URL}?key={settings.GEMINI_API_KEY}",
-            headers=headers,
-            json=payload
-        )
-
-        if response.status_code != 200:
-            logger.error(f"Gemini API call failed: {response.text}")
-            raise Exception("Failed to parse resume with Gemini API")
-
-        gemini_response = response.json()
-        raw_text = gemini_response['candidates'][0]['content']['parts'][0]['text']
+        raw_text = generate_content(prompt, priority=priority, cache=OPERATION_PARSE_RESUME)
 
         json_content = re.sub(r'```json\s*|\s*```', '', raw_text).strip()
 
         # Parse the cleaned JSON string into a Python dictionary
         structured_data = json.loads(json_content)
-        return structured_data
+        return canonicalize_structured_data(structured_data)
     except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse Gemini response as JSON: {str(e)} - Raw response: {raw_text}")
+        logger.error(f"Failed to parse Gemini response as JSON: {str(e)} - Raw response: {truncate_for_log(raw_text)}")
+        discard_cached_content(prompt, OPERATION_PARSE_RESUME)
         raise Exception("Invalid JSON format in Gemini response")
+    except requests.RequestException as e:
+        logger.warning(f"Gemini request failed while parsing resume: {str(e)}")
+        raise
     except Exception as e:
         logger.error(f"Error parsing resume with Gemini: {str(e)}", exc_info=True)
         raise
+
+
+# Parser modes selectable per deployment (RESUME_PARSER_MODE) or per upload (?parser=)
+PARSER_MODE_LLM = 'llm'
+PARSER_MODE_FAST = 'fast'
+PARSER_MODE_FAST_THEN_LLM = 'fast_then_llm'
+PARSER_MODES = (PARSER_MODE_LLM, PARSER_MODE_FAST, PARSER_MODE_FAST_THEN_LLM)
+
+# Section headings recognised by the local parser, keyed by the schema field they feed
+SECTION_HEADERS = {
+    'skills': {
+        'skills', 'technical skills', 'key skills', 'core skills', 'skill set', 'skillset', 'core competencies',
+        'competencies', 'technologies', 'tech stack', 'technical expertise', 'tools and technologies',
+        'tools & technologies', 'technical proficiencies', 'expertise',
+    },
+    'education': {
+        'education', 'academic background', 'academics', 'academic qualifications', 'qualifications',
+        'educational qualifications', 'education and training', 'education & training',
+    },
+    'work_experience': {
+        'experience', 'work experience', 'professional experience', 'employment', 'employment history',
+        'work history', 'career history', 'professional background', 'relevant experience', 'internships',
+        'internship', 'experience and internships',
+    },
+    # Not a schema field; stands in for work experience on resumes without any (students, graduates)
+    'projects': {'projects', 'personal projects', 'academic projects', 'key projects'},
+    # Recognised so they end the previous section, but not part of the schema
+    'other': {
+        'summary', 'profile', 'professional summary', 'objective', 'career objective', 'about me',
+        'certifications', 'certificates', 'awards', 'achievements',
+        'honors', 'publications', 'languages', 'interests', 'hobbies', 'references', 'volunteering',
+        'extracurricular activities', 'activities', 'contact', 'personal details', 'declaration',
+    },
+}
+_HEADER_LOOKUP = {header: section for section, headers in SECTION_HEADERS.items() for header in headers}
+
+# Skills gazetteer scanned over the whole text. Ambiguous short names ("Go", "R", "C")
+# are only accepted when listed inside a skills section.
+SKILLS_GAZETTEER = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Ruby', 'PHP', 'Kotlin', 'Swift', 'Scala',
+    'Rust', 'Golang', 'Perl', 'MATLAB', 'Objective-C', 'Dart', 'Elixir', 'Haskell', 'Lua', 'Bash', 'Shell Scripting',
+    'PowerShell', 'SQL', 'NoSQL', 'PL/SQL', 'HTML', 'CSS', 'Sass', 'Django', 'Flask', 'FastAPI', 'Spring',
+    'Spring Boot', 'Hibernate', 'Node.js', 'Express.js', 'React', 'React Native', 'Angular', 'Vue.js', 'Next.js',
+    'Svelte', 'jQuery', 'Redux', 'GraphQL', 'REST', 'gRPC', '.NET', 'ASP.NET', 'Ruby on Rails', 'Laravel',
+    'Flutter', 'Android', 'iOS', 'PostgreSQL', 'MySQL', 'SQLite', 'MongoDB', 'Redis', 'Cassandra', 'Elasticsearch',
+    'DynamoDB', 'Oracle', 'Snowflake', 'BigQuery', 'Kafka', 'RabbitMQ', 'Celery', 'Spark', 'Hadoop', 'Airflow',
+    'dbt', 'Pandas', 'NumPy', 'SciPy', 'scikit-learn', 'TensorFlow', 'PyTorch', 'Keras', 'spaCy', 'NLTK',
+    'OpenCV', 'Machine Learning', 'Deep Learning', 'Natural Language Processing', 'NLP', 'Computer Vision',
+    'Data Analysis', 'Data Science', 'Data Engineering', 'Statistics', 'Tableau', 'Power BI', 'Excel', 'AWS',
+    'Azure', 'GCP', 'Google Cloud', 'Docker', 'Kubernetes', 'Terraform', 'Ansible', 'Jenkins', 'GitHub Actions',
+    'GitLab CI', 'CI/CD', 'Linux', 'Unix', 'Git', 'Jira', 'Agile', 'Scrum', 'Microservices', 'System Design',
+    'Selenium', 'Cypress', 'Jest', 'pytest', 'JUnit', 'Figma', 'Photoshop', 'Salesforce', 'SAP', 'Blockchain',
+    'Solidity', 'Unity', 'Unreal Engine', 'Networking', 'Cybersecurity', 'Project Management', 'Communication',
+    'Leadership',
+]
+_GAZETTEER_LOOKUP = {skill.lower(): skill for skill in SKILLS_GAZETTEER}
+_GAZETTEER_PATTERN = re.compile(
+    r'(?<![\w.+#/-])(' + '|'.join(re.escape(skill) for skill in sorted(SKILLS_GAZETTEER, key=len, reverse=True)) + r')(?![\w+#/-])',
+    re.IGNORECASE
+)
+
+_DEGREE_PATTERN = re.compile(
+    r'\b(bachelor|master|ph\.?d|doctorate|mba|b\.?\s?tech|m\.?\s?tech|b\.?\s?e\b|b\.?\s?sc|m\.?\s?sc|b\.?\s?s\b|m\.?\s?s\b|'
+    r'b\.?\s?a\b|m\.?\s?a\b|bca|mca|diploma|associate degree|high school|secondary|university|college|institute)',
+    re.IGNORECASE
+)
+# Dates as resumes write them ("Jan 2020", "Oct '22", "03/2021", "2019", "Present") and ranges of them
+_DATE = (
+    r"(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s*(?:['\u2019]\d{2}|(?:19|20)\d{2})"
+    r"|(?:0?[1-9]|1[0-2])[/.-](?:19|20)\d{2}|(?:19|20)\d{2}|present|current|now|ongoing)"
+)
+_DATE_PATTERN = re.compile(r'(?<!\w)' + _DATE + r'(?!\w)', re.IGNORECASE)
+_DATE_RANGE_PATTERN = re.compile(
+    r'(?<!\w)' + _DATE + r"\s*(?:-|\u2013|\u2014|to|until|till)\s*" + _DATE + r'(?!\w)', re.IGNORECASE
+)
+# "Greater Noida, India", "Austin, TX": place names only, no other content (also reads
+# "Engineer, Acme" as a place, so only used to drop leftovers from education sections)
+_LOCATION_PATTERN = re.compile(r"^[A-Z][\w.'-]*(?:\s+[A-Z][\w.'-]*){0,3}\s*,\s*[A-Z][\w.'-]*(?:\s+[A-Z][\w.'-]*){0,2}$")
+_BULLET_PATTERN = re.compile(r'^\s*[-*\u2022\u25cf\u25aa\u2023\u2043\u00b7>]+\s*')
+_SKILL_SPLIT_PATTERN = re.compile(r'[,;|\u2022\u25cf\u00b7/]|\s{2,}|\t')
+
+_nlp = None
+
+
+def _get_nlp():
+    """
+    Load the pinned spaCy pipeline once per process, with only the NER component
+    enabled. Returns None if spaCy or the model is not installed.
+    """
+    global _nlp
+    if _nlp is None:
+        try:
+            import spacy
+            _nlp = spacy.load('en_core_web_sm', exclude=['parser', 'lemmatizer', 'attribute_ruler', 'tagger'])
+        except (ImportError, OSError) as e:
+            logger.warning(f"spaCy pipeline unavailable, using heuristic name detection: {str(e)}")
+            _nlp = False
+    return _nlp or None
+
+
+class ResumeParser:
+    """
+    Interface for resume parsers. parse() turns extracted resume text into the
+    structured_data schema: name (string), skills, education and work_experience (lists of strings).
+    """
+    name = None
+
+    def parse(self, text):
+        raise NotImplementedError
+
+
+class GeminiResumeParser(ResumeParser):
+    """LLM parser backed by the Gemini API (accurate, 2-6 s per resume)."""
+    name = PARSER_MODE_LLM
+
+    def __init__(self, priority=PRIORITY_BULK):
+        self.priority = priority
+
+    def parse(self, text):
+        return parse_resume_with_gemini(text, priority=self.priority)
+
+
+class LocalResumeParser(ResumeParser):
+    """
+    Rule- and NLP-based parser that runs at local CPU speed.
+    Uses section-header detection to split the resume, a skills gazetteer scanned
+    over the full text, and spaCy NER for the candidate name.
+    """
+    name = PARSER_MODE_FAST
+
+    max_entries = 15
+
+    def parse(self, text):
+        lines = [line.strip() for line in text.splitlines()]
+        sections = self._split_sections(lines)
+        return {
+            "name": self._extract_name(lines),
+            "skills": canonicalize_skills(self._extract_skills(text, sections['skills'])),
+            "education": self._extract_education(lines, sections['education']),
+            "work_experience": self._extract_experience(sections['work_experience'] or sections['projects']),
+        }
+
+    def _header_section(self, line):
+        if not line or len(line) > 40:
+            return None
+        key = re.sub(r'[^a-z& ]', '', line.lower()).strip()
+        return _HEADER_LOOKUP.get(re.sub(r'\s+', ' ', key))
+
+    def _split_sections(self, lines):
+        sections = {section: [] for section in SECTION_HEADERS}
+        current = None
+        for line in lines:
+            section = self._header_section(line)
+            if section:
+                current = section
+                continue
+            # "Skills: Python, Django" style inline headers. Only schema sections switch
+            # here, so sub-headings such as "Languages: ..." stay inside a skills block.
+            if ':' in line:
+                inline = self._header_section(line.split(':', 1)[0])
+                if inline and inline != 'other':
+                    current = inline
+                    sections[inline].append(line.split(':', 1)[1].strip())
+                    continue
+            else:
+                # "Interests Reading, Travel": a non-schema heading run into its content
+                words = line.split()
+                for size in (2, 1):
+                    if len(words) > size and words[size - 1][:1].isupper() \
+                            and self._header_section(' '.join(words[:size])) == 'other':
+                        current = 'other'
+                        break
+            if current and line:
+                sections[current].append(line)
+        return sections
+
+    def _extract_name(self, lines):
+        head = [line for line in lines if line][:8]
+        nlp = _get_nlp()
+        if nlp is not None and head:
+            for ent in nlp("\n".join(head)).ents:
+                if ent.label_ == 'PERSON' and 1 < len(ent.text.split()) <= 4:
+                    return ent.text.strip()
+        for line in head:
+            words = line.split()
+            if 1 < len(words) <= 4 and all(re.fullmatch(r"[A-Za-z.'-]+", word) for word in words) \
+                    and not self._header_section(line):
+                return line.title() if line.isupper() else line
+        return ""
+
+    def _extract_skills(self, text, skill_lines):
+        skills = {}
+        for line in skill_lines:
+            for item in _SKILL_SPLIT_PATTERN.split(_BULLET_PATTERN.sub('', line)):
+                item = item.strip(' .:-()')
+                # "Languages: Python" sub-headings inside a skills section
+                if ':' in item:
+                    item = item.split(':', 1)[1].strip()
+                if item and len(item) <= 40:
+                    canonical = _GAZETTEER_LOOKUP.get(item.lower(), item)
+                    skills.setdefault(canonical.lower(), canonical)
+        for match in _GAZETTEER_PATTERN.finditer(text):
+            canonical = _GAZETTEER_LOOKUP[match.group(1).lower()]
+            skills.setdefault(canonical.lower(), canonical)
+        return list(skills.values())
+
+    def _is_date_only(self, line):
+        return len(re.sub(r'[^A-Za-z]', '', _DATE_PATTERN.sub('', line))) < 3
+
+    def _entries(self, section_lines):
+        """
+        Group a section into entries. PDF text usually loses the bullets, so when the
+        section has date ranges each dated line starts an entry (with the title line
+        above it if the dates stand alone) and the description lines are dropped.
+        Otherwise each non-bullet line starts a new entry.
+        """
+        entries = []
+        if any(_DATE_RANGE_PATTERN.search(line) for line in section_lines):
+            previous = ''
+            for line in section_lines:
+                line = _BULLET_PATTERN.sub('', line)
+                if _DATE_RANGE_PATTERN.search(line):
+                    if not self._is_date_only(line):
+                        entries.append(line)
+                    elif previous and not self._is_date_only(previous) and not previous.endswith('.') \
+                            and not _DATE_RANGE_PATTERN.search(previous) and len(previous) <= 80:
+                        entries.append(f"{previous} {line}")
+                previous = line
+            return entries[:self.max_entries]
+
+        for line in section_lines:
+            if _BULLET_PATTERN.match(line) and entries:
+                continue
+            entry = _BULLET_PATTERN.sub('', line)
+            if entry:
+                entries.append(entry)
+        return entries[:self.max_entries]
+
+    def _extract_education(self, lines, section_lines):
+        # Degree/institution lines from the section, else from anywhere in the text (PDF
+        # extraction can move them out of it); dates, locations and coursework notes are noise
+        entries = [_BULLET_PATTERN.sub('', line) for line in section_lines if _DEGREE_PATTERN.search(line)]
+        if not entries:
+            entries = [line for line in lines if line and _DEGREE_PATTERN.search(line)]
+        if not entries:
+            entries = [
+                entry for entry in (_BULLET_PATTERN.sub('', line) for line in section_lines)
+                if not self._is_date_only(entry) and not _LOCATION_PATTERN.match(entry)
+            ]
+        return entries[:self.max_entries]
+
+    def _extract_experience(self, section_lines):
+        return self._entries(section_lines)
+
+
+RESUME_PARSERS = {
+    PARSER_MODE_LLM: GeminiResumeParser,
+    PARSER_MODE_FAST: LocalResumeParser,
+}
+
+
+def get_resume_parser(name):
+    """Return a parser instance for a registered parser name."""
+    try:
+        return RESUME_PARSERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown resume parser '{name}'")
+
+
+def parse_resume(text, mode=None):
+    """
+    Parse resume text according to the parser mode (defaults to RESUME_PARSER_MODE).
+    Returns a (structured_data, parse_status) tuple:
+    - fast: local parse, stored as final ('local').
+    - fast_then_llm: local parse stored as 'pending'; the caller queues LLM refinement.
+    - llm: Gemini parse ('parsed'); if Gemini is unavailable, the local parse is stored
+      as 'pending' and upgraded once the circuit closes.
+    """
+    mode = mode or settings.RESUME_PARSER_MODE
+    if mode not in PARSER_MODES:
+        raise ValueError(f"Unknown resume parser mode '{mode}'")
+
+    if mode == PARSER_MODE_FAST:
+        return get_resume_parser(PARSER_MODE_FAST).parse(text), CandidateProfile.PARSE_STATUS_LOCAL
+    if mode == PARSER_MODE_FAST_THEN_LLM:
+        return get_resume_parser(PARSER_MODE_FAST).parse(text), CandidateProfile.PARSE_STATUS_PENDING
+
+    try:
+        return get_resume_parser(PARSER_MODE_LLM).parse(text), CandidateProfile.PARSE_STATUS_PARSED
+    except requests.RequestException as e:
+        logger.warning(f"Gemini unavailable, storing local parse pending LLM refinement: {str(e)}")
+        return get_resume_parser(PARSER_MODE_FAST).parse(text), CandidateProfile.PARSE_STATUS_PENDING
+
+
+_refine_queue = queue.Queue()
+_refine_worker = None
+_refine_lock = threading.Lock()
+
+
+def refine_profile(candidate_id):
+    """
+    Replace a profile's local parse with the Gemini parse.
+    Leaves the profile pending if Gemini is unavailable; it is then picked up by
+    upgrade_pending_profiles once the circuit closes.
+    """
+    try:
+        candidate = CandidateProfile.objects.get(id=candidate_id, parse_status=CandidateProfile.PARSE_STATUS_PENDING)
+    except CandidateProfile.DoesNotExist:
+        return False
+    try:
+        candidate.structured_data = parse_resume_with_gemini(candidate.extracted_text)
+    except requests.RequestException:
+        return False
+    candidate.parse_status = CandidateProfile.PARSE_STATUS_PARSED
+    apply_features(candidate)
+    candidate.save(update_fields=['structured_data', 'parse_status', 'updated_at'] + FEATURE_FIELDS)
+    logger.info(f"Refined local parse with Gemini for candidate: {candidate_id}")
+    return True
+
+
+def _refine_worker_loop():
+    while True:
+        candidate_id = _refine_queue.get()
+        try:
+            refine_profile(candidate_id)
+        except Exception as e:
+            logger.error(f"Error refining candidate {candidate_id}: {str(e)}", exc_info=True)
+        finally:
+            close_old_connections()
+            _refine_queue.task_done()
+
+
+def schedule_refinement(candidate_id):
+    """Queue a fast-parsed profile for background LLM refinement (one worker thread per process)."""
+    global _refine_worker
+    with _refine_lock:
+        if _refine_worker is None or not _refine_worker.is_alive():
+            _refine_worker = threading.Thread(target=_refine_worker_loop, name='resume-refiner', daemon=True)
+            _refine_worker.start()
+    _refine_queue.put(candidate_id)
+
+
+def upgrade_pending_profiles():
+    """
+    Re-parse profiles stored with a pending parse once Gemini is reachable again.
+    Stops at the first Gemini failure and returns the number of upgraded profiles.
+    """
+    upgraded = 0
+    pending = CandidateProfile.objects.filter(parse_status=CandidateProfile.PARSE_STATUS_PENDING)
+    for candidate in pending.iterator():
+        try:
+            candidate.structured_data = parse_resume_with_gemini(candidate.extracted_text)
+        except requests.RequestException as e:
+            logger.warning(f"Stopped upgrading pending profiles after {upgraded}: {str(e)}")
+            break
+        except Exception as e:
+            logger.error(f"Failed to upgrade pending profile {candidate.id}: {str(e)}")
+            continue
+        candidate.parse_status = CandidateProfile.PARSE_STATUS_PARSED
+        apply_features(candidate)
+        candidate.save(update_fields=['structured_data', 'parse_status', 'updated_at'] + FEATURE_FIELDS)
+        upgraded += 1
+    logger.info(f"Upgraded {upgraded} pending profiles")
+    return upgraded
@@ -2,11 +2,21 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
 from rest_framework.exceptions import ValidationError, NotFound
-from .models import CandidateProfile
-from .serializers import CandidateProfileSerializer, CandidateProfileLiteSerializer  # Import new serializer
-from .utils import extract_text_from_file, parse_resume_with_gemini
+from django.db.models import F
+from django.utils import timezone
+from .models import CandidateProfile, ResumeUpload
+from .serializers import CandidateProfileSerializer, CandidateProfileLiteSerializer, ResumeUploadSerializer  # Import new serializer
+from .uploads import write_chunk, spool_path, file_sha256, discard_spool, ChunkError
+from .dedup import index_resume
+from .features import apply_features, parse_feature_filters
+from .utils import extract_text, parse_resume, schedule_refinement, PARSER_MODES, PARSER_MODE_FAST_THEN_LLM
 from resume_analyzer.common.errors import get_error_response
+from resume_analyzer.common.export import parse_export_params, streaming_export_response
 from resume_analyzer import settings
+from resume_analyzer.common.gemini import generate_content, discard_cached_content, PRIORITY_BULK
+from resume_analyzer.common.llm_cache import OPERATION_SORT_SKILLS
+from resume_analyzer.common.skills import canonicalize_skills
+from resume_analyzer.common.log import truncate_for_log
 import logging
 import requests
 import json
@@ -15,47 +25,65 @@ import re
 # Initialize logger for job posting operations
 logger = logging.getLogger('job_posting')
 
-@api_view(['POST'])
-def upload_resume(request):
-    """
-    API to upload and process a resume file.
-    Validates file type, extracts text, processes it using Gemini API, and saves the structured data.
-    """
-    if 'file' not in request.FILES:
-        raise ValidationError("No file provided")
-
-    file = request.FILES['file']
-    file_name = file.name.lower()
-    
-    # Determine file type
+def detect_file_type(file_name):
+    """Determine the resume file type from its name; raises ValidationError if unsupported."""
+    file_name = file_name.lower()
     if file_name.endswith('.pdf'):
-        file_type = 'pdf'
+        return 'pdf'
     elif file_name.endswith('.docx'):
-        file_type = 'docx'
+        return 'docx'
     elif file_name.endswith('.txt'):
-        file_type = 'txt'
-    else:
-        raise ValidationError("Unsupported file type. Use PDF, DOCX, or TXT")
+        return 'txt'
+    raise ValidationError("Unsupported file type. Use PDF, DOCX, or TXT")
 
+def get_parser_mode(request):
+    """Optional per-request parser override: llm, fast or fast_then_llm."""
+    parser_mode = request.data.get('parser') or request.query_params.get('parser')
+    if parser_mode and parser_mode not in PARSER_MODES:
+        raise ValidationError(f"Unsupported parser. Use one of: {', '.join(PARSER_MODES)}")
+    return parser_mode
+
+def process_resume(file, file_type, parser_mode=None):
+    """
+    Extract text from an open resume file, parse it and save the CandidateProfile.
+    Shared by the multipart and chunked upload paths. Returns the API Response.
+    """
     try:
         # Extract text from the file
-        extracted_text = extract_text_from_file(file, file_type)
+        extracted_text, extraction_backend = extract_text(file, file_type)
         if not extracted_text.strip():
             raise ValidationError("No text could be extracted from the file")
 
-        # Parse the text into structured JSON using Gemini API
-        structured_data = parse_resume_with_gemini(extracted_text)
+        # Parse the text into structured JSON with the selected parser (Gemini by default).
+        # If Gemini is down or the circuit is open, the local parse is stored as pending
+        # and upgraded automatically once the circuit closes.
+        structured_data, parse_status = parse_resume(extracted_text, parser_mode)
 
         # Save parsed data to database
         candidate = CandidateProfile(
             extracted_text=extracted_text,
             structured_data=structured_data,
-            file_type=file_type
+            file_type=file_type,
+            extraction_backend=extraction_backend,
+            parse_status=parse_status
         )
+        apply_features(candidate)
         candidate.save()
 
+        # MinHash signature + LSH buckets; links the resume to an earlier near-duplicate
+        index_resume(candidate)
+
+        if parse_status == CandidateProfile.PARSE_STATUS_PENDING:
+            if (parser_mode or settings.RESUME_PARSER_MODE) == PARSER_MODE_FAST_THEN_LLM:
+                schedule_refinement(candidate.id)
+            logger.info(f"Resume stored with pending parse: {candidate.id}")
+            return Response(
+                {"message": "Stored, parsing pending", "id": candidate.id, "parse_status": parse_status},
+                status=status.HTTP_202_ACCEPTED
+            )
+
         logger.info(f"Resume uploaded and processed successfully: {candidate.id}")
-        return Response({"message": "Parsed successfully"}, status=status.HTTP_201_CREATED)
+        return Response({"message": "Parsed successfully", "id": candidate.id}, status=status.HTTP_201_CREATED)
 
     except ValidationError as e:
         logger.warning(f"Validation error during resume upload: {str(e)}")
@@ -65,14 +93,154 @@ def upload_resume(request):
         response, status_code = get_error_response("INTERNAL_SERVER_ERROR")
         return Response(response, status=status_code)
 
+@api_view(['POST'])
+def upload_resume(request):
+    """
+    API to upload and process a resume file.
+    Validates file type, extracts text, parses it (Gemini API by default, or the local
+    fast parser via RESUME_PARSER_MODE / ?parser=), and saves the structured data.
+    """
+    if 'file' not in request.FILES:
+        raise ValidationError("No file provided")
+
+    file = request.FILES['file']
+    file_type = detect_file_type(file.name)
+    parser_mode = get_parser_mode(request)
+
+    return process_resume(file, file_type, parser_mode)
+
+@api_view(['POST'])
+def init_chunked_upload(request):
+    """
+    Start a chunked, resumable resume upload.
+    Expects file_name and total_size (bytes), plus optional checksum (SHA-256 of the
+    whole file) and parser. Returns the upload session including its id.
+    """
+    file_name = request.data.get('file_name')
+    if not file_name:
+        raise ValidationError("file_name is required")
+    file_type = detect_file_type(file_name)
+    parser_mode = get_parser_mode(request)
+
+    try:
+        total_size = int(request.data.get('total_size'))
+    except (TypeError, ValueError):
+        raise ValidationError("total_size must be an integer")
+    if not 0 < total_size <= settings.RESUME_UPLOAD_MAX_FILE_SIZE:
+        raise ValidationError(f"total_size must be between 1 and {settings.RESUME_UPLOAD_MAX_FILE_SIZE} bytes")
+
+    upload = ResumeUpload.objects.create(
+        file_name=file_name,
+        file_type=file_type,
+        total_size=total_size,
+        checksum=(request.data.get('checksum') or '').lower(),
+        parser_mode=parser_mode or ''
+    )
+    logger.info(f"Chunked upload started: {upload.id} ({file_name}, {total_size} bytes)")
+    data = ResumeUploadSerializer(upload).data
+    data['max_chunk_size'] = settings.RESUME_UPLOAD_MAX_CHUNK_SIZE
+    return Response(data, status=status.HTTP_201_CREATED)
+
+@api_view(['GET', 'PUT'])
+def chunked_upload(request, upload_id):
+    """
+    GET: report how many bytes have been received, so a client can resume.
+    PUT: append a raw chunk at the offset given by the Upload-Offset header (or ?offset=).
+    An optional X-Chunk-SHA256 header is verified before the chunk is accepted.
+    """
+    try:
+        upload = ResumeUpload.objects.get(id=upload_id)
+    except ResumeUpload.DoesNotExist:
+        raise NotFound(f"Upload with ID {upload_id} not found")
+
+    if request.method == 'GET':
+        return Response(ResumeUploadSerializer(upload).data)
+
+    if upload.status != ResumeUpload.STATUS_IN_PROGRESS:
+        raise ValidationError("Upload is no longer accepting chunks")
+    try:
+        offset = int(request.headers.get('Upload-Offset', request.query_params.get('offset', '')))
+        length = int(request.headers.get('Content-Length', ''))
+    except ValueError:
+        raise ValidationError("Upload-Offset and Content-Length headers are required")
+
+    try:
+        write_chunk(upload, offset, request.stream, length, request.headers.get('X-Chunk-SHA256'))
+    except ChunkError as e:
+        if e.conflict:
+            response, status_code = get_error_response("CONFLICT", detail=str(e))
+            response["received_size"] = upload.received_size
+            return Response(response, status=status_code)
+        raise ValidationError(str(e))
+    return Response(ResumeUploadSerializer(upload).data)
+
+@api_view(['POST'])
+def complete_chunked_upload(request, upload_id):
+    """
+    Finish a chunked upload: verify size and optional whole-file checksum, then run the
+    assembled spool file through the normal extraction and parsing path.
+    The upload is claimed (in_progress -> processing) with a conditional update, so
+    concurrent calls cannot create two profiles. On a checksum mismatch the received
+    bytes are discarded and the client starts again from offset 0.
+    """
+    try:
+        upload = ResumeUpload.objects.get(id=upload_id)
+    except ResumeUpload.DoesNotExist:
+        raise NotFound(f"Upload with ID {upload_id} not found")
+
+    claimed = ResumeUpload.objects.filter(
+        id=upload.id, status=ResumeUpload.STATUS_IN_PROGRESS, received_size=F('total_size'),
+    ).update(status=ResumeUpload.STATUS_PROCESSING, updated_at=timezone.now())
+    if not claimed:
+        upload.refresh_from_db()
+        if upload.status == ResumeUpload.STATUS_COMPLETED:
+            return Response(ResumeUploadSerializer(upload).data)
+        if upload.status == ResumeUpload.STATUS_PROCESSING:
+            response, status_code = get_error_response("CONFLICT", detail="Upload is already being completed")
+            return Response(response, status=status_code)
+        raise ValidationError(f"Upload incomplete: received {upload.received_size} of {upload.total_size} bytes")
+
+    upload.status = ResumeUpload.STATUS_PROCESSING
+    path = spool_path(upload)
+    try:
+        if upload.checksum and file_sha256(path) != upload.checksum:
+            discard_spool(upload)
+            upload.received_size = 0
+            upload.chunks = []
+            upload.status = ResumeUpload.STATUS_IN_PROGRESS
+            upload.save(update_fields=['received_size', 'chunks', 'status', 'updated_at'])
+            logger.warning(f"Chunked upload {upload.id} failed its checksum; reset to offset 0")
+            raise ValidationError("File checksum mismatch; the received data was discarded, upload again from offset 0")
+
+        # The spool file is handed over as an open file, never read fully into memory here
+        with open(path, 'rb') as file:
+            response = process_resume(file, upload.file_type, upload.parser_mode or None)
+
+        if response.status_code in (status.HTTP_201_CREATED, status.HTTP_202_ACCEPTED):
+            upload.status = ResumeUpload.STATUS_COMPLETED
+            upload.candidate_profile_id = response.data['id']
+            upload.save(update_fields=['status', 'candidate_profile', 'updated_at'])
+            discard_spool(upload)
+            logger.info(f"Chunked upload completed: {upload.id} -> candidate {upload.candidate_profile_id}")
+        return response
+    finally:
+        if upload.status == ResumeUpload.STATUS_PROCESSING:
+            # Parsing failed; release the claim so complete can be retried
+            ResumeUpload.objects.filter(id=upload.id, status=ResumeUpload.STATUS_PROCESSING).update(
+                status=ResumeUpload.STATUS_IN_PROGRESS, updated_at=timezone.now(),
+            )
+
 @api_view(['GET'])
 def get_all_resumes(request):
     """
     API to fetch all resume data excluding extracted_text.
+    Optional filters on the derived feature columns (min_skills, max_skills, min_years,
+    max_years, education, updated_since) run in SQL against their indexes.
     Logs the retrieval process.
     """
+    filters = parse_feature_filters(request.query_params)
     try:
-        candidates = CandidateProfile.objects.all()
+        candidates = CandidateProfile.objects.filter(**filters).defer('extracted_text', 'minhash')
         serializer = CandidateProfileLiteSerializer(candidates, many=True)
         logger.info(f"Retrieved {len(serializer.data)} resumes")
         return Response(serializer.data)
@@ -81,6 +249,26 @@ def get_all_resumes(request):
         response, status_code = get_error_response("INTERNAL_SERVER_ERROR")
         return Response(response, status=status_code)
 
+@api_view(['GET'])
+def get_duplicate_resumes(request):
+    """
+    API to list near-duplicate resume clusters: each canonical resume with the
+    resumes linked to it. Clusters are assigned at upload and recomputed by
+    `manage.py cluster_duplicate_resumes`.
+    """
+    clusters = {}
+    duplicates = CandidateProfile.objects.filter(duplicate_of__isnull=False).order_by('created_at')
+    for candidate_id, canonical_id, name in duplicates.values_list('id', 'duplicate_of_id', 'structured_data__name'):
+        clusters.setdefault(canonical_id, []).append({"id": candidate_id, "name": name})
+
+    names = dict(CandidateProfile.objects.filter(id__in=list(clusters)).values_list('id', 'structured_data__name'))
+    data = [
+        {"canonical_id": canonical_id, "name": names.get(canonical_id), "duplicates": members}
+        for canonical_id, members in clusters.items()
+    ]
+    logger.info(f"Retrieved {len(data)} duplicate resume clusters")
+    return Response(data)
+
 @api_view(['GET'])
 def sort_candidate_data(request, candidate_id):
     """
@@ -94,29 +282,9 @@ def sort_candidate_data(request, candidate_id):
         # Generate sorting prompt for Gemini API
         prompt = f"Given the following list of skills: {structured_data['skills']}, " \
                  "return a sorted list of skills in alphabetical order as a JSON list without any additional text."
-        
-        headers = {
-            'Content-Type': 'application/json',
-        }
-        payload = {
-            "contents": [{
-                "parts": [{"text": prompt}]
-            }]
-        }
 
         # Send request to Gemini API for skill sorting
-        response = requests.post(
-            f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={settings.GEMINI_API_KEY}",
-            headers=headers,
-            json=payload
-        )
-
-        if response.status_code != 200:
-            logger.error(f"Gemini API call failed: {response.text}")
-            raise requests.RequestException("Failed to call Gemini API")
-
-        gemini_response = response.json()
-        raw_text = gemini_response['candidates'][0]['content']['parts'][0]['text']
+        raw_text = generate_content(prompt, priority=PRIORITY_BULK, cache=OPERATION_SORT_SKILLS)
 
         # Remove Markdown code blocks if present
         json_content = re.sub(r'```json\s*|\s*```', '', raw_text).strip()
@@ -125,8 +293,9 @@ def sort_candidate_data(request, candidate_id):
         sorted_skills = json.loads(json_content)
 
         # Update structured_data with sorted skills
-        structured_data['skills'] = sorted_skills
+        structured_data['skills'] = canonicalize_skills(sorted_skills)
         candidate.structured_data = structured_data
+        apply_features(candidate)
         candidate.save()
 
         serializer = CandidateProfileSerializer(candidate)
@@ -137,9 +306,47 @@ def sort_candidate_data(request, candidate_id):
         logger.warning(f"Candidate not found: {candidate_id}")
         raise NotFound(f"Candidate with ID {candidate_id} not found")
     except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse Gemini response as JSON: {str(e)} - Raw response: {raw_text}")
+        logger.error(f"Failed to parse Gemini response as JSON: {str(e)} - Raw response: {truncate_for_log(raw_text)}")
+        discard_cached_content(prompt, OPERATION_SORT_SKILLS)
         raise ValueError("Invalid JSON format in Gemini response")
     except (requests.RequestException, ValueError) as e:
         logger.error(f"Error sorting candidate data {candidate_id}: {str(e)}", exc_info=True)
         response, status_code = get_error_response("INTERNAL_SERVER_ERROR")
-        return Response(response, status=status_code)
\ No newline at end of file
+        return Response(response, status=status_code)
+
+# Columns written by the candidate export, in order
+CANDIDATE_EXPORT_COLUMNS = [
+    'id', 'name', 'skills', 'education', 'work_experience', 'file_type', 'parse_status', 'created_at', 'updated_at',
+]
+
+def _candidate_export_rows(queryset):
+    """Flatten structured_data into export columns one row at a time."""
+    for row in queryset.values('id', 'structured_data', 'file_type', 'parse_status', 'created_at', 'updated_at').iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        structured_data = row.pop('structured_data') or {}
+        for field in ('name', 'skills', 'education', 'work_experience'):
+            row[field] = structured_data.get(field)
+        yield row
+
+@api_view(['GET'])
+def export_candidates(request):
+    """
+    API to stream candidate profiles (without extracted_text) as CSV or NDJSON (?output=csv|ndjson).
+    job_id, min_score and max_score restrict the export to candidates with a matching score
+    for that job (or any job) in the given range; the resume/all/ feature filters also apply.
+    """
+    params = parse_export_params(request.query_params)
+
+    queryset = CandidateProfile.objects.filter(**parse_feature_filters(request.query_params))
+    match_filters = {}
+    if params['job_id']:
+        match_filters['matches__job_posting_id'] = params['job_id']
+    if params['min_score'] is not None:
+        match_filters['matches__matching_score__gte'] = params['min_score']
+    if params['max_score'] is not None:
+        match_filters['matches__matching_score__lte'] = params['max_score']
+    if match_filters:
+        # Single filter() call so all conditions apply to the same match row
+        queryset = queryset.filter(**match_filters).distinct()
+
+    logger.info(f"Streaming candidate export ({params['output']}) with filters - job: {params['job_id']}, min_score: {params['min_score']}, max_score: {params['max_score']}")
+    return streaming_export_response(_candidate_export_rows(queryset), CANDIDATE_EXPORT_COLUMNS, params['output'], 'candidates')
@@ -1,6 +1,21 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+def _register_sql_functions(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        from .search import register_skill_function
+        register_skill_function(connection.connection)
 
 
 class JobPostingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'job_posting'
+
+    def ready(self):
+        # The search index triggers call normalize_skill through SQL (see search.py)
+        connection_created.connect(_register_sql_functions)
+        for connection in connections.all(initialized_only=True):
+            if connection.connection is not None:
+                _register_sql_functions(sender=type(connection), connection=connection)
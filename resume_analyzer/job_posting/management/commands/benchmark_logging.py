@@ -0,0 +1,83 @@
+import logging
+import os
+import random
+import tempfile
+import time
+import uuid
+from django.core.management.base import BaseCommand
+from resume_analyzer import settings
+from resume_analyzer.common.log import QueueListenerHandler, RateLimitFilter, TruncateFilter
+
+
+class Command(BaseCommand):
+    help = "Measure per-call logging overhead of synchronous handlers vs the queued, filtered setup"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=20000, help="Log calls per run")
+        parser.add_argument('--payload-kb', type=int, default=16, help="Size of the raw response logged on error paths")
+        parser.add_argument('--error-ratio', type=float, default=0.05, help="Share of calls logging a large error payload")
+        parser.add_argument('--seed', type=int, default=7)
+
+    def _workload(self, options):
+        rng = random.Random(options['seed'])
+        payload = "x" * (options['payload_kb'] * 1024)
+        for _ in range(options['messages']):
+            roll = rng.random()
+            if roll < options['error_ratio']:
+                yield logging.ERROR, f"Failed to parse Gemini response as JSON - Raw response: {payload}"
+            elif roll < 0.6:
+                yield logging.INFO, f"Retrieved {rng.randint(1, 500)} resumes"
+            else:
+                yield logging.INFO, f"Calculated and saved matching score {rng.random() * 100:.1f} for job {uuid.uuid4()}"
+
+    def _handlers(self, directory, name):
+        formatter = logging.Formatter('{levelname} {asctime} {module} {message}', style='{')
+        file_handler = logging.FileHandler(os.path.join(directory, f'{name}.log'))
+        console_handler = logging.StreamHandler(open(os.devnull, 'w'))
+        for handler in (file_handler, console_handler):
+            handler.setFormatter(formatter)
+        return [console_handler, file_handler]
+
+    def _run(self, logger, workload):
+        start = time.perf_counter()
+        for level, message in workload:
+            logger.log(level, message)
+        return time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            sync_logger = logging.getLogger('benchmark.sync')
+            sync_logger.propagate = False
+            sync_logger.setLevel(logging.INFO)
+            for handler in self._handlers(directory, 'sync'):
+                sync_logger.addHandler(handler)
+
+            queued_logger = logging.getLogger('benchmark.queued')
+            queued_logger.propagate = False
+            queued_logger.setLevel(logging.INFO)
+            queue_handler = QueueListenerHandler(self._handlers(directory, 'queued'), queue_size=settings.LOG_QUEUE_SIZE)
+            queue_handler.addFilter(RateLimitFilter(settings.LOG_RATE_LIMIT_PREFIXES, settings.LOG_RATE_LIMIT, settings.LOG_RATE_LIMIT_INTERVAL))
+            queue_handler.addFilter(TruncateFilter(settings.LOG_MAX_MESSAGE_LENGTH))
+            queued_logger.addHandler(queue_handler)
+
+            workload = list(self._workload(options))
+            sync_seconds = self._run(sync_logger, workload)
+            queued_seconds = self._run(queued_logger, workload)
+            drain_start = time.perf_counter()
+            queue_handler.close()
+            drain_seconds = time.perf_counter() - drain_start
+
+            sizes = {name: os.path.getsize(os.path.join(directory, f'{name}.log')) for name in ('sync', 'queued')}
+            for handler in sync_logger.handlers + list(queue_handler.listener.handlers):
+                handler.close()
+
+        calls = options['messages']
+        self.stdout.write(
+            f"synchronous: {sync_seconds / calls * 1e6:.1f} us/call in the caller, {sizes['sync'] / 1024:.0f} KiB written"
+        )
+        self.stdout.write(
+            f"     queued: {queued_seconds / calls * 1e6:.1f} us/call in the caller, {sizes['queued'] / 1024:.0f} KiB written "
+            f"(listener drained the backlog in {drain_seconds * 1000:.0f} ms, {queue_handler.dropped} records dropped)"
+        )
+        if queued_seconds:
+            self.stdout.write(self.style.SUCCESS(f"Caller-side logging overhead reduced {sync_seconds / queued_seconds:.1f}x"))
@@ -0,0 +1,103 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from resume_analyzer import settings
+
+# Dependencies that must stay out of the startup import chain (loaded on first use)
+LAZY_MODULES = ('pdfplumber', 'pdfminer', 'PIL', 'docx2txt', 'pypdfium2', 'numpy', 'spacy')
+
+# Runs in a fresh interpreter: import the WSGI application the way a server worker does,
+# then serve one jobs/list/ request and report the timings as JSON
+FIRST_REQUEST_SCRIPT = """
+import io, json, os, sys, time
+start = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_analyzer.settings')
+from resume_analyzer.wsgi import application
+ready = time.perf_counter()
+from wsgiref.util import setup_testing_defaults
+environ = {'PATH_INFO': '/api/jobs/list/', 'QUERY_STRING': 'limit=20', 'HTTP_HOST': 'localhost', 'wsgi.errors': io.StringIO()}
+setup_testing_defaults(environ)
+status = []
+body = b''.join(application(environ, lambda code, headers, exc_info=None: status.append(code)))
+done = time.perf_counter()
+print(json.dumps({
+    'status': status[0], 'app_ready': ready - start, 'first_request': done - ready,
+    'lazy_loaded': sorted(name for name in sys.modules if name.split('.')[0] in %r),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure cold-start cost (manage.py check, WSGI import, first jobs/list/ response) and enforce an import-time budget"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help="Fresh processes per measurement; medians are reported")
+        parser.add_argument('--budget-ms', type=float, default=settings.STARTUP_IMPORT_BUDGET_MS,
+                            help="Fail when importing the application and serving the first request takes longer (median, ms)")
+        parser.add_argument('--top', type=int, default=10, help="Slowest imported packages to list")
+
+    def _run(self, args):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable] + args, cwd=settings.BASE_DIR, capture_output=True, text=True, env=os.environ.copy(),
+        )
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            raise CommandError(f"{' '.join(args[:2])} failed:\n{result.stderr[-2000:]}")
+        return elapsed, result
+
+    def _import_profile(self):
+        """Import time (ms) spent in each top-level package's own modules, from `python -X importtime`."""
+        _, result = self._run(['-X', 'importtime', '-c', FIRST_REQUEST_SCRIPT % (LAZY_MODULES,)])
+        totals = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or line.endswith('imported package'):
+                continue
+            own, _, name = line[len('import time:'):].split('|')
+            package = name.strip().split('.')[0]
+            totals[package] = totals.get(package, 0) + int(own) / 1000
+        return totals
+
+    def handle(self, *args, **options):
+        runs = options['runs']
+        check_times = []
+        wall_times = []
+        app_ready = []
+        first_request = []
+        cold_start = []
+        lazy_loaded = set()
+        for _ in range(runs):
+            check_times.append(self._run(['manage.py', 'check'])[0])
+            elapsed, result = self._run(['-c', FIRST_REQUEST_SCRIPT % (LAZY_MODULES,)])
+            report = json.loads(result.stdout.strip().splitlines()[-1])
+            if report['status'] != '200 OK':
+                raise CommandError(f"jobs/list/ returned {report['status']}")
+            wall_times.append(elapsed)
+            app_ready.append(report['app_ready'])
+            first_request.append(report['first_request'])
+            cold_start.append(report['app_ready'] + report['first_request'])
+            lazy_loaded.update(name.split('.')[0] for name in report['lazy_loaded'])
+
+        median = lambda values: statistics.median(values) * 1000
+        self.stdout.write(f"manage.py check:                    {median(check_times):8.0f} ms")
+        self.stdout.write(f"WSGI application import:            {median(app_ready):8.0f} ms")
+        self.stdout.write(f"first jobs/list/ response:          {median(first_request):8.0f} ms")
+        self.stdout.write(f"process start to first response:    {median(wall_times):8.0f} ms")
+
+        profile = self._import_profile()
+        self.stdout.write("Import time by package (own modules only):")
+        for name, milliseconds in sorted(profile.items(), key=lambda item: item[1], reverse=True)[:options['top']]:
+            self.stdout.write(f"  {milliseconds:8.1f} ms  {name}")
+
+        if lazy_loaded:
+            self.stdout.write(self.style.WARNING(f"Loaded at startup although deferred to first use: {', '.join(sorted(lazy_loaded))}"))
+
+        # Imports dominate both phases: the first request loads the URLconf and every view module
+        budget = options['budget_ms']
+        if median(cold_start) > budget:
+            raise CommandError(f"Startup to first response took {median(cold_start):.0f} ms, over the {budget:.0f} ms budget")
+        self.stdout.write(self.style.SUCCESS(f"Startup to first response {median(cold_start):.0f} ms is within the {budget:.0f} ms budget"))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from resume_analyzer.common.llm_cache import llm_cache, OPERATIONS
+
+
+class Command(BaseCommand):
+    help = "Remove cached Gemini responses (all, or one operation's) so the next calls ask Gemini again"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--operation', help=f"Only clear one operation: {', '.join(OPERATIONS)}")
+
+    def handle(self, *args, **options):
+        operation = options['operation']
+        if operation and operation not in OPERATIONS:
+            raise CommandError(f"Unknown operation '{operation}'. Use one of: {', '.join(OPERATIONS)}")
+        deleted = llm_cache.clear(operation)
+        self.stdout.write(self.style.SUCCESS(f"Removed {deleted} cached responses"))
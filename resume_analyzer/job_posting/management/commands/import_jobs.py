@@ -0,0 +1,34 @@
+import io
+from django.core.management.base import BaseCommand, CommandError
+from job_posting.utils import detect_import_format, check_utf8, iter_import_rows, import_job_postings
+from resume_analyzer import settings
+
+
+class Command(BaseCommand):
+    help = "Bulk-import job postings from a CSV or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to the CSV or NDJSON file")
+        parser.add_argument('--format', dest='import_format', choices=['csv', 'ndjson'], help="Override format detection from the file extension")
+        parser.add_argument('--batch-size', type=int, default=settings.JOB_IMPORT_BATCH_SIZE, help="Rows validated and inserted per transaction")
+
+    def handle(self, *args, **options):
+        try:
+            import_format = detect_import_format(options['path'], options['import_format'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        with open(options['path'], 'rb') as binary_stream:
+            try:
+                check_utf8(binary_stream)
+            except ValueError as e:
+                raise CommandError(str(e))
+            text_stream = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+            report = import_job_postings(iter_import_rows(text_stream, import_format), options['batch_size'])
+
+        for error in report['errors']:
+            messages = {field: [str(message) for message in details] for field, details in error['errors'].items()}
+            self.stderr.write(f"Row {error['row']}: {messages}")
+        self.stdout.write(self.style.SUCCESS(f"Created {report['created']} job postings, {report['failed']} rows failed"))
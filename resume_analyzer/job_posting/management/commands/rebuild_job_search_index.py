@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand, CommandError
+from job_posting.search import rebuild_search_index, search_index_available
+
+
+class Command(BaseCommand):
+    help = "Rebuild the job posting title/company and skill search index"
+
+    def handle(self, *args, **options):
+        if not search_index_available():
+            raise CommandError("The job search index is only available on SQLite")
+        count = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} job postings"))
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from job_posting.search import CREATE_STATEMENTS, REBUILD_STATEMENTS, search_index_available
+
+    if not search_index_available(schema_editor.connection):
+        return
+    for statement in CREATE_STATEMENTS + REBUILD_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    from job_posting.search import DROP_STATEMENTS, search_index_available
+
+    if not search_index_available(schema_editor.connection):
+        return
+    for statement in DROP_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_posting', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
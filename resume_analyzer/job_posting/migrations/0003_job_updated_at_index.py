@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_posting', '0002_job_search_index'),
+    ]
+
+    # On SQLite, AlterField rebuilds the table, which drops the search index triggers
+    # (see job_posting/search.py) and can renumber rowids. Only the index is added here.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='jobposting',
+                    name='updated_at',
+                    field=models.DateTimeField(auto_now=True, db_index=True),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    'CREATE INDEX "job_posting_jobposting_updated_at_a4f2c500" ON "job_posting_jobposting" ("updated_at")',
+                    'DROP INDEX "job_posting_jobposting_updated_at_a4f2c500"',
+                ),
+            ],
+        ),
+    ]
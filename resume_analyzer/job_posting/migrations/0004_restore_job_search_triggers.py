@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def restore_search_index(apps, schema_editor):
+    # Databases migrated with the earlier 0003 lost the triggers in its table rebuild;
+    # recreate them (a no-op when present) and repopulate the index
+    from job_posting.search import CREATE_STATEMENTS, REBUILD_STATEMENTS, search_index_available
+
+    if not search_index_available(schema_editor.connection):
+        return
+    for statement in CREATE_STATEMENTS + REBUILD_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_posting', '0003_job_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(restore_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def reindex_skills(apps, schema_editor):
+    # Recreate the triggers so they store skills through normalize_skill (canonical name,
+    # Unicode lower-case) instead of SQL lower(), and reindex the existing postings
+    from job_posting.search import CREATE_STATEMENTS, DROP_TRIGGER_STATEMENTS, REBUILD_STATEMENTS, search_index_available
+
+    if not search_index_available(schema_editor.connection):
+        return
+    for statement in DROP_TRIGGER_STATEMENTS + CREATE_STATEMENTS + REBUILD_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_posting', '0004_restore_job_search_triggers'),
+    ]
+
+    operations = [
+        migrations.RunPython(reindex_skills, migrations.RunPython.noop),
+    ]
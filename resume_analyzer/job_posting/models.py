@@ -16,7 +16,7 @@ class JobPosting(models.Model):
     company = models.CharField(max_length=200, db_index=True)
     required_skills = models.JSONField()
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     objects = JobPostingManager()
 
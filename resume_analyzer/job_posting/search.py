@@ -0,0 +1,195 @@
+import logging
+import uuid
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from .models import JobPosting
+from resume_analyzer.common.skills import canonicalize_skill
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+# SQLite FTS5 table (trigram tokenizer) over title/company. Its rowid mirrors the
+# job posting's rowid so the sync triggers can update/delete without a scan.
+SEARCH_TABLE = 'job_posting_search'
+
+# Normalized (skill, job_id) postings derived from required_skills
+SKILL_TABLE = 'job_posting_skill_index'
+
+# SQL function the triggers use to normalize stored skills, registered on every SQLite
+# connection (see job_posting/apps.py) so rows are indexed by normalize_skill, the same
+# code that normalizes query skills. SQL lower() would only fold ASCII and keep aliases.
+# Writes from outside Django (e.g. the sqlite3 shell) fail with "no such function".
+SKILL_FUNCTION = 'normalize_job_skill'
+
+JOB_TABLE = JobPosting._meta.db_table
+
+# Trigram FTS cannot match terms shorter than this; they fall back to LIKE
+MIN_TRIGRAM_LENGTH = 3
+
+_SKILL_ROWS_SQL = (
+    "INSERT OR IGNORE INTO {skill}(skill, job_id) "
+    f"SELECT DISTINCT {SKILL_FUNCTION}(value), new.id FROM json_each(new.required_skills) "
+    f"WHERE json_valid(new.required_skills) AND {SKILL_FUNCTION}(value) <> '';"
+)
+
+CREATE_STATEMENTS = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(job_id UNINDEXED, title, company, tokenize='trigram')",
+    f"CREATE TABLE IF NOT EXISTS {SKILL_TABLE} (skill TEXT NOT NULL, job_id CHAR(32) NOT NULL, PRIMARY KEY (skill, job_id)) WITHOUT ROWID",
+    f"CREATE INDEX IF NOT EXISTS {SKILL_TABLE}_job_id ON {SKILL_TABLE}(job_id)",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON {JOB_TABLE} BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, job_id, title, company) VALUES (new.rowid, new.id, new.title, new.company);
+        {_SKILL_ROWS_SQL.format(skill=SKILL_TABLE)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF title, company, required_skills ON {JOB_TABLE} BEGIN
+        UPDATE {SEARCH_TABLE} SET title = new.title, company = new.company WHERE rowid = old.rowid;
+        DELETE FROM {SKILL_TABLE} WHERE job_id = old.id;
+        {_SKILL_ROWS_SQL.format(skill=SKILL_TABLE)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON {JOB_TABLE} BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.rowid;
+        DELETE FROM {SKILL_TABLE} WHERE job_id = old.id;
+    END""",
+]
+
+DROP_TRIGGER_STATEMENTS = [
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_ad",
+]
+
+DROP_STATEMENTS = DROP_TRIGGER_STATEMENTS + [
+    f"DROP TABLE IF EXISTS {SKILL_TABLE}",
+    f"DROP TABLE IF EXISTS {SEARCH_TABLE}",
+]
+
+REBUILD_STATEMENTS = [
+    f"DELETE FROM {SEARCH_TABLE}",
+    f"DELETE FROM {SKILL_TABLE}",
+    f"INSERT INTO {SEARCH_TABLE}(rowid, job_id, title, company) SELECT rowid, id, title, company FROM {JOB_TABLE}",
+    f"""INSERT OR IGNORE INTO {SKILL_TABLE}(skill, job_id)
+        SELECT DISTINCT {SKILL_FUNCTION}(skills.value), jobs.id FROM {JOB_TABLE} AS jobs, json_each(jobs.required_skills) AS skills
+        WHERE json_valid(jobs.required_skills) AND {SKILL_FUNCTION}(skills.value) <> ''""",
+]
+
+
+def search_index_available(using=connection):
+    """The FTS5/skill index only exists on SQLite; other backends use plain filters."""
+    return using.vendor == 'sqlite'
+
+
+def rebuild_search_index():
+    """
+    Repopulate the search and skill index from the job posting table.
+    Needed after a VACUUM (which may renumber rowids) or any out-of-band data fix.
+    """
+    with connection.cursor() as cursor:
+        for statement in REBUILD_STATEMENTS:
+            cursor.execute(statement)
+        cursor.execute(f"SELECT count(*) FROM {SEARCH_TABLE}")
+        count = cursor.fetchone()[0]
+    logger.info(f"Rebuilt job search index with {count} postings")
+    return count
+
+
+def normalize_skill(skill):
+    """
+    Normalize a skill for the skill index: canonical name, lower-cased. Used for both
+    stored skills (through the triggers) and query skills, so "JS" and "JavaScript"
+    find each other whichever way round they were written.
+    """
+    return canonicalize_skill(skill).strip().lower()
+
+
+def _sql_normalize_skill(value):
+    # json_each yields numbers and nulls as well as strings
+    return normalize_skill(str(value)) if value is not None else ''
+
+
+def register_skill_function(sqlite_connection):
+    """Make normalize_skill callable from SQL on a raw sqlite3 connection."""
+    sqlite_connection.create_function(SKILL_FUNCTION, 1, _sql_normalize_skill, deterministic=True)
+
+
+def _phrase(term):
+    """Quote a user term as an FTS5 string so operators in it are taken literally."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _skill_filter(skills):
+    """Subquery of job ids having every requested skill."""
+    skills = sorted({normalize_skill(skill) for skill in skills if normalize_skill(skill)})
+    placeholders = ", ".join(["%s"] * len(skills))
+    sql = (
+        f"SELECT job_id FROM {SKILL_TABLE} WHERE skill IN ({placeholders}) "
+        f"GROUP BY job_id HAVING count(*) = %s"
+    )
+    return sql, skills + [len(skills)]
+
+
+def search_job_postings(title=None, company=None, q=None, skills=None, limit=None):
+    """
+    Search job postings by title/company substring and required skills.
+    Text filters are matched with the trigram FTS index and ranked by bm25; `q`
+    matches either title or company. `skills` requires every listed skill.
+    Returns a list of JobPosting ordered by rank when a text filter is given,
+    otherwise a queryset in the default ordering.
+    """
+    skills = [skill for skill in (skills or []) if normalize_skill(skill)]
+
+    if not search_index_available():
+        queryset = JobPosting.objects.all()
+        if title:
+            queryset = queryset.filter(title__icontains=title)
+        if company:
+            queryset = queryset.filter(company__icontains=company)
+        if q:
+            queryset = queryset.filter(title__icontains=q) | queryset.filter(company__icontains=q)
+        for skill in skills:
+            queryset = queryset.filter(required_skills__contains=[skill])
+        return queryset[:limit] if limit else queryset
+
+    if not (title or company or q):
+        queryset = JobPosting.objects.all()
+        if skills:
+            sql, params = _skill_filter(skills)
+            queryset = queryset.filter(id__in=RawSQL(sql, params))
+        return queryset[:limit] if limit else queryset
+
+    match_terms = []
+    where = []
+    params = []
+    for column, term in (('title', title), ('company', company), (None, q)):
+        if not term:
+            continue
+        if len(term) >= MIN_TRIGRAM_LENGTH:
+            match_terms.append(f"{column} : {_phrase(term)}" if column else f"{{title company}} : {_phrase(term)}")
+        elif column:
+            where.append(f"s.{column} LIKE %s")
+            params.append(f"%{term}%")
+        else:
+            where.append("(s.title LIKE %s OR s.company LIKE %s)")
+            params.extend([f"%{term}%", f"%{term}%"])
+
+    if match_terms:
+        where.insert(0, f"{SEARCH_TABLE} MATCH %s")
+        params.insert(0, " AND ".join(match_terms))
+        order_by = f"bm25({SEARCH_TABLE})"
+    else:
+        order_by = "s.rowid DESC"
+
+    if skills:
+        sql, skill_params = _skill_filter(skills)
+        where.append(f"s.job_id IN ({sql})")
+        params.extend(skill_params)
+
+    sql = f"SELECT s.job_id FROM {SEARCH_TABLE} AS s WHERE {' AND '.join(where)} ORDER BY {order_by}"
+    if limit:
+        sql += " LIMIT %s"
+        params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        ids = [uuid.UUID(row[0]) for row in cursor.fetchall()]
+
+    postings = JobPosting.objects.in_bulk(ids)
+    return [postings[job_id] for job_id in ids if job_id in postings]
@@ -1,7 +1,26 @@
 from rest_framework import serializers
 from .models import JobPosting
+from resume_analyzer.common.serializers import FastRepresentationMixin
+from resume_analyzer.common.skills import canonicalize_skills
 
-class JobPostingSerializer(serializers.ModelSerializer):
+class JobPostingSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = JobPosting
-        fields = ['id', 'title', 'company', 'required_skills', 'created_at', 'updated_at']
\ No newline at end of file
+        fields = ['id', 'title', 'company', 'required_skills', 'created_at', 'updated_at']
+
+    def to_representation(self, instance):
+        # Fast path (also used nested in match listings); keep in sync with Meta.fields
+        return {
+            'id': str(instance.id),
+            'title': instance.title,
+            'company': instance.company,
+            'required_skills': instance.required_skills,
+            'created_at': self.format_datetime(instance.created_at),
+            'updated_at': self.format_datetime(instance.updated_at),
+        }
+
+    def validate_required_skills(self, value):
+        # Store skills under their canonical names so comparisons and the skill index line up
+        if not isinstance(value, list):
+            raise serializers.ValidationError("required_skills must be a list of strings")
+        return canonicalize_skills(value)
@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+from django.db.models import Count, Max
+from django.utils import timezone
+from .models import JobPosting
+from .search import normalize_skill
+from resume_analyzer import settings
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+# Rows stamped this long before the previous sync are read again when the table changed,
+# so postings committed late by a concurrent import are not skipped
+_SYNC_OVERLAP = timedelta(seconds=5)
+
+# Immutable arrays the ranking reads; replaced (never mutated) when postings change.
+# required[row] is the number of distinct required skills (0 when none are listed) and
+# postings maps a normalized skill to the rows requiring it.
+_Snapshot = namedtuple('_Snapshot', ['job_ids', 'required', 'postings'])
+
+Recommendation = namedtuple('Recommendation', ['job_id', 'score', 'matched', 'required'])
+
+
+def _job_skills(required_skills):
+    if not isinstance(required_skills, list):
+        return frozenset()
+    return frozenset(skill for skill in (normalize_skill(str(value)) for value in required_skills if value) if skill)
+
+
+class JobSkillIndex:
+    """
+    In-memory postings index from normalized required skill to job rows, used to rank
+    every job posting for a candidate in one vectorized pass. Built on first use and
+    kept current incrementally: each sync reads only postings whose updated_at is past
+    the last one seen (catching API creates, bulk imports and other processes alike),
+    after one aggregate query shows the table changed, and rebuilds from scratch when
+    the row count shows deletions. numpy is imported
+    on first use so it stays out of startup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._job_ids = []
+        self._skills = []
+        self._postings = defaultdict(set)
+        self._live = 0
+        self._watermark = None
+        self._synced_at = None
+        self._checked_at = 0.0
+        self._snapshot = None
+
+    def _put(self, job_id, skills, touched):
+        row = self._rows.get(job_id)
+        if row is None:
+            row = self._rows[job_id] = len(self._job_ids)
+            self._job_ids.append(job_id)
+            self._skills.append(frozenset())
+            self._live += 1
+        previous = self._skills[row]
+        if previous == skills:
+            return
+        for skill in previous - skills:
+            self._postings[skill].discard(row)
+        for skill in skills - previous:
+            self._postings[skill].add(row)
+        touched.update(previous ^ skills)
+        self._skills[row] = skills
+
+    def _publish(self, touched):
+        import numpy as np
+
+        previous = self._snapshot
+        postings = dict(previous.postings) if previous is not None else {}
+        for skill in touched:
+            rows = self._postings.get(skill)
+            if rows:
+                postings[skill] = np.fromiter(rows, dtype=np.int32, count=len(rows))
+            else:
+                postings.pop(skill, None)
+                self._postings.pop(skill, None)
+        required = np.fromiter((len(skills) for skills in self._skills), dtype=np.int32, count=len(self._skills))
+        self._snapshot = _Snapshot(list(self._job_ids), required, postings)
+
+    def _rebuild(self):
+        start = time.monotonic()
+        self._rows, self._job_ids, self._skills = {}, [], []
+        self._postings = defaultdict(set)
+        self._live = 0
+        self._snapshot = None
+        self._watermark = None
+        self._synced_at = timezone.now()
+        touched = set()
+        for job_id, required_skills, updated_at in (
+            JobPosting.objects.order_by().values_list('id', 'required_skills', 'updated_at').iterator(chunk_size=2000)
+        ):
+            self._put(job_id, _job_skills(required_skills), touched)
+            self._watermark = max(self._watermark, updated_at) if self._watermark else updated_at
+        self._publish(touched)
+        logger.info(f"Built job skill index: {self._live} postings, {len(self._postings)} skills in {time.monotonic() - start:.2f}s")
+
+    def sync(self, force=False):
+        """
+        Bring the index up to date with the job posting table. Checks at most once per
+        JOB_INDEX_SYNC_INTERVAL seconds unless `force` is set. Returns the snapshot.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._snapshot is not None and not force and now - self._checked_at < settings.JOB_INDEX_SYNC_INTERVAL:
+                return self._snapshot
+            self._checked_at = now
+            if self._watermark is None:
+                self._rebuild()
+                return self._snapshot
+
+            since = min(self._watermark, self._synced_at - _SYNC_OVERLAP)
+            self._synced_at = timezone.now()
+            state = JobPosting.objects.order_by().aggregate(latest=Max('updated_at'), count=Count('id'))
+            if state['latest'] == self._watermark and state['count'] == self._live:
+                return self._snapshot
+            if state['count'] < self._live:
+                # Postings were deleted; rows are only ever appended, so start over
+                self._rebuild()
+                return self._snapshot
+
+            touched = set()
+            changed = (
+                JobPosting.objects.filter(updated_at__gte=since)
+                .order_by().values_list('id', 'required_skills', 'updated_at')
+            )
+            for job_id, required_skills, updated_at in changed:
+                self._put(job_id, _job_skills(required_skills), touched)
+                self._watermark = max(self._watermark, updated_at)
+            if state['count'] != self._live:
+                # A deletion offset by new postings
+                self._rebuild()
+            elif touched:
+                self._publish(touched)
+            return self._snapshot
+
+    def rank(self, skills, k):
+        """
+        The k job postings whose required skills the given skills cover best, as
+        Recommendation(job_id, score, matched, required) tuples. The score is the share
+        of the job's required skills present (0-100), the same measure as the local
+        match scorer; ties go to the job with more matched skills. Jobs matching no
+        skill are left out.
+        """
+        import numpy as np
+
+        snapshot = self.sync()
+        count = np.zeros(len(snapshot.job_ids), dtype=np.int32)
+        for skill in {normalize_skill(str(value)) for value in skills if value}:
+            rows = snapshot.postings.get(skill)
+            if rows is not None:
+                count[rows] += 1
+
+        rows = np.flatnonzero(count)
+        if not len(rows):
+            return []
+        matched = count[rows]
+        required = snapshot.required[rows]
+        score = matched * 100.0 / required
+        # lexsort sorts by the last key first: best score, then most matched skills
+        order = np.lexsort((-matched, -score))[:k]
+        return [
+            Recommendation(snapshot.job_ids[rows[index]], round(float(score[index]), 2), int(matched[index]), int(required[index]))
+            for index in order
+        ]
+
+
+job_skill_index = JobSkillIndex()
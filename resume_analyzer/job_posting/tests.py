@@ -1,3 +1,207 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+from .models import JobPosting
+from .search import search_job_postings, SEARCH_TABLE, SKILL_TABLE
+from .skill_index import JobSkillIndex
+from resume_analyzer import settings
 
-# Create your tests here.
+
+def _job(title, skills, company="Acme"):
+    return JobPosting.objects.create(title=title, company=company, required_skills=skills)
+
+
+class JobImportTests(TestCase):
+    def _import(self, name, content, **params):
+        query = "&".join(f"{key}={value}" for key, value in params.items())
+        return self.client.post(f'/api/jobs/import/?{query}', {"file": SimpleUploadedFile(name, content)})
+
+    def test_csv_import_reports_invalid_rows(self):
+        content = (
+            "title,company,required_skills\n"
+            "Backend Engineer,Acme,\"python, django\"\n"
+            ",Acme,python\n"
+            "Data Engineer,Initech,\"[\"\"SQL\"\", \"\"Spark\"\"]\"\n"
+        ).encode('utf-8')
+        response = self._import("jobs.csv", content, batch_size=1)
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual((report["created"], report["failed"]), (2, 1))
+        self.assertEqual(report["errors"][0]["row"], 2)
+        self.assertIn("title", report["errors"][0]["errors"])
+        self.assertEqual(len(JobPosting.objects.get(title="Data Engineer").required_skills), 2)
+
+    def test_ndjson_import_reports_undecodable_lines(self):
+        content = "\n".join([
+            json.dumps({"title": "Backend Engineer", "company": "Acme", "required_skills": ["Python"]}),
+            "{not json",
+            "",
+            json.dumps(["a", "list"]),
+        ]).encode('utf-8')
+        report = self._import("jobs.ndjson", content).json()
+        self.assertEqual((report["created"], report["failed"]), (1, 2))
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 4])
+        self.assertEqual(report["errors"][1]["errors"], {"non_field_errors": ["Each line must be a JSON object"]})
+
+    def test_byte_order_mark_is_ignored(self):
+        content = "﻿title,company,required_skills\nEngineer,Acme,python\n".encode('utf-8')
+        self.assertEqual(self._import("jobs.csv", content).json()["created"], 1)
+
+    def test_invalid_utf8_imports_nothing(self):
+        rows = "".join(f"Engineer {index},Acme,python\n" for index in range(50))
+        content = ("title,company,required_skills\n" + rows).encode('utf-8') + b"Caf\xe9 Owner,Acme,python\n"
+        response = self._import("jobs.csv", content, batch_size=10)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("nothing was imported", response.json()["detail"][0])
+        self.assertFalse(JobPosting.objects.exists())
+
+    def test_rejects_bad_parameters(self):
+        content = b"title,company,required_skills\n"
+        self.assertEqual(self._import("jobs.xlsx", content).status_code, 400)
+        self.assertEqual(self._import("jobs.csv", content, batch_size=0).status_code, 400)
+        self.assertEqual(self.client.post('/api/jobs/import/').status_code, 400)
+
+    def test_import_command_rejects_invalid_utf8(self):
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as file:
+            file.write(b"title,company,required_skills\nEngineer,Acme,python\nCaf\xe9,Acme,python\n")
+        self.addCleanup(os.unlink, file.name)
+        with self.assertRaisesMessage(CommandError, "offset"):
+            call_command('import_jobs', file.name, stdout=mock.Mock(), stderr=mock.Mock())
+        self.assertFalse(JobPosting.objects.exists())
+
+
+class JobSkillIndexTests(TestCase):
+    def setUp(self):
+        self.index = JobSkillIndex()
+        self.backend = _job("Backend Engineer", ["Python", "Django", "PostgreSQL"])
+        self.data = _job("Data Engineer", ["Python", "SQL"])
+        _job("Chef", [])
+
+    def _ranked(self, skills, k=10):
+        return [(recommendation.job_id, recommendation.score, recommendation.matched) for recommendation in self.index.rank(skills, k)]
+
+    def test_rank_orders_by_score_then_matched_skills(self):
+        self.assertEqual(self._ranked(["python", "Django"]), [
+            (self.backend.id, 66.67, 2),
+            (self.data.id, 50.0, 1),
+        ])
+        self.assertEqual(self._ranked(["Python"], k=1), [(self.data.id, 50.0, 1)])
+        self.assertEqual(self._ranked(["Cooking"]), [])
+
+    def test_sync_applies_changes_without_rebuilding(self):
+        self.index.sync(force=True)
+        with mock.patch.object(self.index, '_rebuild', wraps=self.index._rebuild) as rebuild:
+            created = _job("Analyst", ["SQL"])
+            self.index.sync(force=True)
+            self.assertEqual(self._ranked(["SQL"])[0], (created.id, 100.0, 1))
+
+            self.data.required_skills = ["Python"]
+            self.data.save()
+            JobPosting.objects.bulk_create([JobPosting(title="Importer", company="Acme", required_skills=["Django"])])
+            self.index.sync(force=True)
+            self.assertEqual(self._ranked(["SQL"]), [(created.id, 100.0, 1)])
+            self.assertEqual(len(self._ranked(["Django"])), 2)
+            rebuild.assert_not_called()
+
+    def test_sync_rereads_rows_committed_late(self):
+        self.index.sync(force=True)
+        # A concurrent import stamped the row before this index's last sync
+        late = _job("Late Import", ["Rust"])
+        JobPosting.objects.filter(id=late.id).update(updated_at=timezone.now() - timedelta(seconds=2))
+        self.index.sync(force=True)
+        self.assertEqual(self._ranked(["Rust"]), [(late.id, 100.0, 1)])
+
+    def test_deletions_trigger_a_rebuild(self):
+        self.index.sync(force=True)
+        self.data.delete()
+        self.index.sync(force=True)
+        self.assertEqual([job_id for job_id, _, _ in self._ranked(["Python"])], [self.backend.id])
+
+        # A deletion offset by a new posting leaves the count unchanged
+        self.backend.delete()
+        replacement = _job("Platform Engineer", ["Python"])
+        self.index.sync(force=True)
+        self.assertEqual(self._ranked(["Python"]), [(replacement.id, 100.0, 1)])
+
+    def test_sync_interval_limits_checks(self):
+        with mock.patch.object(settings, 'JOB_INDEX_SYNC_INTERVAL', 3600):
+            snapshot = self.index.sync()
+            _job("Analyst", ["SQL"])
+            self.assertIs(self.index.sync(), snapshot)
+            self.assertIsNot(self.index.sync(force=True), snapshot)
+
+
+class SearchIndexMigrationTests(TestCase):
+    """Runs against the fully migrated test database, so a migration that drops the triggers fails here."""
+
+    def test_triggers_survive_all_migrations(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s", [f"{SEARCH_TABLE}_%"])
+            triggers = sorted(row[0] for row in cursor.fetchall())
+        self.assertEqual(triggers, [f"{SEARCH_TABLE}_ad", f"{SEARCH_TABLE}_ai", f"{SEARCH_TABLE}_au"])
+
+        posting = _job("Backend Engineer", ["Python"])
+        self.assertEqual(search_job_postings(title="engineer"), [posting])
+        self.assertEqual(list(search_job_postings(skills=["python"])), [posting])
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.backend = _job("Backend Engineer", ["Python", "Django"])
+        self.frontend = _job("Frontend Engineer", ["JavaScript", "React"], company="Initech")
+
+    def _indexed_skills(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT skill FROM {SKILL_TABLE} WHERE job_id = %s ORDER BY skill", [job_id.hex])
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        self.assertEqual(self._indexed_skills(self.backend.id), ["django", "python"])
+
+        self.backend.title = "Platform Developer"
+        self.backend.required_skills = ["Rust"]
+        self.backend.save()
+        self.assertEqual(search_job_postings(title="engineer"), [self.frontend])
+        self.assertEqual(search_job_postings(title="developer"), [self.backend])
+        self.assertEqual(self._indexed_skills(self.backend.id), ["rust"])
+
+        deleted_id = self.frontend.id
+        self.frontend.delete()
+        self.assertEqual(search_job_postings(q="engineer"), [])
+        self.assertEqual(self._indexed_skills(deleted_id), [])
+
+        imported, = JobPosting.objects.bulk_create([JobPosting(title="Data Engineer", company="Hooli", required_skills=["SQL"])])
+        self.assertEqual(search_job_postings(company="hooli"), [imported])
+        self.assertEqual(list(search_job_postings(skills=["sql"])), [imported])
+
+    def test_short_terms_use_substring_matching(self):
+        go = _job("Go Developer", ["Go"], company="IO")
+        self.assertEqual(search_job_postings(title="Go"), [go])
+        self.assertEqual(search_job_postings(q="io"), [go])
+        self.assertEqual(search_job_postings(title="go", company="IO"), [go])
+        self.assertEqual(search_job_postings(title="Engineer", company="In"), [self.frontend])
+
+    def test_every_skill_is_required(self):
+        self.assertEqual(list(search_job_postings(skills=["python", "django"])), [self.backend])
+        self.assertEqual(list(search_job_postings(skills=["python", "react"])), [])
+        self.assertEqual(search_job_postings(q="engineer", skills=["React"]), [self.frontend])
+
+    def test_aliases_match_in_both_directions(self):
+        # Created without the serializer, so the alias is stored as written
+        raw = _job("Fullstack Engineer", ["JS", "Postgres"])
+        self.assertEqual(self._indexed_skills(raw.id), ["javascript", "postgresql"])
+        self.assertEqual(set(search_job_postings(skills=["javascript"])), {self.frontend, raw})
+        self.assertEqual(set(search_job_postings(skills=["js"])), {self.frontend, raw})
+        self.assertEqual(list(search_job_postings(skills=["PostgreSQL"])), [raw])
+
+    def test_non_ascii_skills_are_case_folded(self):
+        translator = _job("Translator", ["ÜBERSETZUNG"])
+        self.assertEqual(list(search_job_postings(skills=["übersetzung"])), [translator])
@@ -4,5 +4,6 @@ from . import views
 urlpatterns = [
     path('jobs/', views.create_job_posting, name='create_job_posting'),
     path('jobs/list/', views.get_job_postings, name='get_job_postings'),
+    path('jobs/import/', views.import_job_postings_file, name='import_job_postings'),
     path('jobs/<uuid:job_id>/', views.get_job_posting_by_id, name='get_job_posting_by_id'),
 ]
\ No newline at end of file
@@ -0,0 +1,134 @@
+import codecs
+import csv
+import json
+import logging
+import re
+from itertools import islice
+from django.db import transaction
+from .models import JobPosting
+from .serializers import JobPostingSerializer
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+# Cap on per-row errors kept in an import report
+MAX_REPORTED_ERRORS = 1000
+
+# Bytes read per block when checking an import file's encoding
+_ENCODING_CHECK_BLOCK = 1024 * 1024
+
+
+def detect_import_format(file_name, requested=None):
+    """
+    Resolve the import format from an explicit value or the file extension.
+    Raises ValueError for anything other than CSV or NDJSON.
+    """
+    if requested:
+        import_format = requested.lower()
+    elif file_name.lower().endswith('.csv'):
+        import_format = 'csv'
+    elif file_name.lower().endswith(('.ndjson', '.jsonl')):
+        import_format = 'ndjson'
+    else:
+        import_format = None
+
+    if import_format not in IMPORT_FORMATS:
+        raise ValueError("Unsupported import format. Use CSV or NDJSON")
+    return import_format
+
+
+def check_utf8(binary_stream):
+    """
+    Verify a seekable binary stream is valid UTF-8 before any row is imported, since
+    chunks are committed as they go and a decode error halfway through would leave a
+    partial import. Rewinds the stream; raises ValueError naming the bad byte offset.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    offset = 0
+    while True:
+        block = binary_stream.read(_ENCODING_CHECK_BLOCK)
+        try:
+            decoder.decode(block, final=not block)
+        except UnicodeDecodeError as e:
+            raise ValueError(f"File must be UTF-8 encoded (invalid byte at offset {offset + e.start}); nothing was imported")
+        if not block:
+            break
+        offset += len(block)
+    binary_stream.seek(0)
+
+
+def _split_skills(value):
+    """CSV cells hold skills as a JSON list or a comma/semicolon/pipe separated string."""
+    value = (value or '').strip()
+    if value.startswith('['):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            pass
+    return [skill.strip() for skill in re.split(r'[;,|]', value) if skill.strip()]
+
+
+def iter_import_rows(text_stream, import_format):
+    """
+    Lazily parse a text stream into (row_number, row_dict) pairs.
+    Rows that cannot be decoded are yielded as (row_number, error_message).
+    """
+    if import_format == 'csv':
+        for row_number, row in enumerate(csv.DictReader(text_stream), start=1):
+            if 'required_skills' in row:
+                row['required_skills'] = _split_skills(row['required_skills'])
+            yield row_number, row
+    else:
+        for row_number, line in enumerate(text_stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, f"Invalid JSON: {str(e)}"
+                continue
+            if not isinstance(row, dict):
+                yield row_number, "Each line must be a JSON object"
+                continue
+            yield row_number, row
+
+
+def import_job_postings(rows, batch_size):
+    """
+    Validate and insert job postings from an iterable of (row_number, row) pairs.
+    Rows are validated with JobPostingSerializer in chunks of `batch_size`, and each
+    chunk's valid rows are inserted with one bulk_create inside its own transaction.
+    Invalid rows are reported and skipped without aborting the import.
+    Returns a report dict with created/failed counts and per-row errors.
+    """
+    report = {"created": 0, "failed": 0, "errors": []}
+    rows = iter(rows)
+
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+
+        postings = []
+        for row_number, row in chunk:
+            if isinstance(row, str):
+                errors = {"non_field_errors": [row]}
+            else:
+                serializer = JobPostingSerializer(data=row)
+                if serializer.is_valid():
+                    postings.append(JobPosting(**serializer.validated_data))
+                    continue
+                errors = serializer.errors
+
+            report["failed"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append({"row": row_number, "errors": errors})
+
+        with transaction.atomic():
+            JobPosting.objects.bulk_create(postings, batch_size=batch_size)
+        report["created"] += len(postings)
+        logger.info(f"Job import progress: {report['created']} created, {report['failed']} failed")
+
+    return report
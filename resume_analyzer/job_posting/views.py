@@ -4,6 +4,10 @@ from rest_framework.decorators import api_view
 from rest_framework.exceptions import ValidationError, NotFound
 from .models import JobPosting
 from .serializers import JobPostingSerializer
+from .utils import detect_import_format, check_utf8, iter_import_rows, import_job_postings
+from .search import search_job_postings
+from resume_analyzer import settings
+import io
 import logging
 
 # Initialize logger for job posting operations
@@ -28,20 +32,30 @@ def create_job_posting(request):
 @api_view(['GET'])
 def get_job_postings(request):
     """
-    Retrieve all job postings with optional filters for title and company.
-    Logs the number of retrieved postings.
+    Retrieve job postings with optional filters.
+    title/company (and q, matching either) use the trigram search index and are ranked
+    by relevance; skills is a comma-separated list of required skills that must all match;
+    limit caps the number of results. Logs the number of retrieved postings.
     """
     title = request.query_params.get('title', None)
     company = request.query_params.get('company', None)
-    
-    queryset = JobPosting.objects.all()
-    if title:
-        queryset = queryset.filter(title__icontains=title)  # Filter by title (case insensitive)
-    if company:
-        queryset = queryset.filter(company__icontains=company)  # Filter by company (case insensitive)
-    
-    serializer = JobPostingSerializer(queryset, many=True)
-    logger.info(f"Retrieved {len(serializer.data)} job postings with filters - title: {title}, company: {company}")
+    q = request.query_params.get('q', None)
+    skills = request.query_params.get('skills', None)
+    limit = request.query_params.get('limit', None)
+
+    if limit is not None:
+        try:
+            limit = int(limit)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            raise ValidationError("limit must be a positive integer")
+
+    skill_list = [skill.strip() for skill in skills.split(',')] if skills else []
+    postings = search_job_postings(title=title, company=company, q=q, skills=skill_list, limit=limit)
+
+    serializer = JobPostingSerializer(postings, many=True)
+    logger.info(f"Retrieved {len(serializer.data)} job postings with filters - title: {title}, company: {company}, q: {q}, skills: {skills}")
     return Response(serializer.data)
 
 @api_view(['GET'])
@@ -58,3 +72,34 @@ def get_job_posting_by_id(request, job_id):
     except JobPosting.DoesNotExist:
         logger.warning(f"Job posting not found: {job_id}")
         raise NotFound(f"Job posting with ID {job_id} not found")
+
+@api_view(['POST'])
+def import_job_postings_file(request):
+    """
+    Bulk-import job postings from an uploaded CSV or NDJSON file.
+    The file is parsed as a stream, validated in chunks and inserted with bulk_create;
+    invalid rows are reported without aborting the rest of the import.
+    Optional query params: input (csv|ndjson) and batch_size.
+    """
+    if 'file' not in request.FILES:
+        raise ValidationError("No file provided")
+
+    file = request.FILES['file']
+    try:
+        import_format = detect_import_format(file.name, request.query_params.get('input'))
+        batch_size = int(request.query_params.get('batch_size', settings.JOB_IMPORT_BATCH_SIZE))
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+    except ValueError as e:
+        raise ValidationError(str(e))
+
+    try:
+        check_utf8(file.file)
+    except ValueError as e:
+        raise ValidationError(str(e))
+
+    text_stream = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
+    report = import_job_postings(iter_import_rows(text_stream, import_format), batch_size)
+
+    logger.info(f"Imported job postings from {file.name}: {report['created']} created, {report['failed']} failed")
+    return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK)
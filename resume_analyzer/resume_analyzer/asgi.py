@@ -16,4 +16,9 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_analyzer.settings')
 
 application = ProtocolTypeRouter({
     "http": get_asgi_application(),
-})
\ No newline at end of file
+})
+
+# Optionally preload the lazily imported extraction dependencies (WORKER_WARMUP)
+from resume_analyzer.common.warmup import warm_up_worker  # noqa: E402
+
+warm_up_worker()
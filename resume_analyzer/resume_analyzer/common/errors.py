@@ -2,7 +2,7 @@
 from rest_framework import status
 from rest_framework.views import exception_handler as drf_exception_handler
 from rest_framework.exceptions import ValidationError, NotFound, APIException
-from responses import Response
+from rest_framework.response import Response
 
 # Standard error responses as dictionaries
 ERROR_RESPONSES = {
@@ -0,0 +1,86 @@
+# resume_analyzer/common/export.py
+import csv
+import json
+import uuid
+from resume_analyzer import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """File-like object whose write() returns the value, so csv.writer output can be yielded."""
+
+    def write(self, value):
+        return value
+
+
+def parse_export_params(query_params):
+    """
+    Validate the common export query parameters.
+    Returns a dict with output format, job_id, min_score and max_score (None when absent).
+    Note: 'format' is reserved by DRF content negotiation, hence 'output'.
+    """
+    output = query_params.get('output', 'csv').lower()
+    if output not in EXPORT_FORMATS:
+        raise ValidationError(f"Unsupported output format '{output}'. Use one of: {', '.join(EXPORT_FORMATS)}")
+
+    params = {'output': output, 'job_id': None, 'min_score': None, 'max_score': None}
+    if query_params.get('job_id'):
+        try:
+            params['job_id'] = uuid.UUID(query_params['job_id'])
+        except ValueError:
+            raise ValidationError("job_id must be a valid UUID")
+    for key in ('min_score', 'max_score'):
+        if query_params.get(key):
+            try:
+                params[key] = float(query_params[key])
+            except ValueError:
+                raise ValidationError(f"{key} must be a number")
+    return params
+
+
+def _csv_value(value):
+    if isinstance(value, (list, tuple)):
+        return "; ".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    return value
+
+
+def iter_export_lines(rows, columns, output):
+    """
+    Yield encoded export output for an iterable of row dicts.
+    Lines are grouped into batches of EXPORT_CHUNK_SIZE rows to keep per-yield overhead low.
+    """
+    batch = []
+    if output == 'csv':
+        writer = csv.writer(Echo())
+        batch.append(writer.writerow(columns))
+        render = lambda row: writer.writerow([_csv_value(row.get(column)) for column in columns])
+    else:
+        encoder = DjangoJSONEncoder()
+        render = lambda row: json.dumps({column: row.get(column) for column in columns}, default=encoder.default) + "\n"
+
+    for row in rows:
+        batch.append(render(row))
+        if len(batch) >= settings.EXPORT_CHUNK_SIZE:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def streaming_export_response(rows, columns, output, filename):
+    """Wrap exported rows in a StreamingHttpResponse served as a file download."""
+    response = StreamingHttpResponse(
+        iter_export_lines(rows, columns, output),
+        content_type=EXPORT_FORMATS[output]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+    return response
@@ -0,0 +1,401 @@
+# resume_analyzer/common/gemini.py
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+import requests
+from resume_analyzer import settings
+from resume_analyzer.common.llm_cache import llm_cache
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+# Gemini model and API endpoints; the model name is part of every response cache key
+GEMINI_MODEL = "gemini-2.0-flash"
+GEMINI_API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
+GEMINI_STREAM_API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:streamGenerateContent"
+
+# Priority lanes: lower value is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BULK: "bulk",
+}
+
+
+class GeminiSchedulerTimeout(requests.RequestException):
+    """Raised when a request waits longer than the scheduler allows for quota."""
+
+
+class GeminiCircuitOpen(requests.RequestException):
+    """Raised without contacting Gemini while the circuit breaker is open."""
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at capacity / 60 per second.
+    Not thread-safe on its own; the scheduler guards it with its lock.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount):
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate) if self.rate else float('inf')
+
+    def consume(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+class GeminiScheduler:
+    """
+    Admission control in front of every Gemini call.
+    Enforces requests-per-minute and tokens-per-minute budgets and serves waiting
+    callers strictly by priority lane, FIFO within a lane, so interactive requests
+    overtake queued bulk work.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, max_wait):
+        self.max_wait = max_wait
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._cond = threading.Condition()
+        self._queue = []
+        self._counter = itertools.count()
+        self._stats = {
+            priority: {"queued": 0, "admitted": 0, "timed_out": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for priority in PRIORITY_NAMES
+        }
+
+    def acquire(self, priority, tokens):
+        """
+        Block until the caller is at the head of the queue and both buckets can
+        cover one request and `tokens` tokens. Returns the time spent waiting.
+        """
+        entry = (priority, next(self._counter))
+        start = time.monotonic()
+        deadline = start + self.max_wait
+        stats = self._stats[priority]
+
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            stats["queued"] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._queue[0] == entry:
+                        self._requests.refill(now)
+                        self._tokens.refill(now)
+                        delay = max(self._requests.time_until(1), self._tokens.time_until(tokens))
+                        if delay == 0:
+                            heapq.heappop(self._queue)
+                            self._requests.consume(1)
+                            self._tokens.consume(tokens)
+                            break
+                    else:
+                        delay = deadline - now
+                    if now >= deadline:
+                        self._queue.remove(entry)
+                        heapq.heapify(self._queue)
+                        stats["timed_out"] += 1
+                        raise GeminiSchedulerTimeout(
+                            f"Gemini quota wait exceeded {self.max_wait}s ({PRIORITY_NAMES[priority]} lane)"
+                        )
+                    self._cond.wait(timeout=min(delay, deadline - now))
+            finally:
+                stats["queued"] -= 1
+                # Wake the next head of queue whether we were admitted or gave up
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            stats["admitted"] += 1
+            stats["total_wait"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+        return waited
+
+    def settle(self, estimated, actual):
+        """Correct the token bucket once the real token usage of a call is known."""
+        with self._cond:
+            self._tokens.tokens -= actual - estimated
+            self._cond.notify_all()
+
+    def metrics(self):
+        """Snapshot of queue depth, wait times and remaining budget per lane."""
+        with self._cond:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            lanes = {}
+            for priority, name in PRIORITY_NAMES.items():
+                stats = self._stats[priority]
+                admitted = stats["admitted"]
+                lanes[name] = {
+                    "queue_depth": stats["queued"],
+                    "admitted": admitted,
+                    "timed_out": stats["timed_out"],
+                    "avg_wait_seconds": round(stats["total_wait"] / admitted, 4) if admitted else 0.0,
+                    "max_wait_seconds": round(stats["max_wait"], 4),
+                }
+            return {
+                "requests_per_minute": self._requests.capacity,
+                "tokens_per_minute": self._tokens.capacity,
+                "available_requests": round(self._requests.tokens, 2),
+                "available_tokens": round(self._tokens.tokens, 2),
+                "lanes": lanes,
+            }
+
+
+class CircuitBreaker:
+    """
+    Fails fast once Gemini looks unhealthy.
+    Counts consecutive failures (errors, timeouts and calls slower than the latency
+    threshold); after `failure_threshold` of them the circuit opens and calls are
+    rejected for `reset_timeout` seconds. A single trial call is then let through
+    (half-open); success closes the circuit and notifies registered listeners so
+    provisional results can be upgraded.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold, latency_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Register a callable run in a background thread whenever the circuit closes."""
+        self._listeners.append(callback)
+
+    def is_closed(self):
+        return self.state == self.CLOSED
+
+    def before_call(self):
+        """Raise GeminiCircuitOpen unless a call may go through right now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        raise GeminiCircuitOpen("Gemini circuit is open; skipping call")
+
+    def cancel_call(self):
+        """Release a half-open trial slot when the call never reached Gemini."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self, elapsed):
+        if elapsed > self.latency_threshold:
+            logger.warning(f"Gemini call took {elapsed:.2f}s (threshold {self.latency_threshold}s)")
+            self.record_failure()
+            return
+        with self._lock:
+            recovered = self.state != self.CLOSED
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+        if recovered:
+            logger.info("Gemini circuit closed")
+            for callback in self._listeners:
+                threading.Thread(target=callback, daemon=True).start()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Gemini circuit opened after {self.failures} consecutive failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def metrics(self):
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures}
+
+
+scheduler = GeminiScheduler(
+    requests_per_minute=settings.GEMINI_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.GEMINI_TOKENS_PER_MINUTE,
+    max_wait=settings.GEMINI_SCHEDULER_MAX_WAIT,
+)
+
+circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.GEMINI_CIRCUIT_FAILURE_THRESHOLD,
+    latency_threshold=settings.GEMINI_CIRCUIT_LATENCY_THRESHOLD,
+    reset_timeout=settings.GEMINI_CIRCUIT_RESET_TIMEOUT,
+)
+
+
+def estimate_tokens(prompt):
+    """
+    Rough token estimate used to reserve quota before the call is made
+    (~4 characters per token plus headroom for the response).
+    """
+    return len(prompt) // 4 + settings.GEMINI_RESPONSE_TOKEN_ESTIMATE
+
+
+def generate_content(prompt, priority=PRIORITY_BULK, cache=None):
+    """
+    Send a prompt to the Gemini API through the shared scheduler and return the
+    raw text of the first candidate. Raises requests.RequestException on failure,
+    including GeminiCircuitOpen when the circuit breaker rejects the call.
+    `cache` names the operation (see llm_cache.OPERATIONS): a cached response for
+    the same prompt is returned without a call, and a fresh one is stored.
+    """
+    if cache:
+        cached = llm_cache.get(cache, GEMINI_MODEL, prompt)
+        if cached is not None:
+            return cached
+
+    circuit_breaker.before_call()
+    estimated = estimate_tokens(prompt)
+    try:
+        waited = scheduler.acquire(priority, estimated)
+    except GeminiSchedulerTimeout:
+        circuit_breaker.cancel_call()
+        raise
+    if waited > 1:
+        logger.info(f"Gemini call waited {waited:.2f}s for quota ({PRIORITY_NAMES[priority]} lane)")
+
+    headers = {
+        'Content-Type': 'application/json',
+    }
+    payload = {
+        "contents": [{
+            "parts": [{"text": prompt}]
+        }]
+    }
+
+    start = time.monotonic()
+    try:
+        response = requests.post(
+            f"{GEMINI_API_URL}?key={settings.GEMINI_API_KEY}",
+            headers=headers,
+            json=payload,
+            timeout=settings.GEMINI_REQUEST_TIMEOUT
+        )
+    except requests.RequestException:
+        circuit_breaker.record_failure()
+        raise
+
+    if response.status_code != 200:
+        circuit_breaker.record_failure()
+        logger.error(f"Gemini API call failed: {response.text}")
+        raise requests.RequestException("Failed to call Gemini API")
+    circuit_breaker.record_success(time.monotonic() - start)
+
+    gemini_response = response.json()
+    usage = gemini_response.get('usageMetadata', {}).get('totalTokenCount')
+    if usage is not None:
+        scheduler.settle(estimated, usage)
+
+    text = gemini_response['candidates'][0]['content']['parts'][0]['text']
+    if cache:
+        llm_cache.set(cache, GEMINI_MODEL, prompt, text)
+    return text
+
+
+def discard_cached_content(prompt, cache):
+    """Forget a cached response the caller could not use (e.g. malformed JSON), so the next call asks Gemini again."""
+    llm_cache.discard(cache, GEMINI_MODEL, prompt)
+
+
+def stream_generate_content(prompt, priority=PRIORITY_INTERACTIVE, cache=None):
+    """
+    Streaming variant of generate_content: yields text fragments as Gemini produces
+    them (streamGenerateContent with server-sent events). Quota and the circuit
+    breaker apply as for generate_content; latency is judged on time to first chunk.
+    Raises requests.RequestException if the call fails before or while streaming.
+    With `cache`, a cached response is yielded as one fragment, and a stream read
+    to the end is stored.
+    """
+    if cache:
+        cached = llm_cache.get(cache, GEMINI_MODEL, prompt)
+        if cached is not None:
+            yield cached
+            return
+
+    circuit_breaker.before_call()
+    estimated = estimate_tokens(prompt)
+    try:
+        waited = scheduler.acquire(priority, estimated)
+    except GeminiSchedulerTimeout:
+        circuit_breaker.cancel_call()
+        raise
+    if waited > 1:
+        logger.info(f"Gemini stream waited {waited:.2f}s for quota ({PRIORITY_NAMES[priority]} lane)")
+
+    payload = {
+        "contents": [{
+            "parts": [{"text": prompt}]
+        }]
+    }
+
+    start = time.monotonic()
+    first_chunk = None
+    usage = None
+    failed = False
+    fragments = []
+    try:
+        response = requests.post(
+            f"{GEMINI_STREAM_API_URL}?alt=sse&key={settings.GEMINI_API_KEY}",
+            headers={'Content-Type': 'application/json'},
+            json=payload,
+            timeout=settings.GEMINI_REQUEST_TIMEOUT,
+            stream=True
+        )
+        with response:
+            if response.status_code != 200:
+                logger.error(f"Gemini streaming call failed: {response.text}")
+                raise requests.RequestException("Failed to call Gemini API")
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                chunk = json.loads(line[5:])
+                if first_chunk is None:
+                    first_chunk = time.monotonic() - start
+                usage = chunk.get('usageMetadata', {}).get('totalTokenCount', usage)
+                for candidate in chunk.get('candidates', [])[:1]:
+                    for part in candidate.get('content', {}).get('parts', []):
+                        if part.get('text'):
+                            fragments.append(part['text'])
+                            yield part['text']
+    except (requests.RequestException, ValueError) as e:
+        failed = True
+        circuit_breaker.record_failure()
+        if isinstance(e, ValueError):
+            raise requests.RequestException(f"Malformed Gemini stream: {str(e)}")
+        raise
+    finally:
+        # Also reached when the consumer stops early (client disconnect) after Gemini answered
+        if not failed:
+            circuit_breaker.record_success(first_chunk if first_chunk is not None else time.monotonic() - start)
+        if usage is not None:
+            scheduler.settle(estimated, usage)
+    if cache and fragments:
+        # Only reached when the consumer read the whole stream
+        llm_cache.set(cache, GEMINI_MODEL, prompt, "".join(fragments))
@@ -0,0 +1,219 @@
+# resume_analyzer/common/llm_cache.py
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from resume_analyzer import settings
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+# Cacheable Gemini operations (LLM_CACHE_OPERATIONS selects which are enabled)
+OPERATION_PARSE_RESUME = 'parse_resume'
+OPERATION_SORT_SKILLS = 'sort_skills'
+OPERATION_SCORE_MATCH = 'score_match'
+OPERATION_STREAM_MATCH = 'stream_match'
+
+OPERATIONS = (OPERATION_PARSE_RESUME, OPERATION_SORT_SKILLS, OPERATION_SCORE_MATCH, OPERATION_STREAM_MATCH)
+
+# Disk entries are trimmed to LLM_CACHE_DISK_ENTRIES once per this many writes (at most)
+_TRIM_EVERY = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_response (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_response_accessed_at ON llm_response (accessed_at);
+"""
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace runs so prompts differing only in spacing or line endings share an entry."""
+    return " ".join(prompt.split())
+
+
+def cache_key(model, prompt):
+    return hashlib.sha256(f"{model}\0{normalize_prompt(prompt)}".encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache of raw Gemini responses keyed by model and normalized prompt hash.
+    An in-process LRU (`memory_entries`) sits in front of a SQLite file shared by all
+    worker processes (`disk_entries`, evicted least recently used). Entries older than
+    `ttl` seconds are ignored and purged. Only operations in `operations` are cached.
+    """
+
+    def __init__(self, path, memory_entries, disk_entries, ttl, operations):
+        self.path = str(path) if path else ''
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.ttl = ttl
+        self.operations = frozenset(operations)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+        self._writes = 0
+        self._stats = {
+            operation: {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+            for operation in OPERATIONS
+        }
+
+    def enabled(self, operation):
+        return operation in self.operations
+
+    def _db(self):
+        """The SQLite connection, reopened after a fork. Caller holds the lock."""
+        if self._connection is None or self._connection_pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            # WAL lets worker processes read while another one writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _remember(self, key, expires_at, response):
+        self._memory[key] = (expires_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, operation, model, prompt):
+        """The cached response text, or None on a miss (or when the operation is not cached)."""
+        if not self.enabled(operation):
+            return None
+        key = cache_key(model, prompt)
+        now = time.time()
+        stats = self._stats[operation]
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    stats["memory_hits"] += 1
+                    return entry[1]
+                del self._memory[key]
+
+            if self.path and self.disk_entries:
+                try:
+                    db = self._db()
+                    row = db.execute(
+                        "SELECT response, created_at FROM llm_response WHERE key = ? AND created_at > ?",
+                        (key, now - self.ttl),
+                    ).fetchone()
+                    if row is not None:
+                        db.execute("UPDATE llm_response SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._remember(key, row[1] + self.ttl, row[0])
+                        stats["disk_hits"] += 1
+                        return row[0]
+                except sqlite3.Error as e:
+                    logger.warning(f"LLM cache lookup failed: {str(e)}")
+
+            stats["misses"] += 1
+            return None
+
+    def set(self, operation, model, prompt, response):
+        """Store a response for an enabled operation in both tiers."""
+        if not self.enabled(operation):
+            return
+        key = cache_key(model, prompt)
+        now = time.time()
+        with self._lock:
+            self._remember(key, now + self.ttl, response)
+            self._stats[operation]["stores"] += 1
+            if not (self.path and self.disk_entries):
+                return
+            try:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO llm_response (key, model, operation, response, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, operation, response, now, now),
+                )
+                self._writes += 1
+                if self._writes % min(_TRIM_EVERY, max(1, self.disk_entries // 10)) == 0:
+                    self._trim(db, now)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {str(e)}")
+
+    def _trim(self, db, now):
+        db.execute("DELETE FROM llm_response WHERE created_at <= ?", (now - self.ttl,))
+        db.execute(
+            "DELETE FROM llm_response WHERE key IN "
+            "(SELECT key FROM llm_response ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.disk_entries,),
+        )
+
+    def discard(self, operation, model, prompt):
+        """Drop an entry, e.g. when the caller could not use the cached response."""
+        if not self.enabled(operation):
+            return
+        key = cache_key(model, prompt)
+        with self._lock:
+            self._memory.pop(key, None)
+            if not (self.path and self.disk_entries):
+                return
+            try:
+                self._db().execute("DELETE FROM llm_response WHERE key = ?", (key,))
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache delete failed: {str(e)}")
+
+    def clear(self, operation=None):
+        """Remove all entries (or one operation's) from both tiers. Returns the disk rows deleted."""
+        with self._lock:
+            self._memory.clear()
+            if not (self.path and self.disk_entries):
+                return 0
+            db = self._db()
+            if operation:
+                cursor = db.execute("DELETE FROM llm_response WHERE operation = ?", (operation,))
+            else:
+                cursor = db.execute("DELETE FROM llm_response")
+            return cursor.rowcount
+
+    def metrics(self):
+        """Hit/miss counters per operation for this process, plus tier sizes."""
+        with self._lock:
+            operations = {}
+            for operation, stats in self._stats.items():
+                lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+                operations[operation] = dict(
+                    stats,
+                    enabled=self.enabled(operation),
+                    hit_rate=round((lookups - stats["misses"]) / lookups, 4) if lookups else 0.0,
+                )
+            disk_size = None
+            if self.path and self.disk_entries:
+                try:
+                    disk_size = self._db().execute("SELECT COUNT(*) FROM llm_response").fetchone()[0]
+                except sqlite3.Error as e:
+                    logger.warning(f"LLM cache size lookup failed: {str(e)}")
+            return {
+                "memory_entries": len(self._memory),
+                "memory_capacity": self.memory_entries,
+                "disk_entries": disk_size,
+                "disk_capacity": self.disk_entries,
+                "ttl_seconds": self.ttl,
+                "operations": operations,
+            }
+
+
+llm_cache = LLMResponseCache(
+    path=settings.LLM_CACHE_PATH,
+    memory_entries=settings.LLM_CACHE_MEMORY_ENTRIES,
+    disk_entries=settings.LLM_CACHE_DISK_ENTRIES,
+    ttl=settings.LLM_CACHE_TTL,
+    operations=settings.LLM_CACHE_OPERATIONS if settings.LLM_CACHE_ENABLED else (),
+)
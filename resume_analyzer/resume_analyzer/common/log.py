@@ -0,0 +1,132 @@
+# resume_analyzer/common/log.py
+import logging
+import queue
+import re
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+# Default cap on a single log message; longer ones (raw Gemini responses) are cut
+DEFAULT_MAX_MESSAGE_LENGTH = 2000
+
+
+def truncate_for_log(value, max_length=500):
+    """Shorten a large payload (e.g. a raw Gemini response) before it goes into a log message."""
+    text = str(value)
+    if len(text) <= max_length:
+        return text
+    return f"{text[:max_length]}... [truncated {len(text) - max_length} chars]"
+
+
+class TruncateFilter(logging.Filter):
+    """Cut messages longer than max_length so one record cannot write kilobytes to every handler."""
+
+    def __init__(self, max_length=DEFAULT_MAX_MESSAGE_LENGTH):
+        super().__init__()
+        self.max_length = max_length
+
+    def filter(self, record):
+        message = record.getMessage()
+        if len(message) > self.max_length:
+            record.msg = truncate_for_log(message, self.max_length)
+            record.args = None
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let at most `rate` records per `interval` seconds through for each message template
+    starting with one of `prefixes` (e.g. "Retrieved "). Templates ignore numbers and ids,
+    so "Retrieved 12 resumes" and "Retrieved 40 resumes" share a budget. Only records at
+    INFO and below are limited; the next record let through reports how many were dropped.
+    """
+
+    _VARIABLE = re.compile(r'[0-9a-f]{8}-[0-9a-f-]{27}|\d+(\.\d+)?')
+    max_templates = 1000
+
+    def __init__(self, prefixes=(), rate=10, interval=60.0):
+        super().__init__()
+        self.prefixes = tuple(prefixes)
+        self.rate = rate
+        self.interval = interval
+        self._windows = {}  # template -> [window_start, allowed, suppressed]
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        # Messages embedding free text (search filters, titles) create many one-off templates
+        for template, window in list(self._windows.items()):
+            if now - window[0] >= self.interval:
+                del self._windows[template]
+
+    def filter(self, record):
+        if record.levelno > logging.INFO or not self.prefixes:
+            return True
+        message = record.getMessage()
+        if not message.startswith(self.prefixes):
+            return True
+
+        template = self._VARIABLE.sub('#', message)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(template)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                if window is None and len(self._windows) >= self.max_templates:
+                    self._prune(now)
+                window = self._windows[template] = [now, 0, 0]
+            else:
+                suppressed = 0
+            if window[1] >= self.rate:
+                window[2] += 1
+                return False
+            window[1] += 1
+
+        if suppressed:
+            record.msg = f"{message} ({suppressed} similar messages suppressed)"
+            record.args = None
+        return True
+
+
+class _DrainingQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # The default put_nowait raises queue.Full at shutdown when the queue is full;
+        # wait for the listener thread to make room instead
+        self.queue.put(self._sentinel)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Hand records to a background QueueListener that writes them to the real handlers,
+    so request threads never block on file or console I/O. The queue is bounded;
+    when it is full records are dropped and counted instead of stalling the caller.
+
+    Configured from LOGGING with the target handlers given as 'cfg://handlers.<name>'.
+    """
+
+    def __init__(self, handlers, queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.dropped = 0
+        # Index rather than iterate: dictConfig only resolves 'cfg://' entries on item access
+        handlers = [handlers[index] for index in range(len(handlers))]
+        self.listener = _DrainingQueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        self._listening = True
+
+    def close(self):
+        # Called by logging.shutdown() at exit: drain queued records before the targets close
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
+        super().close()
+
+    def enqueue(self, record):
+        try:
+            if self.dropped:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    'name': record.name, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                    'module': 'log', 'msg': f"Log queue full, dropped {self.dropped} records",
+                }))
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
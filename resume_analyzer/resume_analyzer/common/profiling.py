@@ -0,0 +1,207 @@
+# resume_analyzer/common/profiling.py
+import hmac
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from django.core.exceptions import MiddlewareNotUsed
+from resume_analyzer import settings
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+MAX_STACK_DEPTH = 128
+TOP_FRAMES = 25
+
+# Frame file names are shown relative to the project or the installed-packages directory
+_PATH_PREFIXES = sorted({path for path in sys.path if path} | {str(settings.BASE_DIR)}, key=len, reverse=True)
+
+
+def _frame_label(code):
+    filename = code.co_filename
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix + os.sep):
+            filename = filename[len(prefix) + 1:]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for one thread: a background thread snapshots the target
+    thread's stack every `interval` seconds and counts collapsed stacks
+    ("root;caller;leaf"). The profiled code runs unmodified, so the cost is one
+    stack walk per sample rather than a hook on every call.
+    """
+
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self.samples = 0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        labels = []
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _frame_label(code)
+            labels.append(label)
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(labels))] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def top_frames(self, limit=TOP_FRAMES):
+        """Most sampled functions as self (leaf) and total (anywhere on the stack) sample counts."""
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        return {
+            "self": [{"frame": frame, "samples": count} for frame, count in own.most_common(limit)],
+            "total": [{"frame": frame, "samples": count} for frame, count in total.most_common(limit)],
+        }
+
+
+def _profile_files():
+    directory = settings.PROFILING_DIR
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.json')]
+
+
+def rotate_profiles():
+    """Keep only the newest PROFILING_MAX_FILES captures."""
+    files = sorted(_profile_files(), key=os.path.getmtime, reverse=True)
+    for path in files[settings.PROFILING_MAX_FILES:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def save_profile(profile, metadata):
+    """Write a capture (request metadata, top frames, collapsed stacks) and rotate old ones."""
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    data = dict(metadata)
+    data.update({
+        "interval_ms": profile.interval * 1000,
+        "samples": profile.samples,
+        "top": profile.top_frames(),
+        "stacks": dict(profile.stacks.most_common()),
+    })
+    path = os.path.join(settings.PROFILING_DIR, f"{metadata['id']}.json")
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    rotate_profiles()
+    return path
+
+
+def list_profiles(limit=50):
+    """Summaries of captured requests, slowest first."""
+    summaries = []
+    for path in _profile_files():
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        data.pop('stacks', None)
+        data.pop('top', None)
+        summaries.append(data)
+    summaries.sort(key=lambda item: item.get('duration_ms', 0), reverse=True)
+    return summaries[:limit]
+
+
+def load_profile(profile_id):
+    """Return a full capture by id, or None."""
+    path = os.path.join(settings.PROFILING_DIR, f"{profile_id}.json")
+    if not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def is_profiling_authorized(request):
+    """True when the request carries the configured X-Profile token."""
+    token = settings.PROFILING_TOKEN
+    supplied = request.META.get(PROFILE_HEADER, '')
+    # compare_digest only accepts ASCII str; bytes work for any header value
+    return bool(token) and bool(supplied) and hmac.compare_digest(supplied.encode(), token.encode())
+
+
+class ProfilingMiddleware:
+    """
+    Run selected requests under the sampling profiler and save the capture to
+    PROFILING_DIR. A request is profiled when it sends `X-Profile: <PROFILING_TOKEN>`
+    or is picked by PROFILING_SAMPLE_RATE. With neither configured the middleware
+    removes itself at startup, so disabled profiling costs nothing per request.
+    Streaming responses are timed until the response object is returned.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_TOKEN and settings.PROFILING_SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed("Request profiling is disabled")
+        self.get_response = get_response
+
+    def __call__(self, request):
+        authorized = is_profiling_authorized(request)
+        if not (authorized or random.random() < settings.PROFILING_SAMPLE_RATE):
+            return self.get_response(request)
+
+        profile = SamplingProfiler(interval=settings.PROFILING_INTERVAL)
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        profile.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile.stop()
+        duration = time.perf_counter() - start
+
+        profile_id = str(uuid.uuid4())
+        metadata = {
+            "id": profile_id,
+            "method": request.method,
+            "path": request.path,
+            "query": request.META.get('QUERY_STRING', ''),
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "started_at": started_at.isoformat(),
+            "trigger": "header" if authorized else "sample",
+        }
+        try:
+            save_profile(profile, metadata)
+            response['X-Profile-Id'] = profile_id
+        except OSError as e:
+            logger.warning(f"Could not save request profile for {request.path}: {str(e)}")
+        return response
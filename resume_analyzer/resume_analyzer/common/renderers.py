@@ -0,0 +1,90 @@
+# resume_analyzer/common/renderers.py
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:  # Optional: MessagePack is only offered when the package is installed
+    msgpack = None
+
+# UUIDs, datetimes, dataclasses and str/dict/list subclasses (ReturnDict, ErrorDetail) are
+# native to orjson; anything else (Decimal, lazy translations, querysets) goes through
+# DRF's encoder so the output matches JSONRenderer
+_fallback = JSONEncoder().default
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _msgpack_default(obj):
+    # Same string forms as the JSON output: UUIDs and datetimes are not MessagePack types
+    return orjson.loads(orjson.dumps(obj, default=_fallback, option=ORJSON_OPTIONS))
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Drop-in replacement for DRF's JSONRenderer backed by orjson."""
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        options = ORJSON_OPTIONS
+        # Honour `Accept: application/json; indent=N` (and the browsable API) like JSONRenderer
+        if accepted_media_type and 'indent=' in accepted_media_type:
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_fallback, option=options)
+
+
+class ORJSONParser(BaseParser):
+    """Parse JSON request bodies with orjson."""
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as e:
+            raise ParseError(f"JSON parse error - {str(e)}")
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets views that stream server-sent events accept `Accept: text/event-stream`
+    (what EventSource sends). The stream itself is a StreamingHttpResponse; only
+    error responses pass through here, as a single 'error' event.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return b"event: error\ndata: " + orjson.dumps(data, default=_fallback, option=ORJSON_OPTIONS) + b"\n\n"
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Compact binary responses for clients sending `Accept: application/msgpack` (or ?format=msgpack)."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_msgpack_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """Parse MessagePack request bodies (`Content-Type: application/msgpack`)."""
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as e:
+            raise ParseError(f"MessagePack parse error - {str(e)}")
@@ -0,0 +1,41 @@
+# resume_analyzer/common/serializers.py
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework import ISO_8601
+from rest_framework.settings import api_settings
+from resume_analyzer import settings
+
+
+class FastRepresentationMixin:
+    """
+    Helpers for hand-written, read-only to_representation fast paths on list serializers.
+    format_datetime() gives the same output as DRF's DateTimeField (DATETIME_FORMAT,
+    current time zone, 'Z' for UTC) but looks the time zone up once per serializer
+    rather than once per value; with many=True every row shares the child serializer.
+    """
+
+    @cached_property
+    def _output_timezone(self):
+        return timezone.get_current_timezone() if settings.USE_TZ else None
+
+    def format_datetime(self, value):
+        output_format = api_settings.DATETIME_FORMAT
+        if not value or output_format is None or isinstance(value, str):
+            return value or None
+        tz = self._output_timezone
+        if tz is not None:
+            value = value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+        if output_format.lower() == ISO_8601:
+            value = value.isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+        return value.strftime(output_format)
+
+    def format_date(self, value):
+        output_format = api_settings.DATE_FORMAT
+        if not value or output_format is None or isinstance(value, str):
+            return value or None
+        if output_format.lower() == ISO_8601:
+            return value.isoformat()
+        return value.strftime(output_format)
@@ -0,0 +1,145 @@
+# resume_analyzer/common/skills.py
+import re
+from functools import lru_cache
+
+# Canonical skill name -> known aliases. Lookups ignore case, spaces and punctuation
+# (other than + and #), so "Node JS", "nodejs" and "Node.js" need no separate entries.
+# Only list aliases that always mean the canonical skill: "CV" (resume), "Version Control"
+# (not only Git) or "Continuous Delivery" (a practice, not CI/CD tooling) would merge
+# distinct skills, and canonical names are written back to stored rows.
+SKILL_ALIASES = {
+    'JavaScript': ['JS', 'Java Script', 'ECMAScript', 'ES6', 'ES2015', 'Vanilla JS'],
+    'TypeScript': ['TS'],
+    'Python': ['Python3', 'Py'],
+    'Golang': ['Go', 'Go Lang'],
+    'C++': ['CPP', 'C Plus Plus'],
+    'C#': ['CSharp', 'C Sharp'],
+    'Objective-C': ['ObjC'],
+    'Ruby on Rails': ['Rails', 'RoR'],
+    'Node.js': ['Node', 'NodeJS'],
+    'Express.js': ['Express', 'ExpressJS'],
+    'React': ['ReactJS', 'React.js'],
+    'React Native': [],
+    'Angular': ['AngularJS', 'Angular.js'],
+    'Vue.js': ['Vue', 'VueJS'],
+    'Next.js': ['NextJS'],
+    '.NET': ['DotNet', '.NET Core', 'NET Core'],
+    'ASP.NET': ['ASP.NET Core', 'ASP NET MVC'],
+    'Django': ['Django Framework'],
+    'Django REST Framework': ['DRF', 'Django Rest'],
+    'Flask': [],
+    'FastAPI': [],
+    'Spring Boot': ['SpringBoot'],
+    'HTML': ['HTML5'],
+    'CSS': ['CSS3'],
+    'SQL': ['Structured Query Language'],
+    'PostgreSQL': ['Postgres', 'PSQL', 'Postgre SQL'],
+    'MySQL': [],
+    'Microsoft SQL Server': ['MSSQL', 'SQL Server', 'MS SQL'],
+    'MongoDB': ['Mongo'],
+    'Redis': [],
+    'Elasticsearch': ['Elastic Search'],
+    'Amazon Web Services': ['AWS', 'Amazon AWS'],
+    'Google Cloud Platform': ['GCP', 'Google Cloud'],
+    'Microsoft Azure': ['Azure'],
+    'Docker': ['Docker Containers'],
+    'Kubernetes': ['K8s', 'K8'],
+    'Terraform': [],
+    'CI/CD': ['CICD'],
+    'Git': ['Git SCM'],
+    'Linux': ['Unix/Linux', 'GNU/Linux'],
+    'Machine Learning': ['ML'],
+    'Deep Learning': ['DL'],
+    'Artificial Intelligence': ['AI'],
+    'Natural Language Processing': ['NLP'],
+    'Computer Vision': [],
+    'Large Language Models': ['LLM', 'LLMs'],
+    'scikit-learn': ['sklearn', 'Scikit Learn', 'SciKit'],
+    'TensorFlow': [],
+    'PyTorch': [],
+    'Pandas': [],
+    'NumPy': [],
+    'Apache Spark': ['Spark', 'PySpark'],
+    'Apache Kafka': ['Kafka'],
+    'Apache Airflow': ['Airflow'],
+    'Hadoop': ['Apache Hadoop'],
+    'Power BI': ['PowerBI', 'Microsoft Power BI'],
+    'Tableau': [],
+    'Microsoft Excel': ['Excel', 'MS Excel', 'Advanced Excel'],
+    'REST APIs': ['REST', 'RESTful', 'RESTful APIs', 'REST API', 'RESTful Services'],
+    'GraphQL': [],
+    'Microservices': ['Microservice Architecture', 'Micro Services'],
+    'Object-Oriented Programming': ['OOP', 'OOPs', 'OOPS Concepts'],
+    'Data Structures and Algorithms': ['DSA', 'Data Structures & Algorithms'],
+    'Agile': ['Agile Methodology', 'Agile Methodologies'],
+    'Scrum': [],
+    'Jira': ['Atlassian Jira'],
+    'Unit Testing': ['Unit Tests'],
+    'pytest': ['Py.test'],
+    'Selenium': ['Selenium WebDriver'],
+    'Problem Solving': ['Problem-solving', 'Problem Solving Skills'],
+    'Communication': ['Communication Skills', 'Verbal Communication', 'Written Communication'],
+    'Teamwork': ['Team Work', 'Team Player', 'Team collaboration'],
+    'Leadership': ['Team Leadership', 'Leadership Skills'],
+}
+
+# Trailing version markers stripped before a second lookup ("Python 3.11", "JavaScript ES6", "Angular v2")
+_VERSION_SUFFIX = re.compile(r'[\s-]+(v?\d+(\.\d+)*(\.x)?\+?|es\d+|es20\d\d)$', re.IGNORECASE)
+_KEY_STRIP = re.compile(r'[^a-z0-9+#]')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def skill_key(skill):
+    """Lookup key: lower-case with everything except letters, digits, + and # removed."""
+    return _KEY_STRIP.sub('', str(skill).lower())
+
+
+def _build_lookup():
+    lookup = {}
+    for canonical, aliases in SKILL_ALIASES.items():
+        for name in [canonical] + aliases:
+            lookup[skill_key(name)] = canonical
+    return lookup
+
+
+_LOOKUP = _build_lookup()
+
+
+@lru_cache(maxsize=8192)
+def canonicalize_skill(skill):
+    """
+    Return the canonical spelling of a skill. Unknown skills come back trimmed with
+    collapsed whitespace, so the vocabulary still shrinks on spacing/case noise.
+    """
+    cleaned = _WHITESPACE.sub(' ', str(skill)).strip(' \t,;.:')
+    canonical = _LOOKUP.get(skill_key(cleaned))
+    if canonical:
+        return canonical
+    unversioned = _VERSION_SUFFIX.sub('', cleaned)
+    if unversioned != cleaned:
+        canonical = _LOOKUP.get(skill_key(unversioned))
+        if canonical:
+            return canonical
+    return cleaned
+
+
+def canonicalize_skills(skills):
+    """Canonicalize a list of skills, dropping blanks and duplicates while keeping order."""
+    seen = set()
+    result = []
+    for skill in skills or []:
+        if not isinstance(skill, str):
+            skill = str(skill)
+        canonical = canonicalize_skill(skill)
+        key = skill_key(canonical)
+        if key and key not in seen:
+            seen.add(key)
+            result.append(canonical)
+    return result
+
+
+def canonicalize_structured_data(structured_data):
+    """Canonicalize the 'skills' list of a resume's structured_data in place and return it."""
+    if isinstance(structured_data, dict) and isinstance(structured_data.get('skills'), list):
+        structured_data['skills'] = canonicalize_skills(structured_data['skills'])
+    return structured_data
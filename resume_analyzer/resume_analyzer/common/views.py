@@ -0,0 +1,57 @@
+# resume_analyzer/common/views.py
+from rest_framework.response import Response
+from rest_framework.decorators import api_view
+from rest_framework.exceptions import NotFound, ValidationError
+from django.http import HttpResponse
+from resume_analyzer.common.errors import get_error_response
+from resume_analyzer.common.gemini import scheduler, circuit_breaker
+from resume_analyzer.common.llm_cache import llm_cache
+from resume_analyzer.common.profiling import is_profiling_authorized, list_profiles, load_profile
+
+
+@api_view(['GET'])
+def get_llm_metrics(request):
+    """
+    API to expose Gemini scheduler metrics.
+    Reports queue depth, wait times and remaining quota per priority lane,
+    plus the circuit breaker state and response cache hit/miss counters.
+    """
+    metrics = scheduler.metrics()
+    metrics["circuit"] = circuit_breaker.metrics()
+    metrics["cache"] = llm_cache.metrics()
+    return Response(metrics)
+
+
+@api_view(['GET'])
+def get_request_profiles(request):
+    """
+    API to list captured request profiles, slowest first (?limit=, default 50).
+    Requires the X-Profile header with PROFILING_TOKEN.
+    """
+    if not is_profiling_authorized(request):
+        response, status_code = get_error_response("FORBIDDEN")
+        return Response(response, status=status_code)
+    try:
+        limit = int(request.query_params.get('limit', 50))
+    except ValueError:
+        raise ValidationError("limit must be an integer")
+    return Response(list_profiles(limit))
+
+
+@api_view(['GET'])
+def get_request_profile(request, profile_id):
+    """
+    API to fetch one captured profile: request metadata, the most sampled functions
+    and the collapsed stacks. ?output=folded returns the stacks in the folded text
+    format read by flamegraph.pl and speedscope.
+    """
+    if not is_profiling_authorized(request):
+        response, status_code = get_error_response("FORBIDDEN")
+        return Response(response, status=status_code)
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise NotFound(f"Profile with ID {profile_id} not found")
+    if request.query_params.get('output') == 'folded':
+        folded = "".join(f"{stack} {count}\n" for stack, count in profile['stacks'].items())
+        return HttpResponse(folded, content_type='text/plain')
+    return Response(profile)
@@ -0,0 +1,47 @@
+# resume_analyzer/common/warmup.py
+import logging
+import threading
+import time
+from resume_analyzer import settings
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+WARMUP_BACKGROUND = 'background'
+WARMUP_BLOCKING = 'blocking'
+
+
+def warm_up():
+    """
+    Load the dependencies deferred to first use (PDF/DOCX extractors, numpy for
+    near-duplicate detection, the spaCy pipeline when the local parser is enabled)
+    and build the job skill index, so the first upload or job recommendation a
+    worker serves does not pay for them.
+    """
+    from django.db import connections
+    from candidates_resume.dedup import _minhash_params
+    from candidates_resume.utils import _get_nlp, PARSER_MODE_LLM
+    from job_posting.skill_index import job_skill_index
+
+    start = time.perf_counter()
+    import docx2txt  # noqa: F401
+    import pdfplumber  # noqa: F401
+    import pypdfium2  # noqa: F401
+    _minhash_params()
+    if settings.RESUME_PARSER_MODE != PARSER_MODE_LLM:
+        _get_nlp()
+    job_skill_index.sync()
+    # The warm-up thread's database connection is not reused by requests
+    connections.close_all()
+    logger.info(f"Worker warm-up finished in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def warm_up_worker():
+    """Run warm_up() according to WORKER_WARMUP. Called from the WSGI/ASGI entry points only."""
+    mode = settings.WORKER_WARMUP
+    if mode == WARMUP_BLOCKING:
+        warm_up()
+    elif mode == WARMUP_BACKGROUND:
+        threading.Thread(target=warm_up, name='worker-warmup', daemon=True).start()
+    elif mode:
+        logger.warning(f"Unknown WORKER_WARMUP mode '{mode}', skipping warm-up")
@@ -1,7 +1,8 @@
 # resume_analyzer/settings.py
 from pathlib import Path
+import importlib.util
 import os
-from decouple import config  # Import config for environment variables
+from decouple import config, Csv  # Import config for environment variables
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -9,6 +10,40 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Gemini API Key
 GEMINI_API_KEY = config('AI_API_KEY')
 
+# Gemini quota budgets enforced by the shared scheduler (resume_analyzer/common/gemini.py)
+GEMINI_REQUESTS_PER_MINUTE = config('GEMINI_REQUESTS_PER_MINUTE', default=15, cast=int)
+GEMINI_TOKENS_PER_MINUTE = config('GEMINI_TOKENS_PER_MINUTE', default=1000000, cast=int)
+GEMINI_RESPONSE_TOKEN_ESTIMATE = config('GEMINI_RESPONSE_TOKEN_ESTIMATE', default=500, cast=int)
+GEMINI_SCHEDULER_MAX_WAIT = config('GEMINI_SCHEDULER_MAX_WAIT', default=120, cast=float)
+
+# Gemini request timeout and circuit breaker thresholds (seconds)
+GEMINI_REQUEST_TIMEOUT = config('GEMINI_REQUEST_TIMEOUT', default=30, cast=float)
+GEMINI_CIRCUIT_FAILURE_THRESHOLD = config('GEMINI_CIRCUIT_FAILURE_THRESHOLD', default=5, cast=int)
+GEMINI_CIRCUIT_LATENCY_THRESHOLD = config('GEMINI_CIRCUIT_LATENCY_THRESHOLD', default=20, cast=float)
+GEMINI_CIRCUIT_RESET_TIMEOUT = config('GEMINI_CIRCUIT_RESET_TIMEOUT', default=30, cast=float)
+
+# Gemini responses are cached by model and normalized prompt: an in-process LRU of
+# LLM_CACHE_MEMORY_ENTRIES in front of a SQLite file shared by all workers (LLM_CACHE_PATH,
+# LLM_CACHE_DISK_ENTRIES, least recently used evicted). Entries expire after LLM_CACHE_TTL
+# seconds. LLM_CACHE_OPERATIONS lists the cached calls: parse_resume, sort_skills,
+# score_match, stream_match.
+LLM_CACHE_ENABLED = config('LLM_CACHE_ENABLED', default=True, cast=bool)
+LLM_CACHE_OPERATIONS = config('LLM_CACHE_OPERATIONS', default='parse_resume,sort_skills,score_match,stream_match', cast=Csv())
+LLM_CACHE_PATH = config('LLM_CACHE_PATH', default=os.path.join(BASE_DIR, 'cache/llm_responses.sqlite3'))
+LLM_CACHE_MEMORY_ENTRIES = config('LLM_CACHE_MEMORY_ENTRIES', default=1024, cast=int)
+LLM_CACHE_DISK_ENTRIES = config('LLM_CACHE_DISK_ENTRIES', default=100000, cast=int)
+LLM_CACHE_TTL = config('LLM_CACHE_TTL', default=7 * 24 * 3600, cast=float)
+
+# Log messages longer than this are truncated; repeated INFO messages starting with one
+# of LOG_RATE_LIMIT_PREFIXES pass at most LOG_RATE_LIMIT times per LOG_RATE_LIMIT_INTERVAL seconds
+LOG_MAX_MESSAGE_LENGTH = config('LOG_MAX_MESSAGE_LENGTH', default=2000, cast=int)
+LOG_RATE_LIMIT = config('LOG_RATE_LIMIT', default=10, cast=int)
+LOG_RATE_LIMIT_INTERVAL = config('LOG_RATE_LIMIT_INTERVAL', default=60, cast=float)
+LOG_RATE_LIMIT_PREFIXES = ['Retrieved ']
+LOG_QUEUE_SIZE = config('LOG_QUEUE_SIZE', default=10000, cast=int)
+
+# Request threads only enqueue records; a background listener writes them to the
+# file and console handlers (see resume_analyzer/common/log.py)
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -18,6 +53,18 @@ LOGGING = {
             'style': '{',
         },
     },
+    'filters': {
+        'rate_limit': {
+            '()': 'resume_analyzer.common.log.RateLimitFilter',
+            'prefixes': LOG_RATE_LIMIT_PREFIXES,
+            'rate': LOG_RATE_LIMIT,
+            'interval': LOG_RATE_LIMIT_INTERVAL,
+        },
+        'truncate': {
+            '()': 'resume_analyzer.common.log.TruncateFilter',
+            'max_length': LOG_MAX_MESSAGE_LENGTH,
+        },
+    },
     'handlers': {
         'file': {
             'level': 'INFO',
@@ -30,10 +77,17 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
         },
+        # Named so it sorts after the handlers it references; dictConfig builds them in name order
+        'queue': {
+            '()': 'resume_analyzer.common.log.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file'],
+            'queue_size': LOG_QUEUE_SIZE,
+            'filters': ['rate_limit', 'truncate'],
+        },
     },
     'loggers': {
         'job_posting': {
-            'handlers': ['file', 'console'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': True,
         },
@@ -59,6 +113,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost so captures include every other middleware; removes itself when profiling is off
+    'resume_analyzer.common.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -118,6 +174,73 @@ USE_TZ = True
 STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# PDF text extraction backend: 'pdfium' (fast), 'pdfplumber' (accurate, slow) or
+# 'auto' (pdfium, falling back to pdfplumber when the output looks wrong)
+PDF_EXTRACTION_BACKEND = config('PDF_EXTRACTION_BACKEND', default='auto')
+
+# File extractors, numpy and spaCy are imported on first use, so processes that never
+# parse a resume start fast. WORKER_WARMUP preloads them when a server worker boots:
+# 'background' (in a thread, serving immediately), 'blocking' (before serving) or '' (off).
+WORKER_WARMUP = config('WORKER_WARMUP', default='')
+
+# `manage.py benchmark_startup` fails when importing the WSGI application and serving the
+# first request takes longer than this (ms, median of fresh processes)
+STARTUP_IMPORT_BUDGET_MS = config('STARTUP_IMPORT_BUDGET_MS', default=800, cast=float)
+
+# Resume parser: 'llm' (Gemini), 'fast' (local rules + spaCy) or 'fast_then_llm'
+# (store the local parse immediately, refine with Gemini in the background)
+RESUME_PARSER_MODE = config('RESUME_PARSER_MODE', default='llm')
+
+# Chunked resume uploads: spool directory and size limits (bytes)
+RESUME_UPLOAD_SPOOL_DIR = config('RESUME_UPLOAD_SPOOL_DIR', default=os.path.join(BASE_DIR, 'spool/uploads'))
+RESUME_UPLOAD_MAX_CHUNK_SIZE = config('RESUME_UPLOAD_MAX_CHUNK_SIZE', default=8 * 1024 * 1024, cast=int)
+RESUME_UPLOAD_MAX_FILE_SIZE = config('RESUME_UPLOAD_MAX_FILE_SIZE', default=100 * 1024 * 1024, cast=int)
+
+# Rows fetched per database round-trip (and written per chunk) by streaming exports
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Rows validated and inserted per transaction by the bulk job import
+JOB_IMPORT_BATCH_SIZE = config('JOB_IMPORT_BATCH_SIZE', default=1000, cast=int)
+
+# Resumes whose MinHash similarity to an earlier resume reaches RESUME_DEDUP_THRESHOLD are
+# linked to it as near-duplicates. With MATCH_SKIP_DUPLICATES, matching a duplicate reuses
+# its canonical resume's score instead of calling Gemini again.
+RESUME_DEDUP_THRESHOLD = config('RESUME_DEDUP_THRESHOLD', default=0.85, cast=float)
+MATCH_SKIP_DUPLICATES = config('MATCH_SKIP_DUPLICATES', default=False, cast=bool)
+
+# Matches kept per job in the top-candidates leaderboard (largest ?n= served by match/<job_id>/top/)
+MATCH_LEADERBOARD_SIZE = config('MATCH_LEADERBOARD_SIZE', default=100, cast=int)
+
+# Job recommendations for a candidate (resume/<id>/jobs/) rank all postings against an
+# in-memory skill index, which checks for new or changed postings at most every
+# JOB_INDEX_SYNC_INTERVAL seconds. ?k= is capped at JOB_RECOMMENDATION_MAX_K and
+# ?rescore=true sends at most JOB_RECOMMENDATION_RESCORE_LIMIT of them to the Gemini scorer.
+JOB_INDEX_SYNC_INTERVAL = config('JOB_INDEX_SYNC_INTERVAL', default=1.0, cast=float)
+JOB_RECOMMENDATION_MAX_K = config('JOB_RECOMMENDATION_MAX_K', default=100, cast=int)
+JOB_RECOMMENDATION_RESCORE_LIMIT = config('JOB_RECOMMENDATION_RESCORE_LIMIT', default=10, cast=int)
+
+# Request profiling: requests sending `X-Profile: <PROFILING_TOKEN>`, plus a random
+# PROFILING_SAMPLE_RATE share of all requests, run under a sampling profiler. Captures
+# are saved to PROFILING_DIR (newest PROFILING_MAX_FILES kept). Off when both are unset.
+PROFILING_TOKEN = config('PROFILING_TOKEN', default='')
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_INTERVAL = config('PROFILING_INTERVAL', default=0.005, cast=float)
+PROFILING_DIR = config('PROFILING_DIR', default=os.path.join(BASE_DIR, 'profiles'))
+PROFILING_MAX_FILES = config('PROFILING_MAX_FILES', default=200, cast=int)
+
+# API responses are rendered (and JSON bodies parsed) with orjson. MessagePack is offered
+# through content negotiation (`Accept: application/msgpack`) when the msgpack package is installed.
+API_MSGPACK_ENABLED = config('API_MSGPACK_ENABLED', default=importlib.util.find_spec('msgpack') is not None, cast=bool)
+
 REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'resume_analyzer.common.errors.custom_exception_handler',
+    'DEFAULT_RENDERER_CLASSES': [
+        'resume_analyzer.common.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ] + (['resume_analyzer.common.renderers.MessagePackRenderer'] if API_MSGPACK_ENABLED else []),
+    'DEFAULT_PARSER_CLASSES': [
+        'resume_analyzer.common.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ] + (['resume_analyzer.common.renderers.MessagePackParser'] if API_MSGPACK_ENABLED else []),
 }
\ No newline at end of file
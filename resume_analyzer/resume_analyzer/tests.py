@@ -0,0 +1,398 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+import requests
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from candidates_resume.models import CandidateProfile
+from candidates_resume.serializers import CandidateProfileLiteSerializer
+from job_posting.models import JobPosting
+from job_posting.serializers import JobPostingSerializer
+from resume_matcher.models import ResumeMatchScore
+from resume_matcher.serializers import ResumeMatchScoreDetailSerializer
+from resume_analyzer.common import gemini
+from resume_analyzer.common.gemini import (
+    GeminiScheduler, GeminiSchedulerTimeout, CircuitBreaker, GeminiCircuitOpen, PRIORITY_INTERACTIVE, PRIORITY_BULK,
+)
+from resume_analyzer.common.llm_cache import LLMResponseCache, OPERATIONS, OPERATION_PARSE_RESUME, OPERATION_SORT_SKILLS
+from resume_analyzer.common.log import RateLimitFilter, TruncateFilter, QueueListenerHandler
+from resume_analyzer.common.renderers import ORJSONRenderer
+from resume_analyzer.common.skills import canonicalize_skill, canonicalize_skills, canonicalize_structured_data
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not reached")
+        time.sleep(0.005)
+
+
+class GeminiSchedulerTests(SimpleTestCase):
+    def test_interactive_requests_overtake_queued_bulk_work(self):
+        scheduler = GeminiScheduler(requests_per_minute=240, tokens_per_minute=10 ** 6, max_wait=5)
+        scheduler._requests.tokens = 0
+        admitted = []
+
+        def call(name, priority):
+            scheduler.acquire(priority, 10)
+            admitted.append(name)
+
+        threads = []
+        for name, priority, queued in (("bulk-1", PRIORITY_BULK, 1), ("bulk-2", PRIORITY_BULK, 2), ("interactive", PRIORITY_INTERACTIVE, 3)):
+            thread = threading.Thread(target=call, args=(name, priority))
+            thread.start()
+            threads.append(thread)
+            _wait_for(lambda: len(scheduler._queue) == queued)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(admitted, ["interactive", "bulk-1", "bulk-2"])
+        lanes = scheduler.metrics()["lanes"]
+        self.assertEqual((lanes["interactive"]["admitted"], lanes["bulk"]["admitted"]), (1, 2))
+        self.assertEqual(lanes["bulk"]["queue_depth"], 0)
+
+    def test_token_budget_and_timeout(self):
+        scheduler = GeminiScheduler(requests_per_minute=100, tokens_per_minute=1000, max_wait=0.1)
+        self.assertLess(scheduler.acquire(PRIORITY_BULK, 900), 0.1)
+        with self.assertRaises(GeminiSchedulerTimeout):
+            scheduler.acquire(PRIORITY_BULK, 900)
+        self.assertEqual(scheduler._queue, [])
+        self.assertEqual(scheduler.metrics()["lanes"]["bulk"]["timed_out"], 1)
+
+        # Settling a call that used fewer tokens than estimated returns the difference
+        scheduler.settle(900, 100)
+        self.assertGreaterEqual(scheduler.metrics()["available_tokens"], 900)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_threshold=2, latency_threshold=1.0, reset_timeout=0.05)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success(0.1)
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_closed())
+
+        self.breaker.record_success(5.0)  # Slower than the latency threshold
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(GeminiCircuitOpen):
+            self.breaker.before_call()
+
+    def test_half_open_trial(self):
+        recovered = threading.Event()
+        self.breaker.add_listener(recovered.set)
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        time.sleep(0.06)
+
+        # Only one trial call at a time; a failed trial reopens the circuit
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(GeminiCircuitOpen):
+            self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        # A trial that never reached Gemini frees the slot
+        time.sleep(0.06)
+        self.breaker.before_call()
+        self.breaker.cancel_call()
+        self.breaker.before_call()
+        self.breaker.record_success(0.1)
+        self.assertTrue(self.breaker.is_closed())
+        self.assertTrue(recovered.wait(2))
+
+
+class LLMResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, 'llm.sqlite3')
+
+    def _cache(self, memory_entries=10, disk_entries=100, ttl=60, operations=OPERATIONS):
+        return LLMResponseCache(self.path, memory_entries, disk_entries, ttl, operations)
+
+    def test_tiers_and_normalized_prompts(self):
+        cache = self._cache()
+        self.assertIsNone(cache.get(OPERATION_PARSE_RESUME, 'model', 'parse  this\r\nresume'))
+        cache.set(OPERATION_PARSE_RESUME, 'model', 'parse  this\r\nresume', '{"name": "Jane"}')
+        self.assertEqual(cache.get(OPERATION_PARSE_RESUME, 'model', 'parse this resume'), '{"name": "Jane"}')
+        self.assertIsNone(cache.get(OPERATION_PARSE_RESUME, 'other-model', 'parse this resume'))
+
+        # Another worker process sees the entry through the shared file
+        other = self._cache()
+        self.assertEqual(other.get(OPERATION_PARSE_RESUME, 'model', 'parse this resume'), '{"name": "Jane"}')
+        self.assertEqual(other.get(OPERATION_PARSE_RESUME, 'model', 'parse this resume'), '{"name": "Jane"}')
+        stats = other.metrics()["operations"][OPERATION_PARSE_RESUME]
+        self.assertEqual((stats["disk_hits"], stats["memory_hits"], stats["misses"]), (1, 1, 0))
+        self.assertEqual(cache.metrics()["operations"][OPERATION_PARSE_RESUME]["hit_rate"], 0.3333)
+
+    def test_disabled_operation_is_not_cached(self):
+        cache = self._cache(operations=[OPERATION_PARSE_RESUME])
+        cache.set(OPERATION_SORT_SKILLS, 'model', 'sort', '["a"]')
+        self.assertIsNone(cache.get(OPERATION_SORT_SKILLS, 'model', 'sort'))
+        self.assertFalse(cache.metrics()["operations"][OPERATION_SORT_SKILLS]["enabled"])
+
+    def test_entries_expire_after_ttl(self):
+        cache = self._cache(ttl=60)
+        with mock.patch('resume_analyzer.common.llm_cache.time.time', return_value=1000.0):
+            cache.set(OPERATION_PARSE_RESUME, 'model', 'prompt', 'answer')
+        with mock.patch('resume_analyzer.common.llm_cache.time.time', return_value=1059.0):
+            self.assertEqual(cache.get(OPERATION_PARSE_RESUME, 'model', 'prompt'), 'answer')
+        with mock.patch('resume_analyzer.common.llm_cache.time.time', return_value=1061.0):
+            self.assertIsNone(cache.get(OPERATION_PARSE_RESUME, 'model', 'prompt'))
+            self.assertIsNone(self._cache(ttl=60).get(OPERATION_PARSE_RESUME, 'model', 'prompt'))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = self._cache(memory_entries=2, disk_entries=3)
+        clock = iter(range(1000, 2000))
+        with mock.patch('resume_analyzer.common.llm_cache.time.time', side_effect=lambda: float(next(clock))):
+            for name in ('a', 'b', 'c'):
+                cache.set(OPERATION_PARSE_RESUME, 'model', name, name.upper())
+            self.assertEqual(cache.metrics()["memory_entries"], 2)
+            # 'a' fell out of memory but is still on disk; reading it makes it the most recent
+            self.assertEqual(cache.get(OPERATION_PARSE_RESUME, 'model', 'a'), 'A')
+            cache.set(OPERATION_PARSE_RESUME, 'model', 'd', 'D')
+
+            fresh = self._cache(disk_entries=3)
+            self.assertEqual(fresh.metrics()["disk_entries"], 3)
+            self.assertIsNone(fresh.get(OPERATION_PARSE_RESUME, 'model', 'b'))
+            self.assertEqual(fresh.get(OPERATION_PARSE_RESUME, 'model', 'a'), 'A')
+
+    def test_discard_and_clear(self):
+        cache = self._cache()
+        cache.set(OPERATION_PARSE_RESUME, 'model', 'prompt', 'not json')
+        cache.set(OPERATION_SORT_SKILLS, 'model', 'sort', '["a"]')
+        cache.discard(OPERATION_PARSE_RESUME, 'model', 'prompt')
+        self.assertIsNone(cache.get(OPERATION_PARSE_RESUME, 'model', 'prompt'))
+        self.assertIsNone(self._cache().get(OPERATION_PARSE_RESUME, 'model', 'prompt'))
+        self.assertEqual(cache.clear(OPERATION_SORT_SKILLS), 1)
+        self.assertIsNone(cache.get(OPERATION_SORT_SKILLS, 'model', 'sort'))
+
+
+class GenerateContentTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.breaker = CircuitBreaker(failure_threshold=1, latency_threshold=10, reset_timeout=60)
+        for name, value in (
+            ('llm_cache', LLMResponseCache(os.path.join(directory, 'llm.sqlite3'), 10, 100, 60, OPERATIONS)),
+            ('scheduler', GeminiScheduler(requests_per_minute=10 ** 5, tokens_per_minute=10 ** 9, max_wait=1)),
+            ('circuit_breaker', self.breaker),
+        ):
+            patcher = mock.patch.object(gemini, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _response(self, status_code=200, text="answer"):
+        response = mock.Mock(status_code=status_code, text="error")
+        response.json.return_value = {
+            "candidates": [{"content": {"parts": [{"text": text}]}}],
+            "usageMetadata": {"totalTokenCount": 42},
+        }
+        return response
+
+    @mock.patch('resume_analyzer.common.gemini.requests.post')
+    def test_cached_responses_skip_the_call(self, post):
+        post.return_value = self._response()
+        self.assertEqual(gemini.generate_content("prompt", cache=OPERATION_PARSE_RESUME), "answer")
+        self.assertEqual(gemini.generate_content("prompt", cache=OPERATION_PARSE_RESUME), "answer")
+        self.assertEqual(post.call_count, 1)
+
+        gemini.discard_cached_content("prompt", OPERATION_PARSE_RESUME)
+        gemini.generate_content("prompt", cache=OPERATION_PARSE_RESUME)
+        gemini.generate_content("prompt")
+        self.assertEqual(post.call_count, 3)
+
+    @mock.patch('resume_analyzer.common.gemini.requests.post')
+    def test_failures_open_the_circuit(self, post):
+        post.return_value = self._response(status_code=500)
+        with self.assertRaises(requests.RequestException):
+            gemini.generate_content("prompt", cache=OPERATION_PARSE_RESUME)
+        with self.assertRaises(GeminiCircuitOpen):
+            gemini.generate_content("prompt", cache=OPERATION_PARSE_RESUME)
+        self.assertEqual(post.call_count, 1)
+        self.assertIsNone(gemini.llm_cache.get(OPERATION_PARSE_RESUME, gemini.GEMINI_MODEL, "prompt"))
+
+
+class SkillCanonicalizationTests(SimpleTestCase):
+    def test_aliases_and_spelling_variants(self):
+        for raw, canonical in (
+            ("JS", "JavaScript"), ("node js", "Node.js"), ("NodeJS", "Node.js"), ("k8s", "Kubernetes"),
+            ("C#", "C#"), ("c++", "C++"), ("  postgres ", "PostgreSQL"), ("ci/cd", "CI/CD"),
+        ):
+            self.assertEqual(canonicalize_skill(raw), canonical, raw)
+
+    def test_version_suffixes_are_stripped_for_lookup(self):
+        self.assertEqual(canonicalize_skill("Python 3.11"), "Python")
+        self.assertEqual(canonicalize_skill("JavaScript ES6"), "JavaScript")
+        self.assertEqual(canonicalize_skill("Angular v2"), "Angular")
+        # Unknown skills keep their version
+        self.assertEqual(canonicalize_skill("Fortran 90"), "Fortran 90")
+
+    def test_unknown_skills_are_cleaned_not_renamed(self):
+        self.assertEqual(canonicalize_skill("  Quantum\n  Computing; "), "Quantum Computing")
+
+    def test_ambiguous_terms_are_not_aliases(self):
+        for term in ("CV", "Collaboration", "Version Control", "Continuous Integration", "Continuous Delivery", "Torch"):
+            self.assertEqual(canonicalize_skill(term), term)
+
+    def test_lists_drop_blanks_duplicates_and_non_strings(self):
+        self.assertEqual(
+            canonicalize_skills(["JS", "javascript", "", "  ", "Python", 3, "py"]),
+            ["JavaScript", "Python", "3"],
+        )
+        self.assertEqual(canonicalize_skills(None), [])
+        data = {"name": "Jane", "skills": ["ReactJS", "React.js"]}
+        self.assertEqual(canonicalize_structured_data(data)["skills"], ["React"])
+        self.assertEqual(canonicalize_structured_data({"skills": "Python"}), {"skills": "Python"})
+
+
+class FastRenderingTests(TestCase):
+    def setUp(self):
+        self.job = JobPosting.objects.create(title="Backend Engineer", company="Acme", required_skills=["Python", "Django"])
+        canonical = CandidateProfile.objects.create(extracted_text="Jane", structured_data={"name": "Jane"}, file_type='pdf')
+        self.candidate = CandidateProfile.objects.create(
+            extracted_text="Jane Doe", structured_data={"name": "Zoë Doe", "skills": ["Python"]}, file_type='pdf',
+            duplicate_of=canonical, skill_count=1, years_experience=4.5, education_level=3,
+            last_updated_bucket=date(2026, 10, 1),
+        )
+        self.match = ResumeMatchScore.objects.create(
+            job_posting=self.job, candidate_profile=self.candidate, matching_score=66.67, summary="Good fit ✓",
+        )
+        # Reload so timestamps come from the database like in list views
+        self.match = ResumeMatchScore.objects.select_related('job_posting', 'candidate_profile').get(id=self.match.id)
+
+    def test_fast_paths_match_generic_representation(self):
+        for serializer_class, instance in (
+            (JobPostingSerializer, self.job),
+            (CandidateProfileLiteSerializer, self.candidate),
+            (ResumeMatchScoreDetailSerializer, self.match),
+        ):
+            for zone in ('UTC', 'Asia/Kolkata'):
+                with self.subTest(serializer=serializer_class.__name__, zone=zone), timezone.override(zone):
+                    serializer = serializer_class()
+                    generic = serializers.ModelSerializer.to_representation(serializer, instance)
+                    self.assertEqual(serializer_class().to_representation(instance), dict(generic))
+
+    def test_orjson_renderer_matches_json_renderer(self):
+        payload = ResumeMatchScoreDetailSerializer([self.match], many=True).data
+        self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+        data = {
+            "id": uuid.uuid4(), "when": timezone.now(), "day": date(2024, 1, 2), "amount": Decimal("1.50"),
+            "errors": [ErrorDetail("bad", code="invalid")], 1: "numeric key", "none": None, "large": 1e20,
+        }
+        orjson_output, json_output = ORJSONRenderer().render(data), JSONRenderer().render(data)
+        # Only float exponents are spelled differently ("1e20" and "1e+20")
+        self.assertEqual(orjson_output.replace(b"1e20", b"1e+20"), json_output)
+        indented = 'application/json; indent=4'
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(data, indented)), json.loads(JSONRenderer().render(data, indented))
+        )
+
+
+def _record(msg, *args, level=logging.INFO):
+    return logging.makeLogRecord({'name': 'job_posting', 'msg': msg, 'args': args, 'levelno': level, 'levelname': logging.getLevelName(level)})
+
+
+class LogFilterTests(SimpleTestCase):
+    def test_rate_limit_shares_a_budget_per_template(self):
+        log_filter = RateLimitFilter(prefixes=["Retrieved "], rate=2, interval=60)
+        with mock.patch('resume_analyzer.common.log.time.monotonic', return_value=1000.0) as clock:
+            passed = [
+                log_filter.filter(_record("Retrieved %d resumes", count)) for count in (12, 40, 7)
+            ] + [log_filter.filter(_record("Retrieved job %s", uuid.uuid4())) for _ in range(3)]
+            self.assertEqual(passed, [True, True, False, True, True, False])
+            # Other messages, and warnings with the prefix, are never limited
+            self.assertTrue(log_filter.filter(_record("Created job %s", uuid.uuid4())))
+            self.assertTrue(log_filter.filter(_record("Retrieved %d resumes", 1, level=logging.WARNING)))
+            self.assertFalse(log_filter.filter(_record("Retrieved %d resumes", 3)))
+
+            clock.return_value = 1061.0
+            record = _record("Retrieved %d resumes", 5)
+            self.assertTrue(log_filter.filter(record))
+            self.assertEqual(record.getMessage(), "Retrieved 5 resumes (2 similar messages suppressed)")
+            # The count is reported once
+            record = _record("Retrieved %d resumes", 6)
+            self.assertTrue(log_filter.filter(record))
+            self.assertEqual(record.getMessage(), "Retrieved 6 resumes")
+
+    def test_rate_limit_prunes_expired_templates(self):
+        log_filter = RateLimitFilter(prefixes=["Retrieved "], rate=1, interval=60)
+        log_filter.max_templates = 3
+        with mock.patch('resume_analyzer.common.log.time.monotonic', return_value=1000.0) as clock:
+            for title in ("backend", "data", "frontend"):
+                log_filter.filter(_record("Retrieved jobs matching %s", title))
+            clock.return_value = 1100.0
+            log_filter.filter(_record("Retrieved jobs matching %s", "platform"))
+        self.assertEqual(list(log_filter._windows), ["Retrieved jobs matching platform"])
+
+    def test_truncate_filter(self):
+        log_filter = TruncateFilter(max_length=20)
+        record = _record("Gemini said %s", "x" * 100)
+        self.assertTrue(log_filter.filter(record))
+        self.assertEqual(record.getMessage(), "Gemini said xxxxxxxx... [truncated 92 chars]")
+        self.assertIsNone(record.args)
+
+        record = _record("Short %s", "one")
+        log_filter.filter(record)
+        self.assertEqual((record.msg, record.args), ("Short %s", ("one",)))
+
+
+class QueueListenerHandlerTests(SimpleTestCase):
+    class BlockingHandler(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.started = threading.Event()
+            self.unblocked = threading.Event()
+            self.messages = []
+
+        def emit(self, record):
+            self.started.set()
+            self.unblocked.wait(5)
+            self.messages.append(record.getMessage())
+
+    def setUp(self):
+        self.target = self.BlockingHandler()
+        self.handler = QueueListenerHandler([self.target], queue_size=2)
+        self.addCleanup(self.handler.close)
+        self.addCleanup(self.target.unblocked.set)
+
+    def _fill_queue(self, count):
+        self.handler.handle(_record("record %d", 0))
+        self.assertTrue(self.target.started.wait(2))  # The listener is now stuck writing record 0
+        for index in range(1, count):
+            self.handler.handle(_record("record %d", index))
+
+    def test_full_queue_drops_and_reports(self):
+        self._fill_queue(5)
+        self.assertEqual(self.handler.dropped, 2)
+
+        self.target.unblocked.set()
+        _wait_for(lambda: len(self.target.messages) == 3)
+        self.handler.handle(_record("record %d", 5))
+        self.handler.close()
+        self.assertEqual(self.target.messages, [
+            "record 0", "record 1", "record 2", "Log queue full, dropped 2 records", "record 5",
+        ])
+        self.assertEqual(self.handler.dropped, 0)
+
+    def test_close_drains_a_full_queue(self):
+        self._fill_queue(3)
+        threading.Timer(0.05, self.target.unblocked.set).start()
+        self.handler.close()
+        self.assertEqual(self.target.messages, ["record 0", "record 1", "record 2"])
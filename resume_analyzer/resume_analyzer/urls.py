@@ -16,10 +16,14 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from resume_analyzer.common.views import get_llm_metrics, get_request_profiles, get_request_profile
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('job_posting.urls')),
     path('api/', include('candidates_resume.urls')),
     path('api/', include('resume_matcher.urls')),
+    path('api/llm/metrics/', get_llm_metrics, name='get_llm_metrics'),
+    path('api/profiles/', get_request_profiles, name='get_request_profiles'),
+    path('api/profiles/<uuid:profile_id>/', get_request_profile, name='get_request_profile'),
 ]
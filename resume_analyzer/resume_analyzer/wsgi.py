@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_analyzer.settings')
 
 application = get_wsgi_application()
+
+# Optionally preload the lazily imported extraction dependencies (WORKER_WARMUP)
+from resume_analyzer.common.warmup import warm_up_worker  # noqa: E402
+
+warm_up_worker()
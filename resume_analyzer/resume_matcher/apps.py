@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ResumeMatcherConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'resume_matcher'
+
+    def ready(self):
+        from resume_analyzer.common.gemini import circuit_breaker
+        from .utils import upgrade_provisional_results
+        from . import signals  # noqa: F401  (registers the leaderboard receivers)
+
+        # Upgrade provisional scores and pending parses whenever Gemini recovers
+        circuit_breaker.add_listener(upgrade_provisional_results)
@@ -0,0 +1,129 @@
+import logging
+from collections import defaultdict
+from django.db import transaction, IntegrityError
+from resume_analyzer import settings
+from .models import ResumeMatchScore, MatchLeaderboardEntry
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+# Invariant per job: the leaderboard holds the MATCH_LEADERBOARD_SIZE best matches, so
+# a job whose board is not full has every one of its matches on it, and any match
+# off the board scores no higher than the lowest entry.
+
+
+def rebuild_job_leaderboard(job_id):
+    """Recompute one job's leaderboard from its matches. Returns the number of entries."""
+    with transaction.atomic():
+        top = list(
+            ResumeMatchScore.objects.filter(job_posting_id=job_id)
+            .order_by('-matching_score', 'id')
+            .values_list('id', 'matching_score')[:settings.MATCH_LEADERBOARD_SIZE]
+        )
+        MatchLeaderboardEntry.objects.filter(job_posting_id=job_id).delete()
+        MatchLeaderboardEntry.objects.bulk_create([
+            MatchLeaderboardEntry(match_id=match_id, job_posting_id=job_id, matching_score=score)
+            for match_id, score in top
+        ])
+    return len(top)
+
+
+def rebuild_leaderboard(job_id=None):
+    """
+    Rebuild the leaderboard from scratch for one job, or for every job with matches.
+    Returns the number of jobs rebuilt.
+    """
+    if job_id is not None:
+        job_ids = [job_id]
+    else:
+        MatchLeaderboardEntry.objects.all().delete()
+        job_ids = list(ResumeMatchScore.objects.order_by().values_list('job_posting_id', flat=True).distinct())
+    for job in job_ids:
+        rebuild_job_leaderboard(job)
+    count = len(job_ids)
+    logger.info(f"Rebuilt match leaderboard for {count} jobs")
+    return count
+
+
+def _apply_job_changes(job_id, scores):
+    """
+    Merge changed match scores ({match_id: score}) into one job's leaderboard.
+    Only touches the job's current entries (at most MATCH_LEADERBOARD_SIZE rows);
+    falls back to a rebuild when an entry's score dropped, since a match off the
+    board may now outrank it.
+    """
+    size = settings.MATCH_LEADERBOARD_SIZE
+    board = {
+        match_id: (entry_id, score)
+        for entry_id, match_id, score in MatchLeaderboardEntry.objects
+        .filter(job_posting_id=job_id).values_list('id', 'match_id', 'matching_score')
+    }
+    if len(board) >= size and any(
+        match_id in board and score < board[match_id][1] for match_id, score in scores.items()
+    ):
+        rebuild_job_leaderboard(job_id)
+        return
+
+    merged = {match_id: score for match_id, (_, score) in board.items()}
+    merged.update(scores)
+    # Ties are broken by match id, as in rebuild_job_leaderboard and get_top_matches
+    keep = set(sorted(merged, key=lambda match_id: (-merged[match_id], match_id))[:size])
+
+    evicted = [entry_id for match_id, (entry_id, _) in board.items() if match_id not in keep]
+    if evicted:
+        MatchLeaderboardEntry.objects.filter(id__in=evicted).delete()
+    for match_id, score in scores.items():
+        if match_id not in keep:
+            continue
+        if match_id in board:
+            if board[match_id][1] != score:
+                MatchLeaderboardEntry.objects.filter(id=board[match_id][0]).update(matching_score=score)
+        else:
+            MatchLeaderboardEntry.objects.create(match_id=match_id, job_posting_id=job_id, matching_score=score)
+
+
+def record_matches(matches):
+    """
+    Update the leaderboard for saved ResumeMatchScore rows, grouped per job.
+    Called from the post_save signal and by bulk writers that bypass signals.
+    """
+    by_job = defaultdict(dict)
+    for match in matches:
+        by_job[match.job_posting_id][match.id] = match.matching_score
+
+    for job_id, scores in by_job.items():
+        try:
+            with transaction.atomic():
+                _apply_job_changes(job_id, scores)
+        except IntegrityError:
+            # A concurrent writer inserted the same entry; recompute this job instead
+            logger.warning(f"Leaderboard conflict for job {job_id}, rebuilding")
+            rebuild_job_leaderboard(job_id)
+
+
+def record_match(match):
+    """Update the leaderboard for a single saved match."""
+    record_matches([match])
+
+
+def remove_match(match):
+    """
+    Refill a job's leaderboard after one of its matches was deleted. The entry itself
+    is removed by the cascade; if the board was full, the best match off the board
+    takes the free slot.
+    """
+    job_id = match.job_posting_id
+    if MatchLeaderboardEntry.objects.filter(job_posting_id=job_id).count() >= settings.MATCH_LEADERBOARD_SIZE:
+        return
+    if ResumeMatchScore.objects.filter(job_posting_id=job_id, leaderboard_entry__isnull=True).exists():
+        rebuild_job_leaderboard(job_id)
+
+
+def get_top_matches(job_id, n):
+    """Return the n best matches for a job, read from its leaderboard."""
+    entries = (
+        MatchLeaderboardEntry.objects.filter(job_posting_id=job_id)
+        .order_by('-matching_score', 'match_id')
+        .select_related('match__job_posting', 'match__candidate_profile')[:n]
+    )
+    return [entry.match for entry in entries]
@@ -0,0 +1,112 @@
+import random
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from candidates_resume.models import CandidateProfile
+from candidates_resume.serializers import CandidateProfileLiteSerializer
+from job_posting.models import JobPosting
+from resume_matcher.models import ResumeMatchScore
+from resume_matcher.serializers import ResumeMatchScoreDetailSerializer
+from resume_analyzer.common.renderers import ORJSONRenderer, MessagePackRenderer, msgpack
+
+SKILLS = ['Python', 'Django', 'JavaScript', 'React', 'SQL', 'AWS', 'Docker', 'Kubernetes', 'Go', 'Java']
+
+
+class Command(BaseCommand):
+    help = "Compare generic vs fast-path serialization and stdlib JSON vs orjson/MessagePack rendering for list payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help="Matches (and resumes) per payload")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement; the best is reported")
+        parser.add_argument('--seed', type=int, default=7)
+
+    def _payload(self, rows, seed):
+        """Unsaved, fully populated instances, so only serialization and rendering are measured."""
+        rng = random.Random(seed)
+        now = timezone.now()
+        jobs = [
+            JobPosting(id=uuid.uuid4(), title=f"Engineer {index}", company=f"Company {index % 50}",
+                       required_skills=rng.sample(SKILLS, 4), created_at=now, updated_at=now)
+            for index in range(max(rows // 20, 1))
+        ]
+        candidates = [
+            CandidateProfile(
+                id=uuid.uuid4(), file_type='pdf', extraction_backend='pdfium', parse_status=CandidateProfile.PARSE_STATUS_PARSED,
+                structured_data={
+                    "name": f"Candidate {index}", "email": f"candidate{index}@example.com",
+                    "skills": rng.sample(SKILLS, 5),
+                    "education": ["BS Computer Science, State University"],
+                    "work_experience": [f"Software Engineer at Company {rng.randint(1, 99)} (2019-2024)"] * 3,
+                },
+                created_at=now, updated_at=now,
+            )
+            for index in range(rows)
+        ]
+        matches = [
+            ResumeMatchScore(
+                id=uuid.uuid4(), job_posting=rng.choice(jobs), candidate_profile=candidate,
+                matching_score=round(rng.uniform(0, 100), 2), is_provisional=False,
+                summary="The candidate's skills align well with the job's requirements and their experience is relevant.",
+                created_at=now, updated_at=now,
+            )
+            for candidate in candidates
+        ]
+        return candidates, matches
+
+    def _best(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        return min(timings), result
+
+    def _generic(self, serializer_class, instances):
+        # The stock ModelSerializer path the fast paths replace, nested serializers included
+        serializer = serializer_class(instances, many=True)
+        child = serializer.child
+
+        def represent(node, instance):
+            data = {}
+            for field in node._readable_fields:
+                attribute = field.get_attribute(instance)
+                if attribute is None:
+                    data[field.field_name] = None
+                elif isinstance(field, serializers.ModelSerializer):
+                    data[field.field_name] = represent(field, attribute)
+                else:
+                    data[field.field_name] = field.to_representation(attribute)
+            return data
+
+        return lambda: [represent(child, instance) for instance in instances]
+
+    def handle(self, *args, **options):
+        candidates, matches = self._payload(options['rows'], options['seed'])
+        repeat = options['repeat']
+        renderers = [('json (stdlib)', JSONRenderer()), ('orjson', ORJSONRenderer())]
+        if msgpack is not None:
+            renderers.append(('msgpack', MessagePackRenderer()))
+
+        for label, serializer_class, instances in (
+            ('resume/all/', CandidateProfileLiteSerializer, candidates),
+            ('match/all/', ResumeMatchScoreDetailSerializer, matches),
+        ):
+            generic_seconds, generic_data = self._best(self._generic(serializer_class, instances), repeat)
+            fast_seconds, fast_data = self._best(lambda: serializer_class(instances, many=True).data, repeat)
+            if JSONRenderer().render(generic_data) != JSONRenderer().render(fast_data):
+                raise CommandError(f"{serializer_class.__name__} fast path output differs from the generic serializer")
+
+            self.stdout.write(f"{label} ({len(instances)} rows)")
+            self.stdout.write(f"  serialize  generic: {generic_seconds * 1000:8.1f} ms   fast path: {fast_seconds * 1000:8.1f} ms")
+            for name, renderer in renderers:
+                seconds, body = self._best(lambda: renderer.render(fast_data), repeat)
+                self.stdout.write(f"  render {name:>14}: {seconds * 1000:8.1f} ms   {len(body) / 1024:8.0f} KiB")
+
+            before = generic_seconds + self._best(lambda: JSONRenderer().render(generic_data), repeat)[0]
+            after = fast_seconds + self._best(lambda: ORJSONRenderer().render(fast_data), repeat)[0]
+            self.stdout.write(self.style.SUCCESS(
+                f"  serialize + render: {before * 1000:.1f} ms -> {after * 1000:.1f} ms ({before / after:.1f}x faster)"
+            ))
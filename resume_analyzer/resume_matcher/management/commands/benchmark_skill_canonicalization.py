@@ -0,0 +1,58 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from resume_analyzer.common.skills import SKILL_ALIASES, canonicalize_skill, canonicalize_skills
+
+# Spelling noise seen in parsed resumes and job postings
+VARIANTS = [
+    lambda skill: skill,
+    lambda skill: skill.lower(),
+    lambda skill: skill.upper(),
+    lambda skill: f" {skill} ",
+    lambda skill: skill.replace('.', ' '),
+    lambda skill: f"{skill} 3",
+    lambda skill: f"{skill} v2.x",
+]
+
+UNKNOWN = ["Underwater Basket Weaving", "COBOL 85", "Quantum Annealing", "Fortran", "Esperanto", "Public Speaking"]
+
+
+class Command(BaseCommand):
+    help = "Benchmark skill alias lookup throughput"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lookups', type=int, default=200000, help="Skill lookups per timed pass")
+        parser.add_argument('--distinct', type=int, default=5000, help="Distinct skill strings in the workload")
+        parser.add_argument('--repeat', type=int, default=3, help="Timed passes (best is reported)")
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        names = [name for canonical, aliases in SKILL_ALIASES.items() for name in [canonical] + aliases] + UNKNOWN
+        vocabulary = list({rng.choice(VARIANTS)(rng.choice(names)) for _ in range(options['distinct'])})
+        workload = [rng.choice(vocabulary) for _ in range(options['lookups'])]
+        canonical = {canonicalize_skill.__wrapped__(skill) for skill in vocabulary}
+        self.stdout.write(
+            f"Workload: {len(workload)} lookups over {len(vocabulary)} distinct strings "
+            f"-> {len(canonical)} canonical skills"
+        )
+
+        for label, lookup in (("uncached", canonicalize_skill.__wrapped__), ("cached", canonicalize_skill)):
+            timings = []
+            for _ in range(options['repeat']):
+                canonicalize_skill.cache_clear()
+                start = time.perf_counter()
+                for skill in workload:
+                    lookup(skill)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            self.stdout.write(f"{label:>9}: {len(workload) / best:,.0f} lookups/s ({best * 1e6 / len(workload):.2f} us/lookup)")
+
+        lists = [workload[index:index + 15] for index in range(0, len(workload), 15)]
+        start = time.perf_counter()
+        for skills in lists:
+            canonicalize_skills(skills)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"canonicalize_skills: {len(lists) / elapsed:,.0f} skill lists/s (15 skills each)"
+        ))
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from candidates_resume.features import apply_features, FEATURE_FIELDS
+from candidates_resume.models import CandidateProfile
+from job_posting.models import JobPosting
+from resume_analyzer.common.skills import canonicalize_skills
+
+
+class Command(BaseCommand):
+    help = "Rewrite stored resume and job posting skills to their canonical names, in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows read and updated per transaction")
+        parser.add_argument('--dry-run', action='store_true', help="Report changes without saving them")
+
+    def _migrate(self, queryset, fields, update_fields, get_skills, set_skills, batch_size, dry_run):
+        """
+        Walk the table in primary-key order (keyset pagination, so progress survives
+        concurrent inserts) and bulk_update the rows whose skills changed.
+        """
+        scanned = changed = 0
+        last_pk = None
+        queryset = queryset.order_by('pk').only('pk', *fields)
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(page[:batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1].pk
+            scanned += len(rows)
+
+            updated = []
+            for row in rows:
+                skills = get_skills(row)
+                if not isinstance(skills, list):
+                    continue
+                canonical = canonicalize_skills(skills)
+                if canonical != skills:
+                    set_skills(row, canonical)
+                    updated.append(row)
+            changed += len(updated)
+            if updated and not dry_run:
+                with transaction.atomic():
+                    queryset.model.objects.bulk_update(updated, update_fields, batch_size=batch_size)
+            self.stdout.write(f"  {queryset.model.__name__}: {scanned} scanned, {changed} changed")
+        return scanned, changed
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        def set_resume_skills(profile, skills):
+            profile.structured_data['skills'] = skills
+            # Keep skill_count in step; bulk_update leaves updated_at alone, so the bucket stays put
+            apply_features(profile, moment=profile.updated_at)
+
+        def set_job_skills(posting, skills):
+            posting.required_skills = skills
+
+        # Updating required_skills fires the search index triggers, so the skill index follows along
+        jobs = self._migrate(
+            JobPosting.objects.all(), ['required_skills'], ['required_skills'],
+            lambda posting: posting.required_skills, set_job_skills, batch_size, dry_run,
+        )
+        resumes = self._migrate(
+            CandidateProfile.objects.all(), ['structured_data', 'extracted_text', 'updated_at'], ['structured_data'] + FEATURE_FIELDS,
+            lambda profile: (profile.structured_data or {}).get('skills') if isinstance(profile.structured_data, dict) else None,
+            set_resume_skills, batch_size, dry_run,
+        )
+
+        verb = "Would update" if dry_run else "Updated"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {jobs[1]} of {jobs[0]} job postings and {resumes[1]} of {resumes[0]} resumes"
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from resume_matcher.leaderboard import rebuild_leaderboard
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-job top-candidates leaderboard from stored match scores"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job-id', help="Only rebuild this job's leaderboard")
+
+    def handle(self, *args, **options):
+        count = rebuild_leaderboard(options['job_id'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt leaderboards for {count} jobs"))
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+from resume_matcher.matrix import plan_run, execute_run
+from resume_matcher.models import ScoringRun
+
+
+class Command(BaseCommand):
+    help = "Score every job against every candidate in checkpointed work units; rerun to resume an interrupted run"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scorer', choices=[choice for choice, _ in ScoringRun.SCORER_CHOICES],
+                            help="local skill overlap, llm (Gemini only) or auto (Gemini with local fallback, the default for new runs)")
+        parser.add_argument('--workers', type=int, default=4, help="Worker processes or threads")
+        parser.add_argument('--executor', choices=['auto', 'process', 'thread'], default='auto',
+                            help="Pool type for local scoring (Gemini scoring always uses threads)")
+        parser.add_argument('--unit-size', type=int, default=200, help="Candidates per work unit when planning")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Scored pairs written per checkpoint")
+        parser.add_argument('--run-id', help="Resume this run instead of the latest unfinished one")
+        parser.add_argument('--new', action='store_true', help="Plan a new run even if an unfinished one exists")
+
+    def _get_run(self, options):
+        if options['run_id']:
+            try:
+                return ScoringRun.objects.get(pk=options['run_id'])
+            except (ScoringRun.DoesNotExist, ValueError):
+                raise CommandError(f"Scoring run {options['run_id']} not found")
+        if not options['new']:
+            run = ScoringRun.objects.filter(completed_at__isnull=True).first()
+            if run is not None:
+                return run
+        run = plan_run(options['scorer'] or ScoringRun.SCORER_AUTO, options['unit_size'])
+        self.stdout.write(f"Planned run {run.id}: {run.total_pairs} pairs in {run.total_units} units")
+        return run
+
+    def handle(self, *args, **options):
+        run = self._get_run(options)
+        if run.completed_at is not None:
+            self.stdout.write(self.style.SUCCESS(f"Run {run.id} already completed"))
+            return
+        if options['scorer'] and options['scorer'] != run.scorer:
+            raise CommandError(f"Run {run.id} uses the {run.scorer} scorer; pass --new to plan a run with {options['scorer']}")
+
+        already_scored = run.scored_pairs
+        remaining = max(run.total_pairs - already_scored, 0)
+        self.stdout.write(f"Scoring run {run.id} ({run.scorer}): {already_scored} of {run.total_pairs} pairs scored, {remaining} to go")
+
+        def progress(scored, failed, elapsed):
+            rate = (scored + failed) / elapsed if elapsed else 0.0
+            eta = max(remaining - scored - failed, 0) / rate if rate else float('inf')
+            self.stdout.write(
+                f"  {already_scored + scored}/{run.total_pairs} pairs scored ({failed} failed this session), "
+                f"{rate:.1f} pairs/s, ETA {eta / 60:.1f} min"
+            )
+
+        try:
+            finished = execute_run(run, options['workers'], options['executor'], options['batch_size'], progress)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING(f"Interrupted; rerun the command to resume run {run.id}"))
+            return
+
+        run.refresh_from_db()
+        if finished:
+            self.stdout.write(self.style.SUCCESS(f"Run {run.id} completed: {run.scored_pairs} pairs scored"))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"Run {run.id} stopped with {run.failed_pairs} failed pairs; rerun the command to retry them"
+            ))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from candidates_resume.utils import upgrade_pending_profiles
+from resume_matcher.utils import upgrade_provisional_matches
+
+
+class Command(BaseCommand):
+    help = "Re-parse pending resumes and re-score provisional matches with Gemini"
+
+    def handle(self, *args, **options):
+        profiles = upgrade_pending_profiles()
+        matches = upgrade_provisional_matches()
+        self.stdout.write(self.style.SUCCESS(f"Upgraded {profiles} pending profiles and {matches} provisional matches"))
@@ -0,0 +1,247 @@
+import logging
+import signal
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+import requests
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from candidates_resume.models import CandidateProfile
+from job_posting.models import JobPosting
+from resume_analyzer import settings
+from resume_analyzer.common.gemini import circuit_breaker, PRIORITY_BULK
+from .models import ResumeMatchScore, ScoringRun, ScoringWorkUnit
+from .leaderboard import record_matches
+from .utils import score_match_with_gemini, compute_skill_overlap_score
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+# Candidate fields a scorer needs; extracted_text is only read by the local scorer's text fallback
+CANDIDATE_FIELDS = ('id', 'structured_data', 'extracted_text', 'parse_status')
+
+
+def _candidates():
+    """Candidates the matrix covers: near-duplicates are left out when they reuse their canonical score."""
+    queryset = CandidateProfile.objects.all()
+    if settings.MATCH_SKIP_DUPLICATES:
+        queryset = queryset.filter(duplicate_of__isnull=True)
+    return queryset.order_by('pk')
+
+
+def plan_run(scorer, unit_size=200):
+    """
+    Create a ScoringRun with one work unit per (job, range of `unit_size` candidates)
+    that still has unscored pairs. Candidates are split on primary-key boundaries, so
+    a unit is stored as two ids rather than a list of pairs.
+    """
+    candidate_ids = list(_candidates().values_list('pk', flat=True))
+    ranges = [
+        (candidate_ids[index], candidate_ids[min(index + unit_size, len(candidate_ids)) - 1])
+        for index in range(0, len(candidate_ids), unit_size)
+    ]
+    starts = [start for start, _ in ranges]
+
+    # Already scored pairs per (job, range), from one pass over the match table
+    scored = defaultdict(int)
+    candidate_set = set(candidate_ids)
+    for job_id, candidate_id in ResumeMatchScore.objects.order_by().values_list('job_posting_id', 'candidate_profile_id').iterator():
+        if candidate_id in candidate_set:
+            scored[(job_id, bisect_right(starts, candidate_id) - 1)] += 1
+
+    run = ScoringRun.objects.create(scorer=scorer)
+    units = []
+    total_pairs = 0
+    for job_id in JobPosting.objects.order_by('pk').values_list('pk', flat=True):
+        for position, (start, end) in enumerate(ranges):
+            size = min(unit_size, len(candidate_ids) - position * unit_size)
+            missing = size - scored[(job_id, position)]
+            if missing <= 0:
+                continue
+            units.append(ScoringWorkUnit(
+                run=run, job_posting_id=job_id, candidate_start=start, candidate_end=end, planned_pairs=missing,
+            ))
+            total_pairs += missing
+    with transaction.atomic():
+        ScoringWorkUnit.objects.bulk_create(units, batch_size=1000)
+        run.total_units = len(units)
+        run.total_pairs = total_pairs
+        run.save(update_fields=['total_units', 'total_pairs', 'updated_at'])
+    logger.info(f"Planned scoring run {run.id}: {total_pairs} pairs in {len(units)} units")
+    return run
+
+
+def load_unit(unit):
+    """The unit's job and its candidates that still have no stored match for that job."""
+    job_posting = JobPosting.objects.get(pk=unit.job_posting_id)
+    candidates = list(
+        _candidates().filter(pk__gte=unit.candidate_start, pk__lte=unit.candidate_end)
+        .exclude(matches__job_posting_id=unit.job_posting_id)
+        .only(*CANDIDATE_FIELDS)
+    )
+    return job_posting, candidates
+
+
+def _ignore_interrupt():
+    # Ctrl+C is handled by the parent, which checkpoints finished units and stops the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def score_unit(scorer, job_posting, candidates):
+    """
+    Score one job against a list of candidates without touching the database, so it can
+    run in a worker process or thread. Returns (results, failed) where results are
+    (candidate_id, score, summary, is_provisional) tuples. Local-run scores are final;
+    only the auto scorer's fallbacks are provisional, so only those are re-scored with
+    Gemini when the circuit closes or the match is viewed.
+    """
+    results = []
+    failed = 0
+    for candidate in candidates:
+        if scorer == ScoringRun.SCORER_LOCAL:
+            score, summary = compute_skill_overlap_score(job_posting, candidate, provisional=False)
+            results.append((candidate.id, score, summary, False))
+            continue
+        provisional = candidate.parse_status == CandidateProfile.PARSE_STATUS_PENDING
+        if not provisional:
+            try:
+                score, summary = score_match_with_gemini(job_posting, candidate, priority=PRIORITY_BULK)
+            except requests.RequestException as e:
+                if scorer == ScoringRun.SCORER_LLM:
+                    failed += 1
+                    continue
+                logger.warning(f"Gemini unavailable, using local score for job {job_posting.id} and candidate {candidate.id}: {str(e)}")
+                provisional = True
+            except (ValueError, KeyError) as e:
+                logger.error(f"Failed to score job {job_posting.id} and candidate {candidate.id}: {str(e)}")
+                failed += 1
+                continue
+        if provisional:
+            if scorer == ScoringRun.SCORER_LLM:
+                # Resume not parsed yet; leave the pair for a later run rather than store a local score
+                failed += 1
+                continue
+            score, summary = compute_skill_overlap_score(job_posting, candidate)
+        results.append((candidate.id, score, summary, provisional))
+    return results, failed
+
+
+def write_results(run, completed, batch_size=1000):
+    """
+    Checkpoint finished units: bulk_create their matches and mark them done in one
+    transaction, then update the leaderboard (bulk_create does not send post_save).
+    `completed` is a list of (unit, results, failed).
+    """
+    matches = []
+    for unit, results, _ in completed:
+        matches.extend(
+            ResumeMatchScore(
+                job_posting_id=unit.job_posting_id, candidate_profile_id=candidate_id,
+                matching_score=score, summary=summary, is_provisional=is_provisional,
+            )
+            for candidate_id, score, summary, is_provisional in results
+        )
+
+    now = timezone.now()
+    scored = sum(len(results) for _, results, _ in completed)
+    failed = sum(unit_failed for _, _, unit_failed in completed)
+    # A retried unit's earlier failures are replaced by this attempt's
+    failed_delta = failed - sum(unit.failed_pairs for unit, _, _ in completed)
+    with transaction.atomic():
+        # A pair scored through the API meanwhile keeps its existing row
+        ResumeMatchScore.objects.bulk_create(matches, batch_size=batch_size, ignore_conflicts=True)
+        for unit, results, unit_failed in completed:
+            unit.scored_pairs = len(results)
+            unit.failed_pairs = unit_failed
+            unit.status = ScoringWorkUnit.STATUS_FAILED if unit_failed else ScoringWorkUnit.STATUS_DONE
+            unit.completed_at = now
+        ScoringWorkUnit.objects.bulk_update(
+            [unit for unit, _, _ in completed], ['scored_pairs', 'failed_pairs', 'status', 'completed_at']
+        )
+        ScoringRun.objects.filter(pk=run.pk).update(
+            scored_pairs=F('scored_pairs') + scored, failed_pairs=F('failed_pairs') + failed_delta, updated_at=now,
+        )
+
+    # ignore_conflicts leaves skipped rows unsaved; only the inserted ones go on the leaderboard
+    saved = ResumeMatchScore.objects.filter(id__in=[match.id for match in matches]).only('id', 'job_posting_id', 'matching_score')
+    record_matches(list(saved))
+    return scored, failed
+
+
+def execute_run(run, workers=4, executor='auto', batch_size=1000, progress=None):
+    """
+    Score a run's unfinished units in a worker pool and checkpoint them in batches of
+    about `batch_size` pairs. Local scoring is CPU-bound and defaults to processes;
+    Gemini scoring always uses threads so every call goes through this process's
+    shared scheduler and circuit breaker. `progress(scored, failed, elapsed)` is
+    called after each checkpoint. Returns True when every unit has finished.
+    """
+    if run.scorer != ScoringRun.SCORER_LOCAL or executor == 'thread':
+        pool = ThreadPoolExecutor(max_workers=workers)
+    else:
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_ignore_interrupt)
+
+    # Failed units are retried; they only re-score pairs that are still missing
+    pending = iter(list(run.units.exclude(status=ScoringWorkUnit.STATUS_DONE).order_by('pk')))
+    in_flight = {}
+    completed = []
+    buffered = scored = failed = 0
+    start = time.monotonic()
+    stopped = False
+
+    def checkpoint():
+        nonlocal completed, buffered, scored, failed
+        if not completed:
+            return
+        unit_scored, unit_failed = write_results(run, completed, batch_size)
+        scored += unit_scored
+        failed += unit_failed
+        completed, buffered = [], 0
+        if progress:
+            progress(scored, failed, time.monotonic() - start)
+
+    def submit():
+        for unit in pending:
+            job_posting, candidates = load_unit(unit)
+            in_flight[pool.submit(score_unit, run.scorer, job_posting, candidates)] = unit
+            return True
+        return False
+
+    try:
+        while len(in_flight) < workers * 2 and submit():
+            pass
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                unit = in_flight.pop(future)
+                results, unit_failed = future.result()
+                completed.append((unit, results, unit_failed))
+                buffered += len(results) + unit_failed
+            if buffered >= batch_size:
+                checkpoint()
+            if run.scorer == ScoringRun.SCORER_LLM and not circuit_breaker.is_closed():
+                # Every further call would fail fast; keep the remaining units for a resumed run
+                if not stopped:
+                    logger.warning(f"Gemini circuit open, pausing scoring run {run.id}")
+                stopped = True
+                continue
+            while len(in_flight) < workers * 2 and submit():
+                pass
+    finally:
+        # On interrupt, units still in flight stay pending and are redone on resume
+        for future in in_flight:
+            future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+        checkpoint()
+
+    run.refresh_from_db()
+    finished = not run.units.exclude(status=ScoringWorkUnit.STATUS_DONE).exists()
+    if finished and run.completed_at is None:
+        run.completed_at = timezone.now()
+        run.save(update_fields=['completed_at', 'updated_at'])
+    logger.info(f"Scoring run {run.id}: {scored} pairs scored, {failed} failed in this session")
+    return finished
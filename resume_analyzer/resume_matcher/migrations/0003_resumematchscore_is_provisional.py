@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_matcher', '0002_resumematchscore_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumematchscore',
+            name='is_provisional',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
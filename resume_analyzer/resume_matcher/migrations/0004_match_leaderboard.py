@@ -0,0 +1,42 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_leaderboard(apps, schema_editor):
+    ResumeMatchScore = apps.get_model('resume_matcher', 'ResumeMatchScore')
+    MatchLeaderboardEntry = apps.get_model('resume_matcher', 'MatchLeaderboardEntry')
+
+    job_ids = ResumeMatchScore.objects.order_by().values_list('job_posting_id', flat=True).distinct()
+    for job_id in list(job_ids):
+        top = ResumeMatchScore.objects.filter(job_posting_id=job_id).order_by('-matching_score')
+        MatchLeaderboardEntry.objects.bulk_create([
+            MatchLeaderboardEntry(match_id=match_id, job_posting_id=job_id, matching_score=score)
+            for match_id, score in top.values_list('id', 'matching_score')[:settings.MATCH_LEADERBOARD_SIZE]
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_posting', '0002_job_search_index'),
+        ('resume_matcher', '0003_resumematchscore_is_provisional'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchLeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('matching_score', models.FloatField()),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard', to='job_posting.jobposting')),
+                ('match', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entry', to='resume_matcher.resumematchscore')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job_posting', '-matching_score'], name='resume_matc_job_pos_978c7e_idx')],
+            },
+        ),
+        migrations.RunPython(populate_leaderboard, migrations.RunPython.noop),
+    ]
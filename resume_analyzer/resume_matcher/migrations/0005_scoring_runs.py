@@ -0,0 +1,51 @@
+# Generated by Django 5.1.7 on 2026-10-19 17:34
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_posting', '0002_job_search_index'),
+        ('resume_matcher', '0004_match_leaderboard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoringRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('scorer', models.CharField(choices=[('local', 'Local skill overlap'), ('llm', 'Gemini'), ('auto', 'Gemini, local fallback')], max_length=10)),
+                ('total_units', models.PositiveIntegerField(default=0)),
+                ('total_pairs', models.PositiveBigIntegerField(default=0)),
+                ('scored_pairs', models.PositiveBigIntegerField(default=0)),
+                ('failed_pairs', models.PositiveBigIntegerField(default=0)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ScoringWorkUnit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('candidate_start', models.UUIDField()),
+                ('candidate_end', models.UUIDField()),
+                ('planned_pairs', models.PositiveIntegerField()),
+                ('scored_pairs', models.PositiveIntegerField(default=0)),
+                ('failed_pairs', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scoring_units', to='job_posting.jobposting')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='units', to='resume_matcher.scoringrun')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['run', 'status'], name='resume_matc_run_id_c8168a_idx')],
+            },
+        ),
+    ]
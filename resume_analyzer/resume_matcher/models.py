@@ -9,6 +9,7 @@ class ResumeMatchScore(models.Model):
     candidate_profile = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name='matches')
     matching_score = models.FloatField()
     summary = models.TextField(blank=True, null=True)
+    is_provisional = models.BooleanField(default=False, db_index=True)  # Local fallback score awaiting Gemini
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -20,4 +21,84 @@ class ResumeMatchScore(models.Model):
         ordering = ['-matching_score']
 
     def __str__(self):
-        return f"Match: {self.job_posting.title} - {self.candidate_profile.id} ({self.matching_score}%)"
\ No newline at end of file
+        return f"Match: {self.job_posting.title} - {self.candidate_profile.id} ({self.matching_score}%)"
+
+class MatchLeaderboardEntry(models.Model):
+    """
+    Top MATCH_LEADERBOARD_SIZE matches per job, maintained incrementally from
+    ResumeMatchScore saves and deletes (see resume_matcher/leaderboard.py).
+    """
+    match = models.OneToOneField(ResumeMatchScore, on_delete=models.CASCADE, related_name='leaderboard_entry')
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='leaderboard')
+    matching_score = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['job_posting', '-matching_score']),
+        ]
+
+    def __str__(self):
+        return f"Leaderboard: {self.job_posting_id} - {self.match_id} ({self.matching_score}%)"
+
+class ScoringRun(models.Model):
+    """
+    A jobs x candidates scoring run (manage.py score_matrix). Missing pairs are planned
+    into ScoringWorkUnits up front; completed units are checkpointed, so an interrupted
+    run resumes where it stopped.
+    """
+    SCORER_LOCAL = 'local'
+    SCORER_LLM = 'llm'
+    SCORER_AUTO = 'auto'
+    SCORER_CHOICES = [
+        (SCORER_LOCAL, 'Local skill overlap'),
+        (SCORER_LLM, 'Gemini'),
+        (SCORER_AUTO, 'Gemini, local fallback'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    scorer = models.CharField(max_length=10, choices=SCORER_CHOICES)
+    total_units = models.PositiveIntegerField(default=0)
+    total_pairs = models.PositiveBigIntegerField(default=0)
+    scored_pairs = models.PositiveBigIntegerField(default=0)
+    failed_pairs = models.PositiveBigIntegerField(default=0)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Scoring run {self.id} ({self.scored_pairs}/{self.total_pairs})"
+
+class ScoringWorkUnit(models.Model):
+    """
+    One job against a contiguous primary-key range of candidates. Only pairs without
+    a stored match are scored, so re-running a unit never duplicates work.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    run = models.ForeignKey(ScoringRun, on_delete=models.CASCADE, related_name='units')
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='scoring_units')
+    candidate_start = models.UUIDField()  # First candidate pk in the range (inclusive)
+    candidate_end = models.UUIDField()  # Last candidate pk in the range (inclusive)
+    planned_pairs = models.PositiveIntegerField()
+    scored_pairs = models.PositiveIntegerField(default=0)
+    failed_pairs = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['run', 'status']),
+        ]
+
+    def __str__(self):
+        return f"Unit {self.id}: job {self.job_posting_id} ({self.status})"
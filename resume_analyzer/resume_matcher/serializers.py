@@ -2,6 +2,7 @@ from rest_framework import serializers
 from .models import ResumeMatchScore
 from job_posting.serializers import JobPostingSerializer
 from candidates_resume.serializers import CandidateProfileLiteSerializer
+from resume_analyzer.common.serializers import FastRepresentationMixin
 
 class ResumeMatchScoreSerializer(serializers.ModelSerializer):
     job_posting_id = serializers.UUIDField(source='job_posting.id')
@@ -9,12 +10,27 @@ class ResumeMatchScoreSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ResumeMatchScore
-        fields = ['id', 'job_posting_id', 'candidate_profile_id', 'matching_score', 'summary', 'created_at', 'updated_at']
+        fields = ['id', 'job_posting_id', 'candidate_profile_id', 'matching_score', 'summary', 'is_provisional', 'created_at', 'updated_at']
 
-class ResumeMatchScoreDetailSerializer(serializers.ModelSerializer):
+class ResumeMatchScoreDetailSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     job_posting = JobPostingSerializer()  # Job details
     candidate_profile = CandidateProfileLiteSerializer()  # Candidate details
 
     class Meta:
         model = ResumeMatchScore
-        fields = ['id', 'job_posting', 'candidate_profile', 'matching_score', 'summary', 'created_at', 'updated_at']
\ No newline at end of file
+        fields = ['id', 'job_posting', 'candidate_profile', 'matching_score', 'summary', 'is_provisional', 'created_at', 'updated_at']
+
+    def to_representation(self, instance):
+        # Read-only fast path for match listings: skips per-field dispatch, nested
+        # serializers use their own fast paths. Keep in sync with Meta.fields.
+        fields = self.fields
+        return {
+            'id': str(instance.id),
+            'job_posting': fields['job_posting'].to_representation(instance.job_posting),
+            'candidate_profile': fields['candidate_profile'].to_representation(instance.candidate_profile),
+            'matching_score': instance.matching_score,
+            'summary': instance.summary,
+            'is_provisional': instance.is_provisional,
+            'created_at': self.format_datetime(instance.created_at),
+            'updated_at': self.format_datetime(instance.updated_at),
+        }
\ No newline at end of file
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import ResumeMatchScore
+from .leaderboard import record_match, remove_match
+
+
+@receiver(post_save, sender=ResumeMatchScore)
+def update_leaderboard_on_save(sender, instance, **kwargs):
+    """Keep the per-job leaderboard in step with every score insert or update."""
+    record_match(instance)
+
+
+@receiver(post_delete, sender=ResumeMatchScore)
+def update_leaderboard_on_delete(sender, instance, **kwargs):
+    """Refill the job's leaderboard when a match on it is deleted."""
+    remove_match(instance)
@@ -1,3 +1,281 @@
-from django.test import TestCase
+import json
+from unittest import mock
+import requests
+from django.test import SimpleTestCase, TestCase
+from candidates_resume.models import CandidateProfile
+from job_posting.models import JobPosting
+from .models import ResumeMatchScore, MatchLeaderboardEntry, ScoringRun, ScoringWorkUnit
+from .matrix import plan_run, execute_run
+from .leaderboard import get_top_matches, rebuild_job_leaderboard, record_matches
+from .utils import get_or_score_match, compute_skill_overlap_score, MatchStreamParser
+from resume_analyzer import settings
 
-# Create your tests here.
+
+def _candidate(skills, **fields):
+    return CandidateProfile.objects.create(
+        extracted_text="Skills: " + ", ".join(skills), structured_data={"skills": skills}, file_type='txt', **fields
+    )
+
+
+class GetOrScoreMatchTests(TestCase):
+    def setUp(self):
+        self.job = JobPosting.objects.create(title="Backend Engineer", company="Acme", required_skills=["Python", "Django"])
+        self.canonical = _candidate(["Python", "Django"])
+        self.duplicate = _candidate(["Python", "Django"], duplicate_of=self.canonical)
+        patcher = mock.patch('resume_matcher.utils.score_match_with_gemini', return_value=(88.0, "Strong match"))
+        self.score_match = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_duplicate_reuses_canonical_score(self):
+        with mock.patch.object(settings, 'MATCH_SKIP_DUPLICATES', True):
+            match = get_or_score_match(self.job, self.duplicate)
+        self.assertEqual((match.matching_score, match.summary, match.is_provisional), (88.0, "Strong match", False))
+        self.assertEqual(self.score_match.call_count, 1)
+        self.assertEqual(self.score_match.call_args.args[1], self.canonical)
+        self.assertEqual(ResumeMatchScore.objects.filter(job_posting=self.job).count(), 2)
+
+    def test_duplicate_is_scored_itself_without_skip(self):
+        with mock.patch.object(settings, 'MATCH_SKIP_DUPLICATES', False):
+            get_or_score_match(self.job, self.duplicate)
+        self.assertEqual(self.score_match.call_args.args[1], self.duplicate)
+        self.assertFalse(ResumeMatchScore.objects.filter(candidate_profile=self.canonical).exists())
+
+    def test_stored_score_is_reused(self):
+        first = get_or_score_match(self.job, self.canonical)
+        self.assertEqual(get_or_score_match(self.job, self.canonical).id, first.id)
+        self.assertEqual(self.score_match.call_count, 1)
+
+    def test_provisional_score_while_gemini_is_unavailable(self):
+        self.score_match.side_effect = requests.RequestException("circuit open")
+        with mock.patch('resume_matcher.utils.circuit_breaker.is_closed', return_value=False):
+            match = get_or_score_match(self.job, self.canonical)
+            self.assertTrue(match.is_provisional)
+            self.assertEqual(match.matching_score, 100.0)
+            # Not retried until the circuit closes
+            get_or_score_match(self.job, self.canonical)
+            self.assertEqual(self.score_match.call_count, 1)
+
+        self.score_match.side_effect = None
+        match = get_or_score_match(self.job, self.canonical)
+        self.assertEqual((match.matching_score, match.is_provisional), (88.0, False))
+
+    def test_pending_parse_is_scored_locally(self):
+        pending = _candidate(["Python"], parse_status=CandidateProfile.PARSE_STATUS_PENDING)
+        match = get_or_score_match(self.job, pending)
+        self.assertEqual((match.matching_score, match.is_provisional), (50.0, True))
+        self.score_match.assert_not_called()
+
+
+class SkillOverlapScoreTests(SimpleTestCase):
+    def test_aliases_text_and_malformed_skills(self):
+        job = JobPosting(title="Backend Engineer", company="Acme", required_skills=["JavaScript", "Docker", "SQL", 3])
+        candidate = CandidateProfile(
+            extracted_text="Shipped services in Docker containers.",
+            structured_data={"skills": ["JS", {"name": "SQL"}, None, 3]},
+        )
+        score, summary = compute_skill_overlap_score(job, candidate)
+        self.assertEqual(score, 75.0)
+        self.assertIn("3 of 4 required skills found (JavaScript, Docker, 3). Missing: SQL.", summary)
+
+
+class ScoringMatrixTests(TestCase):
+    def setUp(self):
+        self.jobs = [
+            JobPosting.objects.create(title="Backend Engineer", company="Acme", required_skills=["Python", "Django"]),
+            JobPosting.objects.create(title="Data Engineer", company="Acme", required_skills=["SQL"]),
+        ]
+        self.candidates = [_candidate(["Python"]), _candidate(["SQL", "Django"]), _candidate(["Python", "SQL"])]
+
+    def test_plan_run_skips_scored_pairs(self):
+        # Ranges split on primary key order: the last candidate is alone in the second range
+        last = max(self.candidates, key=lambda candidate: candidate.pk)
+        ResumeMatchScore.objects.create(job_posting=self.jobs[0], candidate_profile=last, matching_score=10.0)
+        run = plan_run(ScoringRun.SCORER_LOCAL, unit_size=2)
+        self.assertEqual((run.total_units, run.total_pairs), (3, 5))
+        self.assertEqual(sorted(run.units.values_list('planned_pairs', flat=True)), [1, 2, 2])
+
+    def test_interrupted_run_resumes_from_checkpoint(self):
+        run = plan_run(ScoringRun.SCORER_LOCAL, unit_size=2)
+
+        def interrupt(scored, failed, elapsed):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            execute_run(run, workers=1, executor='thread', batch_size=1, progress=interrupt)
+        run.refresh_from_db()
+        done = run.units.filter(status=ScoringWorkUnit.STATUS_DONE).count()
+        self.assertTrue(0 < done < run.total_units)
+        self.assertEqual(run.scored_pairs, ResumeMatchScore.objects.count())
+        self.assertIsNone(run.completed_at)
+
+        self.assertTrue(execute_run(run, workers=2, executor='thread'))
+        run.refresh_from_db()
+        self.assertEqual(run.scored_pairs, 6)
+        self.assertIsNotNone(run.completed_at)
+        self.assertEqual(ResumeMatchScore.objects.count(), 6)
+        self.assertFalse(ResumeMatchScore.objects.filter(is_provisional=True).exists())
+        self.assertEqual(
+            ResumeMatchScore.objects.get(job_posting=self.jobs[0], candidate_profile=self.candidates[1]).matching_score, 50.0
+        )
+        self.assertEqual(plan_run(ScoringRun.SCORER_LOCAL, unit_size=2).total_units, 0)
+
+    @mock.patch('resume_matcher.matrix.score_match_with_gemini')
+    def test_llm_run_leaves_failed_pairs_for_a_later_run(self, score_match):
+        def flaky(job_posting, candidate, priority):
+            if candidate.id == self.candidates[0].id:
+                raise requests.RequestException("timeout")
+            return 75.0, "Good match"
+
+        score_match.side_effect = flaky
+        run = plan_run(ScoringRun.SCORER_LLM, unit_size=3)
+        with mock.patch('resume_matcher.matrix.circuit_breaker.is_closed', return_value=True):
+            self.assertFalse(execute_run(run, workers=1, executor='thread'))
+            run.refresh_from_db()
+            self.assertEqual((run.scored_pairs, run.failed_pairs), (4, 2))
+
+            score_match.side_effect = None
+            score_match.return_value = (60.0, "Fair match")
+            self.assertTrue(execute_run(run, workers=1, executor='thread'))
+        run.refresh_from_db()
+        self.assertEqual((run.scored_pairs, run.failed_pairs), (6, 0))
+        self.assertEqual(ResumeMatchScore.objects.filter(matching_score=60.0).count(), 2)
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(settings, 'MATCH_LEADERBOARD_SIZE', 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.job = JobPosting.objects.create(title="Backend Engineer", company="Acme", required_skills=["Python"])
+
+    def _match(self, score):
+        return ResumeMatchScore.objects.create(job_posting=self.job, candidate_profile=_candidate(["Python"]), matching_score=score)
+
+    def _board(self):
+        return sorted(
+            MatchLeaderboardEntry.objects.filter(job_posting=self.job).values_list('match_id', 'matching_score'),
+            key=lambda entry: entry[1], reverse=True,
+        )
+
+    def test_lowest_entry_is_evicted_when_full(self):
+        low, high = self._match(40.0), self._match(90.0)
+        self.assertEqual(self._board(), [(high.id, 90.0), (low.id, 40.0)])
+        middle = self._match(60.0)
+        self.assertEqual(self._board(), [(high.id, 90.0), (middle.id, 60.0)])
+        # Scoring below the board leaves it alone
+        self._match(10.0)
+        self.assertEqual(self._board(), [(high.id, 90.0), (middle.id, 60.0)])
+
+    def test_score_drop_on_full_board_promotes_off_board_match(self):
+        high, middle, low = self._match(90.0), self._match(60.0), self._match(40.0)
+        with mock.patch('resume_matcher.leaderboard.rebuild_job_leaderboard', wraps=rebuild_job_leaderboard) as rebuild:
+            high.matching_score = 20.0
+            high.save()
+        rebuild.assert_called_once_with(self.job.id)
+        self.assertEqual(self._board(), [(middle.id, 60.0), (low.id, 40.0)])
+
+    def test_bulk_scores_are_merged_per_job(self):
+        first, second = self._match(50.0), self._match(55.0)
+        # bulk_create sends no post_save, so bulk writers record the matches themselves
+        bulk = ResumeMatchScore.objects.bulk_create([
+            ResumeMatchScore(job_posting=self.job, candidate_profile=_candidate(["Python"]), matching_score=score)
+            for score in (70.0, 30.0)
+        ])
+        record_matches(bulk)
+        self.assertEqual(self._board(), [(bulk[0].id, 70.0), (second.id, 55.0)])
+        self.assertFalse(MatchLeaderboardEntry.objects.filter(match_id=first.id).exists())
+
+    def test_delete_refills_from_off_board_matches(self):
+        high, middle, low = self._match(90.0), self._match(60.0), self._match(40.0)
+        high.delete()
+        self.assertEqual(self._board(), [(middle.id, 60.0), (low.id, 40.0)])
+        middle.delete()
+        self.assertEqual(self._board(), [(low.id, 40.0)])
+
+    def test_ties_are_ordered_by_match_id(self):
+        matches = [self._match(75.0) for _ in range(3)]
+        expected = sorted(match.id for match in matches)[:2]
+        self.assertEqual([match.id for match in get_top_matches(self.job.id, 2)], expected)
+        rebuild_job_leaderboard(self.job.id)
+        self.assertEqual([match.id for match in get_top_matches(self.job.id, 2)], expected)
+
+
+class MatchStreamParserTests(SimpleTestCase):
+    def _parse(self, chunks):
+        parser = MatchStreamParser()
+        fed = [parser.feed(chunk) for chunk in chunks]
+        return fed, parser.finish()
+
+    def test_labels_split_across_chunks(self):
+        fed, (events, score, summary) = self._parse(["SCO", "RE: 7", "2.5\nSUMM", "ARY: Good ", "fit."])
+        # Nothing is emitted until the score line is complete, and the label is never leaked
+        self.assertEqual(fed, [
+            [], [], [('score', {'score': 72.5})], [('summary', {'text': 'Good '})], [('summary', {'text': 'fit.'})],
+        ])
+        self.assertEqual((events, score, summary), ([], 72.5, "Good fit."))
+
+    def test_summary_without_label(self):
+        fed, (_, score, summary) = self._parse(["**Score:** 60\n", "Decent overlap in backend skills."])
+        self.assertEqual(fed[0], [('score', {'score': 60.0})])
+        self.assertEqual((score, summary), (60.0, "Decent overlap in backend skills."))
+
+    def test_score_only_answer(self):
+        self.assertEqual(self._parse(["SCORE: 70"])[1], ([('score', {'score': 70.0})], 70.0, ""))
+
+    def test_json_answer_falls_back_to_regular_parsing(self):
+        fed, result = self._parse(['```json\n{"score": 55, ', '"summary": "Partial match"}\n```'])
+        self.assertEqual(fed, [[], []])
+        self.assertEqual(result, ([('score', {'score': 55.0}), ('summary', {'text': "Partial match"})], 55.0, "Partial match"))
+
+    def test_long_preamble_is_treated_as_unstructured(self):
+        parser = MatchStreamParser()
+        self.assertEqual(parser.feed("x" * (MatchStreamParser.max_score_line + 1)), [])
+        self.assertEqual(parser.feed("\nSCORE: 50\nSUMMARY: late"), [])
+        with self.assertRaises(ValueError):
+            parser.finish()
+
+    def test_missing_score_raises(self):
+        parser = MatchStreamParser()
+        parser.feed("SUMMARY: no score here")
+        with self.assertRaises(ValueError):
+            parser.finish()
+
+
+class StreamMatchingScoreTests(TestCase):
+    def setUp(self):
+        self.job = JobPosting.objects.create(title="Backend Engineer", company="Acme", required_skills=["Python", "Django"])
+        self.candidate = _candidate(["Python", "Django"])
+
+    def _events(self, response):
+        body = b"".join(response.streaming_content).decode('utf-8')
+        events = []
+        for block in body.strip().split("\n\n"):
+            event, data = block.split("\n", 1)
+            events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+        return events
+
+    @mock.patch('resume_matcher.views.stream_generate_content')
+    def test_event_source_clients_get_the_stream(self, stream):
+        stream.return_value = iter(["SCORE: 8", "1\nSUMMARY: Strong ", "Django background."])
+        response = self.client.get(
+            f'/api/match/{self.job.id}/{self.candidate.id}/stream/', HTTP_ACCEPT='text/event-stream'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = self._events(response)
+
+        self.assertEqual(events[0], ('score', {'score': 81.0}))
+        summary = "".join(data['text'] for event, data in events if event == 'summary')
+        self.assertEqual(summary.strip(), "Strong Django background.")
+        self.assertEqual(events[-1][0], 'done')
+        self.assertEqual(events[-1][1]['matching_score'], 81.0)
+
+        match = ResumeMatchScore.objects.get(job_posting=self.job, candidate_profile=self.candidate)
+        self.assertEqual((match.matching_score, match.summary, match.is_provisional), (81.0, "Strong Django background.", False))
+
+    def test_errors_are_sent_as_an_event(self):
+        response = self.client.get(
+            f'/api/match/{self.job.id}/{self.job.id}/stream/', HTTP_ACCEPT='text/event-stream'
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(response.content.startswith(b"event: error\ndata: "))
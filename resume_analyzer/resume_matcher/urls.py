@@ -2,6 +2,10 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
+    path('match/<uuid:job_id>/top/', views.get_top_candidates, name='get_top_candidates'),
     path('match/<uuid:job_id>/<uuid:candidate_id>/', views.get_matching_score, name='get_matching_score'),
+    path('match/<uuid:job_id>/<uuid:candidate_id>/stream/', views.stream_matching_score, name='stream_matching_score'),
     path('match/all/', views.get_all_matches, name='get_all_matches'),
+    path('resume/<uuid:candidate_id>/jobs/', views.recommend_jobs, name='recommend_jobs'),
+    path('export/matches/', views.export_matches, name='export_matches'),
 ]
\ No newline at end of file
@@ -0,0 +1,293 @@
+import logging
+import requests
+import json
+import re
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from .models import ResumeMatchScore
+from candidates_resume.models import CandidateProfile
+from candidates_resume.utils import upgrade_pending_profiles
+from resume_analyzer import settings
+from resume_analyzer.common.gemini import generate_content, discard_cached_content, circuit_breaker, PRIORITY_INTERACTIVE, PRIORITY_BULK
+from resume_analyzer.common.llm_cache import OPERATION_SCORE_MATCH
+from resume_analyzer.common.skills import canonicalize_skill, canonicalize_skills, skill_key
+from resume_analyzer.common.log import truncate_for_log
+
+# Initialize logger for job posting operations
+logger = logging.getLogger('job_posting')
+
+
+def build_match_prompt(job_posting, candidate_profile):
+    """
+    Build the Gemini prompt asking for a matching score and summary
+    between a job posting and a parsed resume.
+    """
+    job_data = {
+        "title": job_posting.title,
+        "company": job_posting.company,
+        "required_skills": job_posting.required_skills
+    }
+    resume_data = candidate_profile.structured_data
+
+    return (
+        f"Calculate a matching score (0-100) between the following job posting and resume. "
+        f"Also provide a brief summary (2-3 sentences) explaining how well the resume matches the job criteria, "
+        f"considering skills overlap, education relevance, and work experience alignment. "
+        f"Return a JSON object with 'score' (float) and 'summary' (string) fields, without additional text.\n\n"
+        f"Job Posting: {json.dumps(job_data)}\n\n"
+        f"Resume: {json.dumps(resume_data)}"
+    )
+
+
+def build_match_stream_prompt(job_posting, candidate_profile):
+    """
+    Match prompt for the streaming endpoint. Asks for the score on its own first
+    line so it can be shown before the summary has finished generating.
+    """
+    job_data = {
+        "title": job_posting.title,
+        "company": job_posting.company,
+        "required_skills": job_posting.required_skills
+    }
+    resume_data = candidate_profile.structured_data
+
+    return (
+        f"Calculate a matching score (0-100) between the following job posting and resume, "
+        f"and a brief summary (2-3 sentences) explaining how well the resume matches the job criteria, "
+        f"considering skills overlap, education relevance, and work experience alignment. "
+        f"Answer in exactly this plain-text format, without any other text:\n"
+        f"SCORE: <number>\n"
+        f"SUMMARY: <summary>\n\n"
+        f"Job Posting: {json.dumps(job_data)}\n\n"
+        f"Resume: {json.dumps(resume_data)}"
+    )
+
+
+class MatchStreamParser:
+    """
+    Incrementally parse a streamed "SCORE: ... / SUMMARY: ..." answer.
+    feed() returns ('score', data) and ('summary', data) events as soon as they can be
+    emitted; finish() flushes the rest and returns (events, score, summary). If the
+    model ignores the format, everything is parsed at the end like a regular response.
+    """
+
+    _SCORE = re.compile(r'^[\s*#]*score[\s*]*[:=][\s*]*(\d+(?:\.\d+)?)', re.IGNORECASE)
+    _SUMMARY_LABEL = re.compile(r'^[\s*#]*summary[\s*]*[:=][\s*]*', re.IGNORECASE)
+
+    # Characters buffered before giving up on finding the score line / the summary label
+    max_score_line = 200
+    label_window = 12
+
+    def __init__(self):
+        self.text = ''
+        self.score = None
+        self.summary = ''
+        self._pending = ''
+        self._summary_started = False
+        self._unstructured = False
+
+    def _summary_events(self, final=False):
+        if not self._summary_started:
+            if not final and len(self._pending.strip()) < self.label_window:
+                return []
+            self._pending = self._SUMMARY_LABEL.sub('', self._pending.lstrip(), count=1)
+            self._summary_started = True
+        if not self._pending:
+            return []
+        text, self._pending = self._pending, ''
+        self.summary += text
+        return [('summary', {'text': text})]
+
+    def feed(self, delta):
+        self.text += delta
+        if self._unstructured:
+            return []
+        self._pending += delta
+        events = []
+        if self.score is None:
+            if '\n' not in self._pending:
+                if len(self._pending) > self.max_score_line:
+                    self._unstructured = True
+                return events
+            line, _, self._pending = self._pending.partition('\n')
+            match = self._SCORE.match(line)
+            if not match:
+                self._unstructured = True
+                return events
+            self.score = float(match.group(1))
+            events.append(('score', {'score': self.score}))
+        return events + self._summary_events()
+
+    def finish(self):
+        """Raises ValueError when no score can be found in the answer."""
+        if self.score is None and not self._unstructured:
+            match = self._SCORE.match(self._pending)
+            if match:
+                self.score = float(match.group(1))
+                self._pending = self._pending[match.end():]
+                return [('score', {'score': self.score})] + self._summary_events(final=True), self.score, self.summary.strip()
+        if self.score is None or self._unstructured:
+            score, summary = parse_match_response(self.text)
+            self.score, self.summary = score, summary
+            return [('score', {'score': score}), ('summary', {'text': summary})], score, summary
+        return self._summary_events(final=True), self.score, self.summary.strip()
+
+
+def format_sse(event, data):
+    """Encode one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+def parse_match_response(raw_text):
+    """
+    Parse Gemini's match response into a (score, summary) tuple.
+    Raises ValueError if the response is not the expected JSON object.
+    """
+    # Remove Markdown code blocks if present
+    json_content = re.sub(r'```json\s*|\s*```', '', raw_text).strip()
+
+    try:
+        result = json.loads(json_content)
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse Gemini response as JSON: {str(e)} - Raw response: {truncate_for_log(raw_text)}")
+        raise ValueError("Invalid JSON format in Gemini response")
+    return float(result['score']), result['summary']
+
+
+def score_match_with_gemini(job_posting, candidate_profile, priority=PRIORITY_INTERACTIVE):
+    """
+    Calculate the matching score and summary for a job/resume pair using the Gemini API.
+    Returns a (score, summary) tuple.
+    """
+    prompt = build_match_prompt(job_posting, candidate_profile)
+    raw_text = generate_content(prompt, priority=priority, cache=OPERATION_SCORE_MATCH)
+    try:
+        return parse_match_response(raw_text)
+    except (ValueError, KeyError):
+        discard_cached_content(prompt, OPERATION_SCORE_MATCH)
+        raise
+
+
+def compute_skill_overlap_score(job_posting, candidate_profile, provisional=True):
+    """
+    Degraded local score used while Gemini is unavailable, and the final score of
+    local-only bulk runs (`provisional=False`, which only changes the summary wording).
+    Scores the share of required skills found in the parsed skills or, for
+    profiles still pending a parse, in the extracted resume text.
+    Returns a (score, summary) tuple.
+    """
+    label = "Provisional score" if provisional else "Score"
+    # Parsed skills come from model output and may hold numbers or objects, which the
+    # lru_cached canonicalize_skill cannot hash; canonicalize_skills coerces them to str
+    required = [str(skill).strip() for skill in job_posting.required_skills if str(skill).strip()]
+    if not required:
+        return 0.0, f"{label}: the job posting lists no required skills."
+
+    candidate_skills = {skill_key(skill) for skill in canonicalize_skills(candidate_profile.structured_data.get('skills'))}
+    text = candidate_profile.extracted_text.lower()
+
+    matched = []
+    missing = []
+    for skill in required:
+        key = skill.lower()
+        if skill_key(canonicalize_skill(skill)) in candidate_skills or re.search(r'(?<!\w)' + re.escape(key) + r'(?!\w)', text):
+            matched.append(skill)
+        else:
+            missing.append(skill)
+
+    score = round(100.0 * len(matched) / len(required), 2)
+    summary = f"{label} computed locally from skill overlap: {len(matched)} of {len(required)} required skills found"
+    summary += f" ({', '.join(matched)})." if matched else "."
+    if missing:
+        summary += f" Missing: {', '.join(missing)}."
+    return score, summary
+
+
+def get_or_score_match(job_posting, candidate_profile):
+    """
+    Return the ResumeMatchScore for a job/resume pair, scoring it when missing.
+    Cached scores are reused unless provisional while Gemini is reachable again.
+    Falls back to a provisional local skill-overlap score when Gemini is unavailable
+    or the resume is still pending a parse. With MATCH_SKIP_DUPLICATES, near-duplicate
+    resumes reuse their canonical resume's score instead of calling Gemini.
+    Raises ValueError/KeyError if Gemini's answer cannot be parsed.
+    """
+    job_id, candidate_id = job_posting.id, candidate_profile.id
+    match = ResumeMatchScore.objects.filter(job_posting=job_posting, candidate_profile=candidate_profile).first()
+    if match is not None and not (match.is_provisional and circuit_breaker.is_closed()):
+        logger.info(f"Retrieved cached matching score for job {job_id} and candidate {candidate_id}")
+        return match
+
+    if settings.MATCH_SKIP_DUPLICATES and candidate_profile.duplicate_of_id:
+        canonical_match = get_or_score_match(job_posting, candidate_profile.duplicate_of)
+        score, summary = canonical_match.matching_score, canonical_match.summary
+        is_provisional = canonical_match.is_provisional
+        logger.info(f"Reused matching score of canonical resume {candidate_profile.duplicate_of_id} for duplicate {candidate_id}")
+    else:
+        is_provisional = False
+        if candidate_profile.parse_status == CandidateProfile.PARSE_STATUS_PENDING:
+            # Nothing meaningful to send to Gemini until the resume is parsed
+            is_provisional = True
+        else:
+            try:
+                # Call Gemini API in the interactive lane so it overtakes queued bulk work
+                score, summary = score_match_with_gemini(job_posting, candidate_profile, priority=PRIORITY_INTERACTIVE)
+            except requests.RequestException as e:
+                logger.warning(f"Gemini unavailable, using local score for job {job_id} and candidate {candidate_id}: {str(e)}")
+                is_provisional = True
+
+        if is_provisional:
+            if match is not None:
+                return match
+            score, summary = compute_skill_overlap_score(job_posting, candidate_profile)
+
+    # Save the score and summary to the database
+    match, _ = ResumeMatchScore.objects.update_or_create(
+        job_posting=job_posting,
+        candidate_profile=candidate_profile,
+        defaults={"matching_score": score, "summary": summary, "is_provisional": is_provisional}
+    )
+    logger.info(f"Calculated and saved {'provisional ' if is_provisional else ''}matching score {score} for job {job_id} and candidate {candidate_id}")
+    return match
+
+
+def upgrade_provisional_matches():
+    """
+    Re-score provisional matches with Gemini once it is reachable again.
+    Stops at the first Gemini failure and returns the number of upgraded matches.
+    """
+    upgraded = 0
+    provisional = ResumeMatchScore.objects.filter(is_provisional=True).select_related('job_posting', 'candidate_profile')
+    for match in provisional.iterator():
+        if match.candidate_profile.parse_status == CandidateProfile.PARSE_STATUS_PENDING:
+            continue
+        try:
+            score, summary = score_match_with_gemini(match.job_posting, match.candidate_profile, priority=PRIORITY_BULK)
+        except requests.RequestException as e:
+            logger.warning(f"Stopped upgrading provisional matches after {upgraded}: {str(e)}")
+            break
+        except (ValueError, KeyError) as e:
+            logger.error(f"Failed to upgrade provisional match {match.id}: {str(e)}")
+            continue
+        match.matching_score = score
+        match.summary = summary
+        match.is_provisional = False
+        match.save(update_fields=['matching_score', 'summary', 'is_provisional', 'updated_at'])
+        upgraded += 1
+    logger.info(f"Upgraded {upgraded} provisional matches")
+    return upgraded
+
+
+def upgrade_provisional_results():
+    """
+    Circuit-close listener: finish pending resume parses first, then re-score
+    provisional matches so they are computed from the parsed profile.
+    """
+    try:
+        upgrade_pending_profiles()
+        upgrade_provisional_matches()
+    except Exception as e:
+        logger.error(f"Error upgrading provisional results: {str(e)}", exc_info=True)
+    finally:
+        # Runs in a background thread; release its database connection
+        connection.close()
@@ -1,100 +1,45 @@
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
-from rest_framework.exceptions import NotFound
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.settings import api_settings
+from django.db.models import F
+from django.http import StreamingHttpResponse
 from .models import ResumeMatchScore
 from .serializers import ResumeMatchScoreSerializer, ResumeMatchScoreDetailSerializer
 from job_posting.models import JobPosting
+from job_posting.serializers import JobPostingSerializer
+from job_posting.search import normalize_skill
+from job_posting.skill_index import job_skill_index
 from candidates_resume.models import CandidateProfile
 from resume_analyzer.common.errors import get_error_response
+from resume_analyzer.common.export import parse_export_params, streaming_export_response
+from resume_analyzer.common.renderers import EventStreamRenderer
 from resume_analyzer import settings
+from resume_analyzer.common.gemini import circuit_breaker, stream_generate_content, discard_cached_content, PRIORITY_INTERACTIVE
+from resume_analyzer.common.llm_cache import OPERATION_STREAM_MATCH
+from .utils import get_or_score_match, compute_skill_overlap_score, build_match_stream_prompt, MatchStreamParser, format_sse
+from .leaderboard import get_top_matches
 import logging
 import requests
-import json
-import re
 
 logger = logging.getLogger('job_posting')
 
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
-
 @api_view(['GET'])
 def get_matching_score(request, job_id, candidate_id):
-    """API to fetch or calculate the matching score and summary between a job posting and a resume."""
+    """
+    API to fetch or calculate the matching score and summary between a job posting and a resume.
+    Falls back to a provisional local skill-overlap score when Gemini is unavailable;
+    provisional scores are recalculated once Gemini is reachable again.
+    """
     try:
         # Fetch job posting and candidate profile
         job_posting = JobPosting.objects.get(id=job_id)
         candidate_profile = CandidateProfile.objects.get(id=candidate_id)
 
-        # Check if score already exists in the database
-        try:
-            match = ResumeMatchScore.objects.get(job_posting=job_posting, candidate_profile=candidate_profile)
-            serializer = ResumeMatchScoreSerializer(match)
-            logger.info(f"Retrieved cached matching score for job {job_id} and candidate {candidate_id}")
-            return Response(serializer.data)
-        except ResumeMatchScore.DoesNotExist:
-            # If no cached score, calculate it
-            pass
-
-        # Prepare data for Gemini API
-        job_data = {
-            "title": job_posting.title,
-            "company": job_posting.company,
-            "required_skills": job_posting.required_skills
-        }
-        resume_data = candidate_profile.structured_data
-
-        # Prompt for score and summary
-        prompt = (
-            f"Calculate a matching score (0-100) between the following job posting and resume. "
-            f"Also provide a brief summary (2-3 sentences) explaining how well the resume matches the job criteria, "
-            f"considering skills overlap, education relevance, and work experience alignment. "
-            f"Return a JSON object with 'score' (float) and 'summary' (string) fields, without additional text.\n\n"
-            f"Job Posting: {json.dumps(job_data)}\n\n"
-            f"Resume: {json.dumps(resume_data)}"
-        )
-
-        headers = {
-            'Content-Type': 'application/json',
-        }
-        payload = {
-            "contents": [{
-                "parts": [{"text": prompt}]
-            }]
-        }
-
-        # Call Gemini API
-        response = requests.post(
-            f"{GEMINI_API_URL}?key={settings.GEMINI_API_KEY}",
-            headers=headers,
-            json=payload
-        )
-
-        if response.status_code != 200:
-            logger.error(f"Gemini API call failed: {response.text}")
-            raise requests.RequestException("Failed to call Gemini API")
-
-        gemini_response = response.json()
-        raw_text = gemini_response['candidates'][0]['content']['parts'][0]['text']
-
-        # Remove Markdown code blocks if present
-        json_content = re.sub(r'```json\s*|\s*```', '', raw_text).strip()
-
-        # Parse the JSON to get score and summary
-        result = json.loads(json_content)
-        score = float(result['score'])
-        summary = result['summary']
-
-        # Save the score and summary to the database
-        match = ResumeMatchScore(
-            job_posting=job_posting,
-            candidate_profile=candidate_profile,
-            matching_score=score,
-            summary=summary
-        )
-        match.save()
-
+        # Reuse the stored score, or calculate and save it
+        match = get_or_score_match(job_posting, candidate_profile)
         serializer = ResumeMatchScoreSerializer(match)
-        logger.info(f"Calculated and saved matching score {score} for job {job_id} and candidate {candidate_id}")
         return Response(serializer.data)
 
     except JobPosting.DoesNotExist:
@@ -103,23 +48,237 @@ def get_matching_score(request, job_id, candidate_id):
     except CandidateProfile.DoesNotExist:
         logger.warning(f"Candidate profile not found: {candidate_id}")
         raise NotFound(f"Candidate profile with ID {candidate_id} not found")
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse Gemini response as JSON: {str(e)} - Raw response: {raw_text}")
-        raise ValueError("Invalid JSON format in Gemini response")
-    except (requests.RequestException, ValueError, KeyError) as e:
+    except (ValueError, KeyError) as e:
         logger.error(f"Error calculating matching score for job {job_id} and candidate {candidate_id}: {str(e)}", exc_info=True)
         response, status_code = get_error_response("INTERNAL_SERVER_ERROR")
         return Response(response, status=status_code)
 
+def _match_event_stream(job_posting, candidate_profile):
+    """
+    Yield SSE events for a match: 'score' once known, 'summary' text fragments as
+    Gemini generates them, then 'done' with the saved ResumeMatchScore (or 'error').
+    Cached and provisional results are sent as a single score/summary/done sequence.
+    """
+    job_id, candidate_id = job_posting.id, candidate_profile.id
+    match = ResumeMatchScore.objects.filter(job_posting=job_posting, candidate_profile=candidate_profile).first()
+    reuse = settings.MATCH_SKIP_DUPLICATES and candidate_profile.duplicate_of_id
+    if reuse or (match is not None and not (match.is_provisional and circuit_breaker.is_closed())):
+        if reuse:
+            # Near-duplicate resume: score comes from the canonical resume, nothing to stream
+            try:
+                match = get_or_score_match(job_posting, candidate_profile)
+            except (ValueError, KeyError) as e:
+                logger.error(f"Error calculating matching score for job {job_id} and candidate {candidate_id}: {str(e)}")
+                response, _ = get_error_response("INTERNAL_SERVER_ERROR")
+                yield format_sse('error', response)
+                return
+        else:
+            logger.info(f"Retrieved cached matching score for job {job_id} and candidate {candidate_id}")
+        yield format_sse('score', {'score': match.matching_score})
+        yield format_sse('summary', {'text': match.summary or ''})
+        yield format_sse('done', ResumeMatchScoreSerializer(match).data)
+        return
+
+    is_provisional = False
+    if candidate_profile.parse_status == CandidateProfile.PARSE_STATUS_PENDING:
+        is_provisional = True
+    else:
+        parser = MatchStreamParser()
+        prompt = build_match_stream_prompt(job_posting, candidate_profile)
+        try:
+            for delta in stream_generate_content(prompt, priority=PRIORITY_INTERACTIVE, cache=OPERATION_STREAM_MATCH):
+                for event, data in parser.feed(delta):
+                    yield format_sse(event, data)
+            events, score, summary = parser.finish()
+            for event, data in events:
+                yield format_sse(event, data)
+        except requests.RequestException as e:
+            logger.warning(f"Gemini unavailable, using local score for job {job_id} and candidate {candidate_id}: {str(e)}")
+            is_provisional = True
+        except (ValueError, KeyError) as e:
+            logger.error(f"Error streaming matching score for job {job_id} and candidate {candidate_id}: {str(e)}")
+            discard_cached_content(prompt, OPERATION_STREAM_MATCH)
+            response, _ = get_error_response("INTERNAL_SERVER_ERROR")
+            yield format_sse('error', response)
+            return
+
+    if is_provisional:
+        if match is None:
+            score, summary = compute_skill_overlap_score(job_posting, candidate_profile)
+            match, _ = ResumeMatchScore.objects.update_or_create(
+                job_posting=job_posting,
+                candidate_profile=candidate_profile,
+                defaults={"matching_score": score, "summary": summary, "is_provisional": True}
+            )
+        yield format_sse('score', {'score': match.matching_score})
+        yield format_sse('summary', {'text': match.summary or '', 'replace': True})
+        yield format_sse('done', ResumeMatchScoreSerializer(match).data)
+        return
+
+    match, _ = ResumeMatchScore.objects.update_or_create(
+        job_posting=job_posting,
+        candidate_profile=candidate_profile,
+        defaults={"matching_score": score, "summary": summary, "is_provisional": False}
+    )
+    logger.info(f"Calculated and saved streamed matching score {score} for job {job_id} and candidate {candidate_id}")
+    yield format_sse('done', ResumeMatchScoreSerializer(match).data)
+
+@api_view(['GET'])
+@renderer_classes(api_settings.DEFAULT_RENDERER_CLASSES + [EventStreamRenderer])
+def stream_matching_score(request, job_id, candidate_id):
+    """
+    Streaming variant of get_matching_score using server-sent events, so the score
+    and the beginning of the summary render while Gemini is still generating.
+    The final result is saved as a ResumeMatchScore just like the regular endpoint.
+    """
+    try:
+        job_posting = JobPosting.objects.get(id=job_id)
+        candidate_profile = CandidateProfile.objects.get(id=candidate_id)
+    except JobPosting.DoesNotExist:
+        logger.warning(f"Job posting not found: {job_id}")
+        raise NotFound(f"Job posting with ID {job_id} not found")
+    except CandidateProfile.DoesNotExist:
+        logger.warning(f"Candidate profile not found: {candidate_id}")
+        raise NotFound(f"Candidate profile with ID {candidate_id} not found")
+
+    response = StreamingHttpResponse(_match_event_stream(job_posting, candidate_profile), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Keep reverse proxies from buffering the stream
+    return response
+
 @api_view(['GET'])
 def get_all_matches(request):
     """API to fetch all matching scores with job and candidate details."""
     try:
-        matches = ResumeMatchScore.objects.all()
+        # One joined query instead of two lookups per match; resume text is not serialized
+        matches = ResumeMatchScore.objects.select_related('job_posting', 'candidate_profile').defer(
+            'candidate_profile__extracted_text', 'candidate_profile__minhash'
+        )
         serializer = ResumeMatchScoreDetailSerializer(matches, many=True)
         logger.info(f"Retrieved {len(serializer.data)} matches")
         return Response(serializer.data)
     except Exception as e:
         logger.error(f"Error fetching all matches: {str(e)}", exc_info=True)
         response, status_code = get_error_response("INTERNAL_SERVER_ERROR")
-        return Response(response, status=status_code)
\ No newline at end of file
+        return Response(response, status=status_code)
+
+@api_view(['GET'])
+def get_top_candidates(request, job_id):
+    """
+    API to fetch the n best-scoring candidates for a job (?n=, default 20).
+    Served from the job's maintained leaderboard, so the cost depends on n only,
+    not on how many candidates have been scored for the job.
+    """
+    try:
+        n = int(request.query_params.get('n', 20))
+    except ValueError:
+        raise ValidationError("n must be an integer")
+    if not 1 <= n <= settings.MATCH_LEADERBOARD_SIZE:
+        raise ValidationError(f"n must be between 1 and {settings.MATCH_LEADERBOARD_SIZE}")
+
+    if not JobPosting.objects.filter(id=job_id).exists():
+        logger.warning(f"Job posting not found: {job_id}")
+        raise NotFound(f"Job posting with ID {job_id} not found")
+
+    serializer = ResumeMatchScoreDetailSerializer(get_top_matches(job_id, n), many=True)
+    logger.info(f"Retrieved top {len(serializer.data)} candidates for job {job_id}")
+    return Response(serializer.data)
+
+@api_view(['GET'])
+def recommend_jobs(request, candidate_id):
+    """
+    API to find the k job postings that best fit a candidate (?k=, default 20).
+    Every posting is ranked in memory by the share of its required skills the
+    candidate has. With ?rescore=true the best JOB_RECOMMENDATION_RESCORE_LIMIT
+    are scored with Gemini (stored like any match) and ordered by that score.
+    """
+    try:
+        k = int(request.query_params.get('k', 20))
+    except ValueError:
+        raise ValidationError("k must be an integer")
+    if not 1 <= k <= settings.JOB_RECOMMENDATION_MAX_K:
+        raise ValidationError(f"k must be between 1 and {settings.JOB_RECOMMENDATION_MAX_K}")
+    rescore = request.query_params.get('rescore', '').lower() in ('1', 'true', 'yes')
+
+    try:
+        candidate_profile = CandidateProfile.objects.get(id=candidate_id)
+    except CandidateProfile.DoesNotExist:
+        logger.warning(f"Candidate profile not found: {candidate_id}")
+        raise NotFound(f"Candidate profile with ID {candidate_id} not found")
+
+    skills = candidate_profile.structured_data.get('skills', []) if isinstance(candidate_profile.structured_data, dict) else []
+    ranked = job_skill_index.rank(skills if isinstance(skills, list) else [], k)
+    postings = JobPosting.objects.in_bulk([recommendation.job_id for recommendation in ranked])
+    candidate_skills = {normalize_skill(str(skill)) for skill in skills if skill}
+
+    results = []
+    for recommendation in ranked:
+        job_posting = postings.get(recommendation.job_id)
+        if job_posting is None:
+            # Deleted since the index last synced
+            continue
+        required = [skill for skill in job_posting.required_skills if str(skill).strip()]
+        results.append({
+            'job_posting': job_posting,
+            'skill_score': recommendation.score,
+            'matched_skills': [skill for skill in required if normalize_skill(str(skill)) in candidate_skills],
+            'missing_skills': [skill for skill in required if normalize_skill(str(skill)) not in candidate_skills],
+            'match': None,
+        })
+
+    if rescore:
+        shortlist = results[:settings.JOB_RECOMMENDATION_RESCORE_LIMIT]
+        for result in shortlist:
+            try:
+                result['match'] = get_or_score_match(result['job_posting'], candidate_profile)
+            except (ValueError, KeyError) as e:
+                logger.error(f"Error calculating matching score for job {result['job_posting'].id} and candidate {candidate_id}: {str(e)}")
+        # Rescored jobs lead, best match score first; the rest keep their skill ranking
+        shortlist.sort(key=lambda result: result['match'].matching_score if result['match'] else -1, reverse=True)
+        results[:len(shortlist)] = shortlist
+
+    job_serializer = JobPostingSerializer()
+    data = [
+        dict(
+            result,
+            job_posting=job_serializer.to_representation(result['job_posting']),
+            match=ResumeMatchScoreSerializer(result['match']).data if result['match'] else None,
+        )
+        for result in results
+    ]
+    logger.info(f"Recommended {len(data)} jobs for candidate {candidate_id}{' (rescored)' if rescore else ''}")
+    return Response(data)
+
+# Columns written by the match export, in order
+MATCH_EXPORT_COLUMNS = [
+    'id', 'job_posting_id', 'job_title', 'company', 'candidate_profile_id', 'candidate_name',
+    'matching_score', 'is_provisional', 'summary', 'created_at', 'updated_at',
+]
+
+@api_view(['GET'])
+def export_matches(request):
+    """
+    API to stream all matching scores as CSV or NDJSON (?output=csv|ndjson).
+    Supports job_id, min_score and max_score filters. Rows are read with a
+    server-side iterator so memory stays constant regardless of export size.
+    """
+    params = parse_export_params(request.query_params)
+
+    queryset = ResumeMatchScore.objects.all()
+    if params['job_id']:
+        queryset = queryset.filter(job_posting_id=params['job_id'])
+    if params['min_score'] is not None:
+        queryset = queryset.filter(matching_score__gte=params['min_score'])
+    if params['max_score'] is not None:
+        queryset = queryset.filter(matching_score__lte=params['max_score'])
+
+    rows = queryset.values(
+        'id', 'job_posting_id', 'candidate_profile_id', 'matching_score', 'is_provisional',
+        'summary', 'created_at', 'updated_at',
+        job_title=F('job_posting__title'),
+        company=F('job_posting__company'),
+        candidate_name=F('candidate_profile__structured_data__name'),
+    ).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+    logger.info(f"Streaming match export ({params['output']}) with filters - job: {params['job_id']}, min_score: {params['min_score']}, max_score: {params['max_score']}")
+    return streaming_export_response(rows, MATCH_EXPORT_COLUMNS, params['output'], 'matches')
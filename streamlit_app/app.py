@@ -1,6 +1,7 @@
 # streamlit_app/app.py
 import streamlit as st
 import requests
+import json
 from decouple import config  
 
 # Base URL for Django API (adjust if running on a different host/port)
@@ -62,6 +63,8 @@ with tab3:
             response = requests.post(f"{BASE_URL}resume/upload/", files=files)
             if response.status_code == 201:
                 st.success("Parsed successfully!")
+            elif response.status_code == 202:
+                st.info("Resume stored. Parsing is pending and will complete automatically.")
             else:
                 st.error(f"Error: {response.text}")
         else:
@@ -93,11 +96,28 @@ with tab5:
     
     if st.button("Calculate Match"):
         if job_id and candidate_id:
-            response = requests.get(f"{BASE_URL}match/{job_id}/{candidate_id}/")
+            # Server-sent events: the score and summary render while they are generated
+            response = requests.get(f"{BASE_URL}match/{job_id}/{candidate_id}/stream/", stream=True)
             if response.status_code == 200:
-                match = response.json()
-                st.write(f"**Matching Score**: {match['matching_score']}%")
-                st.write(f"**Summary**: {match['summary']}")
+                score_placeholder = st.empty()
+                summary_placeholder = st.empty()
+                score_placeholder.write("**Matching Score**: calculating...")
+                summary = ""
+                event = None
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith("event:"):
+                        event = line[6:].strip()
+                    elif line.startswith("data:"):
+                        data = json.loads(line[5:])
+                        if event == "score":
+                            score_placeholder.write(f"**Matching Score**: {data['score']}%")
+                        elif event == "summary":
+                            summary = data['text'] if data.get('replace') else summary + data['text']
+                            summary_placeholder.write(f"**Summary**: {summary}")
+                        elif event == "done" and data.get('is_provisional'):
+                            st.caption("Provisional score computed locally; it will be refined automatically.")
+                        elif event == "error":
+                            st.error(f"Error: {data.get('error')}")
             else:
                 st.error(f"Error: {response.text}")
         else: